@@ -0,0 +1,97 @@
+"""bs4와 lxml 파싱 엔진의 목록 페이지 처리 시간을 비교하고 결과가 동일한지 검증합니다.
+
+대형 목록 페이지 픽스처를 생성하여 사용하므로 외부 사이트에 접속하지 않습니다.
+    python benchmarks/bench_parser.py [--items 2000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_engine import LxmlEngine, SoupEngine  # noqa: E402
+from ms_excel_crawler import extract_css_announcements  # noqa: E402
+
+# 실제 Crawl_Targets에서 볼 수 있는 형태를 흉내 낸 대상 설정들
+FIXTURE_TARGETS = [
+    {'company': '일반 게시판', 'url': 'https://board.example.com/notice/list.do',
+     'item_selector': 'table.board tbody tr', 'title_link_selector': 'td.title a', 'date_selector': 'td.date'},
+    {'company': 'onclick 게시판', 'url': 'https://js.example.com/list.do',
+     'item_selector': 'ul.list > li', 'title_link_selector': 'a.subject', 'date_selector': 'span.date',
+     'link_format': 'https://js.example.com/view.do?id={id}'},
+    {'company': 'data-key 게시판', 'url': 'https://key.example.com/list',
+     'item_selector': 'div.card', 'title_link_selector': 'a[data-key]', 'date_selector': 'em',
+     'link_format': 'https://key.example.com/view?key={id}'},
+    {'company': 'pikk', 'url': 'https://pikk.co.kr/bids',
+     'item_selector': 'div.bids a.bid', 'title_link_selector': 'span.nolink', 'date_selector': 'p.date',
+     'title_source': 'h3'},
+]
+
+
+def fixture_page(kind, items):
+    """kind 형태의 목록 항목 items개를 가진 페이지. 주석, &nbsp;, 중첩 태그 등을 섞습니다."""
+    rows = []
+    for i in range(items):
+        date = f"2024.{i % 12 + 1:02d}.{i % 28 + 1:02d}"
+        if kind == 0:
+            rows.append(f'<tr><td class="num">{i}</td><td class="title"><a href="view.do?seq={i}&amp;page=1">'
+                        f' 입찰 공고 <b>{i}</b> <!-- memo --> 안내&nbsp;</a></td><td class="date"> {date} </td></tr>')
+        elif kind == 1:
+            rows.append(f'<li><a class="subject" href="javascript:void(0);" onclick="goView(\'{i}\')">'
+                        f'<span>[공지]</span> 용역 {i}<script>track({i})</script></a><span class="date">{date}</span></li>')
+        elif kind == 2:
+            rows.append(f'<div class="card"><a data-key="k{i}" href="#"><strong>대행사 선정 {i}</strong></a>'
+                        f'<em>{date.replace(".", "-")}</em></div>')
+        else:
+            rows.append(f'<a class="bid" href="/bid/{i}"><h3> 캠페인 {i} </h3><p class="date">{date}</p></a>')
+    body = ''.join(rows)
+    wrappers = [
+        '<table class="board"><tbody>{}</tbody></table>',
+        '<ul class="list">{}</ul>',
+        '<div class="cards">{}</div>',
+        '<div class="bids">{}</div>',
+    ]
+    filler = '<div class="gnb">' + '<a href="/menu">메뉴</a>' * 300 + '</div>'
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>목록</title></head><body>'
+            f'{filler}{wrappers[kind].format(body)}{filler}</body></html>')
+
+
+def run_engine(engine_cls, target, html):
+    engine = engine_cls(target['item_selector'], target.get('title_link_selector'), target.get('date_selector'))
+    return extract_css_announcements(target, engine, engine.parse_items(html))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=2000, help="페이지당 목록 항목 수")
+    parser.add_argument('--repeat', type=int, default=3, help="엔진별 반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    totals = {SoupEngine.name: 0.0, LxmlEngine.name: 0.0}
+    for kind, target in enumerate(FIXTURE_TARGETS):
+        html = fixture_page(kind, args.items)
+        outputs, timings = {}, {}
+        for engine_cls in (SoupEngine, LxmlEngine):
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                outputs[engine_cls.name] = run_engine(engine_cls, target, html)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[engine_cls.name] = best
+            totals[engine_cls.name] += best
+
+        same = outputs['bs4'] == outputs['lxml']
+        print(f"{target['company']:<14} {len(html) / 1024:7.0f}KB | bs4 {timings['bs4'] * 1000:8.1f}ms | "
+              f"lxml {timings['lxml'] * 1000:7.1f}ms | x{timings['bs4'] / timings['lxml']:.1f} | "
+              f"결과 {'동일' if same else '불일치'} ({len(outputs['bs4'])}건)")
+        if not same:
+            sys.exit(f"❌ '{target['company']}' 픽스처에서 두 엔진의 결과가 다릅니다.")
+
+    print(f"{'합계':<14} {'':>9} | bs4 {totals['bs4'] * 1000:8.1f}ms | lxml {totals['lxml'] * 1000:7.1f}ms | "
+          f"x{totals['bs4'] / totals['lxml']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""main() 전체 파이프라인을 합성 대상 수백 개에 대해 실행하는 종단 간 벤치마크입니다.
+
+로컬 스텁 서버(benchmarks/stub_servers.py)가 목록 페이지/API, Microsoft Graph, SMTP를 대신하므로
+외부 사이트나 실제 통합 문서에 접속하지 않습니다. 실행마다 새 작업 디렉터리와 새 프로세스를 사용하여
+처리된 링크/조건부 요청 캐시가 비어 있는 상태(첫 실행)와, 같은 디렉터리로 다시 실행한 상태(평상시)를 측정합니다.
+
+    python benchmarks/bench_pipeline.py [--targets 300] [--hosts 8] [--latency 0.02]
+    python benchmarks/bench_pipeline.py --output baseline.json            # 기준 결과 저장
+    python benchmarks/bench_pipeline.py --baseline baseline.json          # 기준 대비 비교
+
+보고 항목: 대상/초, 최대 RSS, 단계별 소요 시간(graph, crawl, email), 네트워크/렌더링/파싱 시간 합계,
+대상별 소요 시간 p50/p95.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_servers import StubServers, StubState, synthetic_targets  # noqa: E402
+
+STUB_TENANT, STUB_CLIENT = 'stub-tenant', 'stub-client'
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_child(workdir):
+    """--child: 작업 디렉터리에서 main()을 실행하고 측정 결과를 JSON 한 줄로 출력합니다."""
+    import contextlib
+    import io
+    import resource
+
+    os.chdir(workdir)
+    with open(os.environ['GRAPH_TOKEN_CACHE'], 'w', encoding='utf-8') as f:
+        json.dump({'id': f"{STUB_TENANT}:{STUB_CLIENT}", 'access_token': 'stub-token', 'expires_at': time.time() + 86400}, f)
+
+    import ms_excel_crawler
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ms_excel_crawler.main()
+    wall = time.perf_counter() - start
+
+    summary = ms_excel_crawler.METRICS.summary()
+    totals = [row['total'] for row in summary['targets_detail']]
+    print(json.dumps({
+        'wall_time': wall,
+        'targets': summary['targets'],
+        'targets_per_sec': summary['targets'] / wall if wall else 0.0,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'new_items': summary['new_items'],
+        'errors': summary['errors'],
+        'stages': summary['stages'],
+        'time_split': summary['time_split'],
+        'target_p50': percentile(totals, 0.5),
+        'target_p95': percentile(totals, 0.95),
+    }))
+
+
+def run_once(servers, workdir, env_overrides):
+    env = dict(os.environ)
+    env.update({
+        'MS_TENANT_ID': STUB_TENANT, 'MS_CLIENT_ID': STUB_CLIENT, 'MS_CLIENT_SECRET': 'stub-secret',
+        'MS_USER_PRINCIPAL_NAME': 'bench@example.com', 'MS_EXCEL_FILE_PATH': 'Bench/Targets.xlsx',
+        'MS_GRAPH_BASE_URL': servers.graph_base_url,
+        'GRAPH_TOKEN_CACHE': os.path.join(workdir, '.graph_token_cache.json'),
+        'GRAPH_CONFIG_CACHE': os.path.join(workdir, '.graph_config_cache.json'),
+        'GMAIL_USER': 'bench@example.com', 'GMAIL_PASSWORD': 'stub',
+        'SMTP_HOST': '127.0.0.1', 'SMTP_PORT': str(servers.smtp_port), 'SMTP_STARTTLS': 'N',
+        'CRAWL_REPORT_DIR': os.path.join(workdir, 'reports'),
+        'CRAWL_HTTP_MODE': '',
+        'CRAWL_SCHEDULE': 'N',  # 두 번째(warm) 실행도 모든 대상을 크롤링
+        'PYTHONPATH': ROOT,
+    })
+    env.update(env_overrides)
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', workdir],
+                               env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"벤치마크 실행 실패:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_result(label, result, baseline=None):
+    def delta(value, base):
+        return f" ({(value - base) / base * 100:+.0f}%)" if base else ''
+
+    base = baseline or {}
+    print(f"\n[{label}] 대상 {result['targets']}개, 신규 {result['new_items']}건, 오류 {result['errors']}개")
+    print(f"  처리량      {result['targets_per_sec']:8.1f} 대상/초{delta(result['targets_per_sec'], base.get('targets_per_sec'))}")
+    print(f"  전체 시간   {result['wall_time']:8.2f} s{delta(result['wall_time'], base.get('wall_time'))}")
+    print(f"  최대 RSS    {result['peak_rss_mb']:8.1f} MB{delta(result['peak_rss_mb'], base.get('peak_rss_mb'))}")
+    for name, value in result['stages'].items():
+        print(f"  단계 {name:<7}{value:8.2f} s{delta(value, (base.get('stages') or {}).get(name))}")
+    split = ', '.join(f"{name} {value:.2f}s" for name, value in result['time_split'].items())
+    print(f"  시간 합계   {split}")
+    print(f"  대상별      p50 {result['target_p50'] * 1000:.0f} ms, p95 {result['target_p95'] * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', type=int, default=300)
+    parser.add_argument('--hosts', type=int, default=8)
+    parser.add_argument('--items', type=int, default=20, help='페이지당 공고 수')
+    parser.add_argument('--max-pages', type=int, default=2)
+    parser.add_argument('--latency', type=float, default=0.02, help='목록/API 응답 지연(초)')
+    parser.add_argument('--host-delay', type=float, default=0.0, help='CRAWL_HOST_DELAY 값')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    state = StubState([], items_per_page=args.items, latency=args.latency)
+    env_overrides = {'CRAWL_HOST_DELAY': str(args.host_delay), 'WORKFLOW_TYPE': 'DEFAULT'}
+    results = {}
+    with StubServers(state, args.hosts) as servers, tempfile.TemporaryDirectory() as workdir:
+        state.targets = synthetic_targets(args.targets, args.hosts, servers.port, max_pages=args.max_pages)
+        print(f"합성 대상 {args.targets}개 (호스트 {args.hosts}개, 응답 지연 {args.latency * 1000:.0f} ms)로 main()을 실행합니다.")
+        # 첫 실행: 모든 공고가 신규 / 두 번째 실행: 변경 없음(평상시)
+        for label in ('cold', 'warm'):
+            requests_before = state.requests
+            results[label] = run_once(servers, workdir, env_overrides)
+            results[label]['http_requests'] = state.requests - requests_before
+            print_result(label, results[label], baseline.get(label))
+        print(f"\nGraph 행 추가 {state.rows_added}건, 메일 {len(state.mails)}통 ({sum(state.mails) / 1024:.0f} KB)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"결과를 '{args.output}'에 저장했습니다.")
+
+
+if __name__ == '__main__':
+    main()
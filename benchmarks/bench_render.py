@@ -0,0 +1,125 @@
+"""JavaScript 렌더링 대상의 지연 시간을 기존 방식과 공유 브라우저 방식으로 비교합니다.
+
+로컬 HTTP 서버로 목록을 지연 삽입하는 픽스처 페이지를 제공하므로 외부 사이트에 접속하지 않습니다.
+    python benchmarks/bench_render.py [--pages 6] [--delay 0.3] [--pool 2]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from requests_html import HTMLSession  # noqa: E402
+
+from renderer import BrowserRenderer  # noqa: E402
+
+ITEM_SELECTOR = 'ul.board li'
+ITEMS_PER_PAGE = 20
+
+
+def fixture_page(page_no, delay_ms):
+    """delay_ms 후에 JavaScript로 목록을 채우는 픽스처 페이지."""
+    return f"""<html><head><meta charset="utf-8"></head><body><ul class="board"></ul>
+<script>
+setTimeout(function () {{
+  var ul = document.querySelector('ul.board');
+  for (var i = 0; i < {ITEMS_PER_PAGE}; i++) {{
+    var li = document.createElement('li');
+    li.innerHTML = '<a href="/view?id={page_no}-' + i + '">공고 {page_no}-' + i + '</a><span class="date">2024.01.02</span>';
+    ul.appendChild(li);
+  }}
+}}, {delay_ms});
+</script></body></html>""".encode('utf-8')
+
+
+def start_fixture_server(delay_ms):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            page_no = self.path.rsplit('/', 1)[-1]
+            body = fixture_page(page_no, delay_ms)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def count_items(html):
+    return len(BeautifulSoup(html, 'html.parser').select(ITEM_SELECTOR))
+
+
+def bench_legacy(urls):
+    """기존 handle_css_crawl 방식: 대상마다 GET 후 render(sleep=3)."""
+    session = HTMLSession()
+    latencies, found = [], 0
+    for url in urls:
+        start = time.perf_counter()
+        response = session.get(url, timeout=20)
+        response.html.render(sleep=3, timeout=20)
+        found += count_items(response.html.html)
+        latencies.append(time.perf_counter() - start)
+    session.close()
+    return latencies, found
+
+
+def bench_pooled(urls, pool_size, workers):
+    """공유 브라우저 + 페이지 풀 + 선택자 대기."""
+    renderer = BrowserRenderer(pool_size=pool_size)
+    renderer.render(urls[0] + '?warmup', wait_selector=ITEM_SELECTOR)  # 브라우저 기동은 실행당 1회
+
+    def render(url):
+        start = time.perf_counter()
+        html = renderer.render(url, wait_selector=ITEM_SELECTOR)
+        return time.perf_counter() - start, count_items(html)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(render, urls))
+    finally:
+        renderer.close()
+    return [latency for latency, _ in results], sum(count for _, count in results)
+
+
+def report(name, latencies, found, wall):
+    avg = sum(latencies) / len(latencies)
+    print(f"{name:<8} 대상 {len(latencies)}개 | 평균 {avg:.2f}s | 최대 {max(latencies):.2f}s | "
+          f"전체 {wall:.2f}s | 항목 {found}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=6, help="렌더링할 픽스처 페이지 수")
+    parser.add_argument('--delay', type=float, default=0.3, help="목록이 나타나기까지의 지연(초)")
+    parser.add_argument('--pool', type=int, default=2, help="공유 브라우저 페이지 풀 크기")
+    args = parser.parse_args()
+
+    server = start_fixture_server(int(args.delay * 1000))
+    base = f"http://127.0.0.1:{server.server_address[1]}/list"
+    urls = [f"{base}/{i}" for i in range(args.pages)]
+
+    try:
+        start = time.perf_counter()
+        latencies, found = bench_legacy(urls)
+        report('legacy', latencies, found, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        latencies, found = bench_pooled(urls, args.pool, workers=args.pool)
+        report('pooled', latencies, found, time.perf_counter() - start)
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+"""외부 서비스를 대신하는 로컬 서버들입니다. (벤치마크/회귀 테스트용)
+
+- SiteServer : 합성 대상의 목록 페이지(/css/<n>)와 JSON API(/api/<n>), Microsoft Graph(/graph/v1.0/...)
+- SmtpServer : 메일을 받아 개수와 크기만 기록하는 SMTP 서버 (STARTTLS 없음, AUTH는 모두 허용)
+
+여러 호스트를 흉내 내기 위해 127.0.0.1, 127.0.0.2, ... 주소마다 같은 포트로 서버를 띄웁니다.
+    python benchmarks/stub_servers.py --targets 300   # 서버만 띄워 두고 수동으로 확인
+"""
+import argparse
+import json
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+TARGET_COLUMNS = [
+    'company', 'crawl_type', 'url', 'item_selector', 'title_link_selector', 'date_selector', 'max_pages',
+    'page_param', 'api_url', 'json_item_path', 'json_title_path', 'json_link_id_path', 'json_date_path',
+    'link_format', 'js_render',
+]
+EPOCH_2026 = 1767225600000  # 2026-01-01 00:00:00 UTC (ms)
+
+
+def synthetic_targets(count, host_count, port, api_ratio=0.2, max_pages=2):
+    """Crawl_Targets 표의 합성 행. 대상 n은 127.0.0.(n % host_count + 1) 호스트에 배정됩니다."""
+    targets = []
+    api_every = int(1 / api_ratio) if api_ratio else 0
+    for n in range(count):
+        base = f"http://127.0.0.{n % host_count + 1}:{port}"
+        row = dict.fromkeys(TARGET_COLUMNS)
+        row['company'] = f"합성{n:04d}"
+        if api_every and n % api_every == api_every - 1:
+            row.update(crawl_type='API', api_url=f"{base}/api/{n}", json_item_path='data.list',
+                       json_title_path='title', json_link_id_path='id', json_date_path='regDate',
+                       link_format=f"{base}/api/{n}/view?id={{id}}", page_param='page', max_pages=max_pages)
+        else:
+            row.update(crawl_type='CSS', url=f"{base}/css/{n}", item_selector='table.board tbody tr',
+                       title_link_selector='td.title a', date_selector='td.date', page_param='page',
+                       max_pages=max_pages)
+        targets.append(row)
+    return targets
+
+
+class StubState:
+    """모든 스텁 서버가 공유하는 설정과 수신 기록."""
+
+    def __init__(self, targets, items_per_page=20, latency=0.02, receivers=('receiver@example.com',)):
+        self.targets = targets
+        self.items_per_page = items_per_page
+        self.latency = latency
+        self.receivers = receivers
+        self.lock = threading.Lock()
+        self.version = 1
+        self.requests = 0
+        self.rows_added = 0
+        self.graph_faults = []  # [(경로 끝부분, HTTP 상태, 처리 후 반환 여부)] 일치하는 다음 Graph 요청에 한 번씩 적용
+        self.mails = []
+
+    def tables(self):
+        settings = [{'Setting': 'Receiver Email', 'Value': self.receivers[0]},
+                    {'Setting': 'Developer Email', 'Value': 'developer@example.com'}]
+        return {
+            'Settings': (['Setting', 'Value'], [[r['Setting'], r['Value']] for r in settings]),
+            'Crawl_Targets': (TARGET_COLUMNS, [[t.get(c) or '' for c in TARGET_COLUMNS] for t in self.targets]),
+        }
+
+
+def list_page(n, page, items):
+    """대상 n의 page번째 목록 페이지 HTML. 페이지마다 고유한 공고 items개를 포함합니다."""
+    rows = []
+    for i in range(items):
+        seq = (page - 1) * items + i
+        rows.append(f'<tr><td class="num">{seq}</td><td class="title"><a href="/css/{n}/view?seq={seq}">'
+                    f'합성 입찰 공고 {n}-{seq}</a></td><td class="date">2026.{seq % 12 + 1:02d}.{seq % 28 + 1:02d}</td></tr>')
+    menu = '<div class="gnb">' + '<a href="/menu">메뉴</a>' * 50 + '</div>'
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>목록 {n}</title></head><body>{menu}'
+            f'<table class="board"><tbody>{"".join(rows)}</tbody></table></body></html>')
+
+
+def api_page(n, page, items):
+    return {'data': {'list': [
+        {'id': f"{n}-{(page - 1) * items + i}", 'title': f"합성 API 공고 {n}-{(page - 1) * items + i}",
+         'regDate': EPOCH_2026 + ((page - 1) * items + i) * 86400000}
+        for i in range(items)
+    ]}}
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state = None  # make_site_handler()에서 지정
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json; charset=utf-8', headers=None):
+        data = body if isinstance(body, bytes) else (
+            body.encode('utf-8') if isinstance(body, str) else json.dumps(body, ensure_ascii=False).encode('utf-8'))
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _handle(self, method):
+        state = self.state
+        with state.lock:
+            state.requests += 1
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        body = self._read_body() if method == 'POST' else b''
+
+        if path.startswith('/graph/v1.0'):
+            return self._graph(method, path[len('/graph/v1.0'):], body)
+
+        if state.latency:
+            time.sleep(state.latency)
+        query = parse_qs(parts.query)
+        page = int((query.get('page') or ['1'])[0])
+        match = re.fullmatch(r'/(css|api)/(\d+)', path)
+        if not match:
+            return self._send(404, {'error': 'not found'})
+        kind, n = match.group(1), int(match.group(2))
+        if kind == 'css':
+            return self._send(200, list_page(n, page, state.items_per_page), 'text/html; charset=utf-8')
+        return self._send(200, api_page(n, page, state.items_per_page))
+
+    # --- Microsoft Graph (Excel 통합 문서) ---
+    def _graph(self, method, path, body):
+        state = self.state
+        fault = self._take_fault(path)
+        if fault and not fault[2]:
+            return self._send(fault[1], {'error': {'message': 'injected'}}, headers={'Retry-After': '0'})
+        if method == 'POST' and path == '/$batch':
+            responses = []
+            for sub in json.loads(body).get('requests', []):
+                status, sub_body = self._graph_get(unquote(sub['url']))
+                responses.append({'id': sub['id'], 'status': status, 'body': sub_body})
+            return self._send(200, {'responses': responses})
+        if method == 'POST' and path.endswith('/rows/add'):
+            with state.lock:
+                state.rows_added += len(json.loads(body).get('values', []))
+                state.version += 1
+            if fault:
+                # 쓰기는 반영되었지만 게이트웨이가 오류를 돌려준 경우
+                return self._send(fault[1], {'error': {'message': 'injected'}}, headers={'Retry-After': '0'})
+            return self._send(201, {'index': 0})
+        status, response_body = self._graph_get(path)
+        return self._send(status, response_body)
+
+    def _take_fault(self, path):
+        with self.state.lock:
+            for fault in self.state.graph_faults:
+                if path.endswith(fault[0]):
+                    self.state.graph_faults.remove(fault)
+                    return fault
+        return None
+
+    def _graph_get(self, path):
+        state = self.state
+        table = re.search(r"/workbook/tables\('([^']+)'\)(/rows|/headerRowRange)$", path)
+        if table:
+            tables = state.tables()
+            if table.group(1) not in tables:
+                return 404, {'error': {'message': f"table {table.group(1)} not found"}}
+            header, rows = tables[table.group(1)]
+            if table.group(2) == '/headerRowRange':
+                return 200, {'values': [header]}
+            return 200, {'value': [{'values': [row]} for row in rows]}
+        if path.rstrip(':').endswith('.xlsx') or path.endswith(':'):
+            return 200, {'cTag': f'"c:{{stub}},{state.version}"', 'eTag': f'"e:{state.version}"'}
+        return 404, {'error': {'message': 'not found'}}
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+
+class SmtpHandler(socketserver.StreamRequestHandler):
+    state = None
+
+    def _reply(self, line):
+        self.wfile.write((line + '\r\n').encode('ascii'))
+
+    def handle(self):
+        self._reply('220 stub ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.wfile.write(b'250-stub\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n')
+            elif command.startswith('AUTH'):
+                self._reply('235 2.7.0 Authentication successful')
+            elif command.startswith(('MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data == b'.\r\n':
+                        break
+                    size += len(data)
+                with self.state.lock:
+                    self.state.mails.append(size)
+                self._reply('250 OK queued')
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StubServers:
+    """사이트/Graph 서버(호스트 host_count개)와 SMTP 서버를 백그라운드 스레드로 실행합니다."""
+
+    def __init__(self, state, host_count=1):
+        self.state = state
+        self.host_count = host_count
+        self.servers = []
+        self.port = None
+        self.smtp_port = None
+
+    def start(self):
+        handler = type('BoundSiteHandler', (SiteHandler,), {'state': self.state})
+        first = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        first.daemon_threads = True
+        self.port = first.server_address[1]
+        self.servers.append(first)
+        for index in range(2, self.host_count + 1):
+            server = ThreadingHTTPServer((f'127.0.0.{index}', self.port), handler)
+            server.daemon_threads = True
+            self.servers.append(server)
+        smtp = _ThreadingTCPServer(('127.0.0.1', 0), type('BoundSmtpHandler', (SmtpHandler,), {'state': self.state}))
+        self.smtp_port = smtp.server_address[1]
+        self.servers.append(smtp)
+        for server in self.servers:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def graph_base_url(self):
+        return f"http://127.0.0.1:{self.port}/graph/v1.0"
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', type=int, default=300)
+    parser.add_argument('--hosts', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02, help='목록/API 응답 지연(초)')
+    args = parser.parse_args()
+
+    # 포트는 시작 후에 정해지므로 대상 목록은 서버를 띄운 뒤 채웁니다.
+    state = StubState([], latency=args.latency)
+    with StubServers(state, args.hosts) as servers:
+        state.targets = synthetic_targets(args.targets, args.hosts, servers.port)
+        print(f"사이트/Graph: http://127.0.0.1:{servers.port} (호스트 {args.hosts}개), SMTP: 127.0.0.1:{servers.smtp_port}")
+        print(f"MS_GRAPH_BASE_URL={servers.graph_base_url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""크롤링 대상을 병렬로 실행하는 엔진입니다.
+
+전역 워커 수와 호스트별 동시 접속 수/요청 간격을 함께 제한하며,
+결과는 항상 입력된 대상 순서대로 반환하여 실행 결과가 결정적으로 유지됩니다.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+DEFAULT_WORKERS = 4       # 전체 동시 실행 워커 수
+DEFAULT_PER_HOST = 1      # 같은 호스트에 대한 최대 동시 접속 수
+DEFAULT_HOST_DELAY = 1.0  # 같은 호스트에 대한 요청 시작 간 최소 간격(초)
+
+
+def _env_number(name, default, cast):
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        print(f"🟡 경고: 환경 변수 {name}='{value}' 값이 올바르지 않아 기본값 {default}을(를) 사용합니다.")
+        return default
+
+
+def load_engine_config():
+    """환경 변수(CRAWL_WORKERS, CRAWL_PER_HOST, CRAWL_HOST_DELAY)에서 엔진 설정을 읽습니다."""
+    return {
+        'workers': max(1, _env_number('CRAWL_WORKERS', DEFAULT_WORKERS, int)),
+        'per_host': max(1, _env_number('CRAWL_PER_HOST', DEFAULT_PER_HOST, int)),
+        'host_delay': max(0.0, _env_number('CRAWL_HOST_DELAY', DEFAULT_HOST_DELAY, float)),
+    }
+
+
+def target_host(target):
+    """대상의 url 또는 api_url에서 호스트명을 추출합니다."""
+    url = target.get('url') or target.get('api_url') or ''
+    return urlparse(url).netloc.lower() or None
+
+
+class HostLimiter:
+    """호스트별 동시 접속 수와 요청 시작 간격을 제한합니다."""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST, delay=DEFAULT_HOST_DELAY):
+        self.per_host = per_host
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+    def wait_turn(self, host):
+        """같은 호스트의 직전 요청으로부터 delay 초가 지날 때까지 대기합니다."""
+        if not host or self.delay <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+    @contextmanager
+    def slot(self, host):
+        """호스트 슬롯을 확보한 뒤 요청 순서가 돌아올 때까지 대기합니다."""
+        if not host:
+            yield
+            return
+        with self._semaphore(host):
+            self.wait_turn(host)
+            yield
+
+
+def run_targets(targets, fetch_fn, workers=DEFAULT_WORKERS, limiter=None, inline=None, order_key=None):
+    """targets 각각에 fetch_fn을 실행하고 결과를 입력 순서대로 반환합니다.
+
+    inline(target)이 참인 대상은 워커 스레드가 아닌 호출 스레드에서 순차 실행합니다.
+    (예: 이벤트 루프가 필요한 JavaScript 렌더링 대상)
+    order_key(target)가 주어지면 값이 작은 대상부터 실행합니다. (반환 순서는 그대로 입력 순서)
+    """
+    limiter = limiter or HostLimiter()
+    results = [None] * len(targets)
+
+    def run(index):
+        target = targets[index]
+        with limiter.slot(target_host(target)):
+            results[index] = fetch_fn(target)
+
+    order = list(range(len(targets)))
+    if order_key:
+        order.sort(key=lambda i: order_key(targets[i]))
+
+    if workers <= 1:
+        for index in order:
+            run(index)
+        return results
+
+    inline_indexes = {i for i, t in enumerate(targets) if inline and inline(t)}
+    pooled_indexes = [i for i in order if i not in inline_indexes]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run, index) for index in pooled_indexes]
+        for index in (i for i in order if i in inline_indexes):
+            run(index)
+        for future in futures:
+            future.result()
+    return results
@@ -0,0 +1,215 @@
+"""실행(run) 단위 크롤링 계측과 성능 리포트입니다.
+
+대상별로 DNS/연결/전송 시간, 응답 바이트, 렌더링/파싱 시간, 항목 수, 신규 항목 수, 오류 종류를 기록하고,
+실행이 끝나면 가장 느린 대상과 네트워크/렌더링/파싱/Graph I/O 시간 비중을 JSON/CSV로 저장합니다.
+
+계측 값은 현재 스레드에서 처리 중인 대상(track())에 누적되므로, 핸들러는 record_timing()만 호출하면 됩니다.
+DNS/연결 시간은 transport 모듈의 연결 계층이 기록합니다.
+"""
+import csv
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+REPORT_DIR = os.environ.get('CRAWL_REPORT_DIR', 'reports')
+SLOWEST_COUNT = 10
+
+TIMING_FIELDS = ('dns', 'connect', 'network', 'render', 'parse')
+CSV_FIELDS = ('company', 'crawl_type', 'url', 'total', 'dns', 'connect', 'transfer', 'render', 'parse',
+              'requests', 'bytes', 'items', 'new_items', 'error')
+
+_local = threading.local()
+
+
+def _current():
+    return getattr(_local, 'record', None)
+
+
+def record_timing(field, seconds):
+    """현재 스레드의 대상 기록에 시간(초)을 더합니다. 추적 중이 아니면 무시합니다."""
+    record = _current()
+    if record is not None:
+        record[field] = record.get(field, 0.0) + seconds
+
+
+def record_response(seconds, size):
+    """HTTP 요청 한 번의 소요 시간(연결 포함)과 응답 바이트 수를 기록합니다."""
+    record = _current()
+    if record is not None:
+        record['network'] += seconds
+        record['bytes'] += size
+        record['requests'] += 1
+
+
+def record_transfer(seconds, size=0):
+    """스트리밍 응답의 본문 수신 시간과 (요청 시점에 집계되지 않은) 바이트 수를 더합니다."""
+    record = _current()
+    if record is not None:
+        record['network'] += seconds
+        record['bytes'] += size
+
+
+def record_error(error):
+    """현재 대상에서 발생한 오류의 종류를 기록합니다."""
+    record = _current()
+    if record is not None and not record.get('error'):
+        record['error'] = type(error).__name__
+
+
+def timed_request(session, method, url, **kwargs):
+    """session.request를 실행하고 소요 시간과 응답 바이트 수를 기록합니다. (stream 응답은 Content-Length 기준)"""
+    start = time.perf_counter()
+    response = session.request(method, url, **kwargs)
+    if kwargs.get('stream'):
+        size = int(response.headers.get('Content-Length') or 0)
+    else:
+        size = len(response.content)
+    record_response(time.perf_counter() - start, size)
+    return response
+
+
+@contextmanager
+def timed(field):
+    """with 블록의 소요 시간을 현재 대상 기록의 field에 더합니다."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(field, time.perf_counter() - start)
+
+
+class RunMetrics:
+    """한 번의 실행에서 대상별 기록과 단계별(Graph 등) 시간을 모읍니다."""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.records = []
+        self._by_target = {}
+        self.stages = {}
+
+    def _record_for(self, target):
+        with self._lock:
+            record = self._by_target.get(id(target))
+            if record is None:
+                record = {
+                    'company': target.get('company', 'N/A'),
+                    'crawl_type': (target.get('crawl_type') or 'CSS').upper(),
+                    'url': target.get('url') or target.get('api_url') or '',
+                    'total': 0.0, 'requests': 0, 'bytes': 0, 'items': 0, 'new_items': 0, 'error': None,
+                    **{field: 0.0 for field in TIMING_FIELDS},
+                }
+                self._by_target[id(target)] = record
+                self.records.append(record)
+            return record
+
+    @contextmanager
+    def track(self, target):
+        """with 블록 동안 현재 스레드의 계측 값을 target의 기록에 누적합니다."""
+        record = self._record_for(target)
+        previous = _current()
+        _local.record = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['total'] += time.perf_counter() - start
+            _local.record = previous
+
+    def set_counts(self, target, items=None, new_items=None):
+        record = self._record_for(target)
+        if items is not None:
+            record['items'] = items
+        if new_items is not None:
+            record['new_items'] = new_items
+
+    def error_for(self, target):
+        """target에서 기록된 오류 종류 (없으면 None)."""
+        return self._record_for(target)['error']
+
+    @contextmanager
+    def stage(self, name):
+        """대상과 무관한 단계(예: graph, email)의 소요 시간을 기록합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def summary(self):
+        """전체 소요 시간의 단계별 분해와 가장 느린 대상 목록."""
+        rows = [self._row(record) for record in self.records]
+        totals = {
+            'network': sum(r['network'] for r in self.records),
+            'render': sum(r['render'] for r in self.records),
+            'parse': sum(r['parse'] for r in self.records),
+            'graph': self.stages.get('graph', 0.0),
+        }
+        return {
+            'started_at': self.started_at.isoformat(),
+            'wall_time': round(time.perf_counter() - self._start, 3),
+            'targets': len(self.records),
+            'errors': sum(1 for r in self.records if r['error']),
+            'bytes': sum(r['bytes'] for r in self.records),
+            'items': sum(r['items'] for r in self.records),
+            'new_items': sum(r['new_items'] for r in self.records),
+            'time_split': {name: round(value, 3) for name, value in totals.items()},
+            'stages': {name: round(value, 3) for name, value in self.stages.items()},
+            'slowest_targets': sorted(rows, key=lambda r: r['total'], reverse=True)[:SLOWEST_COUNT],
+            'targets_detail': rows,
+        }
+
+    @staticmethod
+    def _row(record):
+        transfer = max(0.0, record['network'] - record['dns'] - record['connect'])
+        row = {field: record.get(field) for field in CSV_FIELDS if field != 'transfer'}
+        row['transfer'] = transfer
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in row.items()}
+
+    def write_report(self, report_dir=REPORT_DIR):
+        """crawl_report.json / crawl_report.csv를 저장하고 JSON 경로를 반환합니다."""
+        os.makedirs(report_dir, exist_ok=True)
+        summary = self.summary()
+        json_path = os.path.join(report_dir, 'crawl_report.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(report_dir, 'crawl_report.csv'), 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(summary['targets_detail'])
+        return json_path
+
+    def print_summary(self):
+        summary = self.summary()
+        split = ', '.join(f"{name} {value:.1f}s" for name, value in summary['time_split'].items())
+        print(f"📊 실행 시간 {summary['wall_time']:.1f}s | 대상 {summary['targets']}개 | 오류 {summary['errors']}개 | {split}")
+        for row in summary['slowest_targets'][:5]:
+            print(f"   - {row['company']}: {row['total']:.2f}s (네트워크 {row['dns'] + row['connect'] + row['transfer']:.2f}s, "
+                  f"렌더링 {row['render']:.2f}s, 파싱 {row['parse']:.2f}s){' ❌ ' + row['error'] if row['error'] else ''}")
+
+
+@contextmanager
+def profiled(enabled, report_dir=REPORT_DIR):
+    """enabled이면 블록을 cProfile로 실행하고 결과(.prof)와 누적 시간 상위 함수를 출력합니다."""
+    if not enabled:
+        yield
+        return
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, 'crawl_profile.prof')
+        profiler.dump_stats(path)
+        print(f"\n📈 cProfile 결과를 '{path}'에 저장했습니다. (누적 시간 상위 20개)")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
@@ -0,0 +1,96 @@
+"""공고일 정규화 모듈입니다.
+
+- 빠른 경로: YYYY.MM.DD / YYYY-MM-DD / YYYY/MM/DD / YYYY년 MM월 DD일 형식은 정규식 한 번으로 처리 (dateutil 미사용)
+- 같은 문자열은 LRU 캐시로 재사용 (목록 페이지의 날짜는 대부분 겹침)
+- API의 epoch 값(초/밀리초)은 한국 시간(KST) 기준 날짜로 변환
+- 페이지 단위 일괄 정규화(normalize_dates)와 정렬용 날짜(parse_date, announcement_sort_key)
+
+정규화 결과는 'YYYY-MM-DD' 문자열이며, 날짜가 없으면 'N/A', 형식을 알 수 없으면 원본 문자열입니다.
+"""
+import re
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+KST = timezone(timedelta(hours=9))
+NO_DATE = "N/A"
+_DATE = re.compile(r'(\d{4})\s*(?:[-./]|년)\s*(\d{1,2})\s*(?:[-./]|월)\s*(\d{1,2})')
+_ISO = re.compile(r'\d{4}-\d{2}-\d{2}')
+_EPOCH_MS_MIN = 10_000_000_000  # 이보다 큰 정수는 밀리초 단위 epoch
+_EPOCH_S_MIN = 1_000_000_000    # 2001-09-09 이후의 초 단위 epoch
+
+
+@lru_cache(maxsize=4096)
+def standardize_date(date_str):
+    """다양한 형식의 날짜 문자열을 YYYY-MM-DD 형식으로 변환합니다. (알 수 없는 형식은 원본 반환)"""
+    if not date_str or not isinstance(date_str, str):
+        return NO_DATE
+    match = _DATE.search(date_str)
+    if not match:
+        return date_str
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3))).isoformat()
+    except ValueError:
+        return date_str
+
+
+def epoch_to_date(value):
+    """epoch(초 또는 밀리초)를 KST 기준 YYYY-MM-DD로 변환합니다."""
+    seconds = value / 1000 if value >= _EPOCH_MS_MIN else value
+    return datetime.fromtimestamp(seconds, KST).strftime('%Y-%m-%d')
+
+
+@lru_cache(maxsize=256)
+def _strptime(value, date_format):
+    return datetime.strptime(value, date_format).strftime('%Y-%m-%d')
+
+
+def normalize_date(value, date_format=None):
+    """날짜 값 하나(문자열, epoch 숫자, None)를 정규화합니다. date_format이 있으면 먼저 strptime으로 해석합니다."""
+    if value is None or value == '':
+        return NO_DATE
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if value >= _EPOCH_S_MIN:
+            return epoch_to_date(value)
+        return standardize_date(str(value))
+    value = str(value)
+    if date_format:
+        try:
+            return _strptime(value.strip(), date_format)
+        except ValueError:
+            pass
+    return standardize_date(value)
+
+
+def normalize_dates(values, date_format=None):
+    """한 페이지의 날짜 열을 한 번에 정규화합니다. 같은 값은 한 번만 계산합니다."""
+    results = {}
+    normalized = []
+    for value in values:
+        key = (type(value), value)
+        try:
+            hash(key)
+        except TypeError:
+            # 목록/객체 값(예: Jackson의 [2024, 1, 5])은 캐시하지 않고 문자열로 둡니다.
+            normalized.append(str(value))
+            continue
+        if key not in results:
+            results[key] = normalize_date(value, date_format)
+        normalized.append(results[key])
+    return normalized
+
+
+def parse_date(value):
+    """정규화된 날짜 문자열을 date로 변환합니다. 날짜가 아니면 None."""
+    if isinstance(value, date):
+        return value
+    if not value or not _ISO.fullmatch(value):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def announcement_sort_key(announcement):
+    """공고 정렬 키 (공고일, 회사명). 날짜를 알 수 없는 공고는 가장 오래된 것으로 취급합니다."""
+    return parse_date(announcement.get('date')) or date.min, announcement.get('company') or ''
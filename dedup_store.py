@@ -0,0 +1,268 @@
+"""처리된 공고 링크(중복 방지 키)를 보관하는 저장소입니다.
+
+- sqlite (기본값): 키를 16바이트 해시로 저장하는 SQLite 테이블. 전체를 메모리에 올리지 않고
+  인덱스로 조회하며, 쓰기는 묶어서(batch) 반영합니다.
+  새로 추가된 키의 해시는 텍스트 로그(DEDUP_KEY_LOG, 한 줄에 hex 하나)에 덧붙이고, 시작할 때 로그 중
+  아직 반영하지 않은 부분을 SQLite로 가져옵니다. 저장소에 커밋하는 것은 추가만 되는 이 로그이며,
+  SQLite 파일은 로그로 다시 만들 수 있는 로컬 인덱스입니다. (실행마다 바이너리 파일 전체가 바뀌지 않도록)
+- text: 기존 processed_links.txt 방식 (전체를 set으로 로드, 줄 단위 추가).
+
+저장소 종류는 환경 변수 DEDUP_BACKEND(sqlite|text)로 선택합니다.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+LEGACY_TEXT_FILE = 'processed_links.txt'
+DEFAULT_DB_FILE = 'processed_links.db'
+DEFAULT_KEY_LOG = os.environ.get('DEDUP_KEY_LOG', 'processed_keys.log')
+DEFAULT_BATCH_SIZE = 500
+_HEX_DIGEST_LENGTH = 32
+
+
+def hash_key(key):
+    """키 문자열을 고정 길이(16바이트) 해시로 변환합니다."""
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+
+class TextDedupStore:
+    """기존 텍스트 파일 기반 저장소. 신규 키는 flush() 시 한 번에 추가 기록합니다."""
+
+    def __init__(self, path=LEGACY_TEXT_FILE):
+        self.path = path
+        self._keys = set()
+        self._pending = []
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._keys = set(line.strip() for line in f)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key):
+        if key not in self._keys:
+            self._keys.add(key)
+            self._pending.append(key)
+
+    def flush(self):
+        if not self._pending:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(key + '\n' for key in self._pending))
+        self._pending = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SqliteDedupStore:
+    """SQLite 기반 저장소. 키 해시를 PRIMARY KEY로 두어 조회 시 전체 로드가 필요 없습니다.
+
+    크롤링 워커 스레드에서도 조회할 수 있도록 연결 접근을 잠금으로 보호합니다.
+    log_path가 있으면 새 키의 해시를 로그에 덧붙이고, 열 때 로그의 새 줄을 가져옵니다. (meta의 log_offset까지 반영됨)
+    """
+
+    def __init__(self, path=DEFAULT_DB_FILE, batch_size=DEFAULT_BATCH_SIZE, log_path=DEFAULT_KEY_LOG):
+        self.path = path
+        self.batch_size = batch_size
+        self.log_path = log_path
+        self._log_existed = bool(log_path) and os.path.exists(log_path)
+        self._pending = {}
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_links ("
+            "key BLOB PRIMARY KEY, seen_at INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+        if log_path:
+            self._sync_log()
+
+    def _sync_log(self):
+        """로그 중 아직 반영하지 않은 줄을 가져옵니다. 로그가 없으면 현재 저장된 키로 새로 만듭니다."""
+        if not self._log_existed:
+            rows = self._conn.execute("SELECT key FROM processed_links").fetchall()
+            with open(self.log_path, 'w', encoding='ascii') as f:
+                f.write(''.join(row[0].hex() + '\n' for row in rows))
+            self.set_meta('log_offset', str(os.path.getsize(self.log_path)))
+            return
+        offset = int(self.get_meta('log_offset') or 0)
+        size = os.path.getsize(self.log_path)
+        if size < offset:
+            offset = 0  # 로그가 다른 파일로 바뀐 경우 처음부터 다시 가져옵니다.
+        if size == offset:
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1  # 중단된 쓰기로 잘린 마지막 줄은 다음에 가져옵니다.
+        digests, invalid = [], 0
+        for line in data[:end].decode('ascii', 'replace').split():
+            try:
+                if len(line) != _HEX_DIGEST_LENGTH:
+                    raise ValueError(line)
+                digests.append(bytes.fromhex(line))
+            except ValueError:
+                invalid += 1
+        if invalid:
+            print(f"🟡 경고: 키 로그 '{self.log_path}'에서 올바르지 않은 줄 {invalid}개를 건너뜁니다.")
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO processed_links (key, seen_at) VALUES (?, ?)",
+                                   ((digest, now) for digest in digests))
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('log_offset', ?)", (str(offset + end),))
+            self._conn.commit()
+
+    def __contains__(self, key):
+        digest = hash_key(key)
+        with self._lock:
+            if digest in self._pending:
+                return True
+            row = self._conn.execute("SELECT 1 FROM processed_links WHERE key = ?", (digest,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            self.flush()
+            return self._conn.execute("SELECT COUNT(*) FROM processed_links").fetchone()[0]
+
+    def add(self, key):
+        with self._lock:
+            self._pending[hash_key(key)] = int(time.time())
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def add_many(self, keys):
+        for key in keys:
+            self.add(key)
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            new_digests = [
+                digest for digest, seen_at in self._pending.items()
+                if self._conn.execute("INSERT OR IGNORE INTO processed_links (key, seen_at) VALUES (?, ?)",
+                                      (digest, seen_at)).rowcount
+            ]
+            if new_digests and self.log_path:
+                self._append_log(new_digests)
+            self._conn.commit()
+            self._pending = {}
+
+    def _append_log(self, digests):
+        """새 키의 해시를 로그에 덧붙입니다. 로그를 모두 반영한 상태였으면 log_offset도 함께 옮깁니다."""
+        size_before = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        with open(self.log_path, 'a', encoding='ascii') as f:
+            f.write(''.join(digest.hex() + '\n' for digest in digests))
+        if int(self.get_meta('log_offset') or 0) == size_before:
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('log_offset', ?)",
+                               (str(os.path.getsize(self.log_path)),))
+
+    def get_meta(self, name):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+            self._conn.commit()
+
+    def migrate_from_text(self, text_path=LEGACY_TEXT_FILE):
+        """기존 텍스트 파일의 링크를 한 번만 가져옵니다. 가져온 개수를 반환합니다.
+
+        키 로그가 이미 있었으면 이전이 끝난 것으로 봅니다. (SQLite 파일 없이 로그만 커밋된 경우)
+        """
+        if self.get_meta('migrated_from') or self._log_existed or not os.path.exists(text_path):
+            return 0
+        count = 0
+        with open(text_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                link = line.strip()
+                if link:
+                    self.add(link)
+                    count += 1
+        self.flush()
+        self.set_meta('migrated_from', text_path)
+        self.compact()
+        print(f"✅ '{text_path}'에서 {count}개의 처리된 링크를 '{self.path}'로 이전했습니다.")
+        return count
+
+    def compact(self):
+        """삭제/갱신으로 생긴 빈 페이지를 정리하여 파일 크기를 줄입니다."""
+        self.flush()
+        self._conn.execute("VACUUM")
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DeltaDedupStore:
+    """기존 저장소를 읽기 전용으로 사용하고, 새 키는 메모리(delta)에만 모읍니다.
+
+    샤드 실행에서 사용하며, 모은 키는 병합 단계에서 한 번에 기록합니다.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.delta = []
+        self._delta_set = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._delta_set:
+                return True
+        return key in self.base
+
+    def add(self, key):
+        with self._lock:
+            if key not in self._delta_set:
+                self._delta_set.add(key)
+                self.delta.append(key)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.base.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_dedup_store(backend=None, path=None):
+    """설정된 종류의 저장소를 엽니다. sqlite 저장소는 최초 실행 시 텍스트 파일을 이전합니다."""
+    backend = (backend or os.environ.get('DEDUP_BACKEND') or 'sqlite').lower()
+    if backend == 'text':
+        return TextDedupStore(path or LEGACY_TEXT_FILE)
+    if backend != 'sqlite':
+        print(f"🟡 경고: 지원되지 않는 DEDUP_BACKEND '{backend}'입니다. sqlite를 사용합니다.")
+    store = SqliteDedupStore(path or DEFAULT_DB_FILE)
+    store.migrate_from_text(LEGACY_TEXT_FILE)
+    return store
@@ -0,0 +1,152 @@
+"""Crawl_Targets 열로 정의하는 목록 항목 추출 규칙입니다.
+
+    title_source  제목을 읽을 곳. 비어 있으면 제목 링크의 텍스트, 태그 이름(예: h3)이면 항목 안의 첫 번째 해당 태그
+    link_attr     링크 값을 읽을 속성 (예: data-key, onclick). 비어 있으면 href를 읽고,
+                  href가 없거나 javascript/#이면 data-key → onclick/javascript: 인자 순서로 찾음
+    link_regex    속성 값(JavaScript 코드 등)에서 ID를 꺼낼 정규식. 첫 번째 그룹을 사용
+    link_format   ID를 넣을 링크 형식 ({id} 자리에 치환)
+    date_format   날짜 텍스트의 strptime 형식 (예: %Y.%m.%d). 비어 있거나 맞지 않으면 일반 날짜 정규화(date_norm)
+
+규칙은 대상마다 한 번 컴파일되어, 항목마다 그 사이트에 필요한 단계만 실행하는 추출 함수가 됩니다.
+"""
+import re
+
+from date_norm import NO_DATE, normalize_dates
+
+DEFAULT_LINK_REGEX = r"[(']([^()']+)[')]"  # 예: goView(11453) -> 11453, fnView('A1') -> A1
+
+
+class RuleError(ValueError):
+    """규칙 열의 값이 올바르지 않을 때 발생합니다."""
+
+
+def _compile_regex(pattern):
+    try:
+        regex = re.compile(pattern)
+    except re.error as e:
+        raise RuleError(f"link_regex '{pattern}'가 올바르지 않습니다: {e}")
+    if regex.groups < 1:
+        raise RuleError(f"link_regex '{pattern}'에 ID를 담을 그룹 ( )이 없습니다.")
+    return regex
+
+
+def _title_reader(engine, title_source):
+    """제목을 읽는 함수 (item, title_element) -> str"""
+    text = engine.text
+    if not title_source or title_source.lower() == 'link':
+        return lambda item, element: text(element)
+    if not re.fullmatch(r'[A-Za-z][A-Za-z0-9]*', title_source):
+        raise RuleError(f"title_source '{title_source}'는 태그 이름이어야 합니다.")
+    tag, find = title_source.lower(), engine.find
+
+    def read_title(item, element):
+        node = find(item, tag)
+        return text(node if node is not None else element)
+
+    return read_title
+
+
+def _link_reader(engine, link_attr, link_regex, link_format):
+    """링크를 읽는 함수 (title_element) -> str"""
+    get = engine.get
+
+    def from_id(value):
+        if not value:
+            return ''
+        if link_regex is not None:
+            match = link_regex.search(value)
+            if not match:
+                return ''
+            value = match.group(1)
+        return link_format.replace('{id}', value.strip()) if link_format else value.strip()
+
+    if link_attr:
+        # 지정된 속성만 읽습니다. (예: data-key, onclick)
+        return lambda element: from_id((get(element, link_attr) or '').strip())
+
+    default_regex = link_regex or _compile_regex(DEFAULT_LINK_REGEX)
+    find_parent_link = engine.find_parent_link
+
+    def read_link(element):
+        href = (get(element, 'href') or '').strip()
+        if not href:
+            parent_a = find_parent_link(element)
+            if parent_a is not None:
+                href = get(parent_a, 'href').strip()
+        if href and 'javascript' not in href.lower() and href != '#':
+            return href
+
+        # href가 없거나 javascript/# 링크이면 data-key, onclick 또는 javascript: 인자에서 ID를 찾습니다.
+        data_key = get(element, 'data-key')
+        if data_key and link_format:
+            return link_format.replace('{id}', str(data_key).strip())
+        js_code = (get(element, 'onclick') or '').strip()
+        if not js_code and href.lower().startswith('javascript:'):
+            js_code = href
+        if js_code and link_format:
+            match = default_regex.search(js_code)
+            if match:
+                return link_format.replace('{id}', match.group(1))
+        return href
+
+    return read_link
+
+
+def _date_reader(engine, has_date_selector):
+    """날짜 텍스트를 읽는 함수 (item) -> str | None. 정규화는 페이지 단위로 한 번에 수행합니다."""
+    if not has_date_selector:
+        return lambda item: None
+    select_date, text = engine.select_date, engine.text
+
+    def read_date(item):
+        element = select_date(item)
+        return text(element) if element is not None else None
+
+    return read_date
+
+
+def compile_css_extractor(target, engine):
+    """대상의 규칙 열을 컴파일하여, 목록 항목들에서 공고({title, href, date}) 목록을 만드는 함수를 반환합니다.
+
+    규칙 값이 잘못되었으면 RuleError를 발생시킵니다.
+    """
+    url = target.get('url') or ''
+    base = (target.get('base_url') or url).rstrip('/')
+    link_format = target.get('link_format')
+    link_regex = _compile_regex(target['link_regex']) if target.get('link_regex') else None
+
+    read_title = _title_reader(engine, (target.get('title_source') or '').strip())
+    read_link = _link_reader(engine, (target.get('link_attr') or '').strip(), link_regex, link_format)
+    read_date = _date_reader(engine, bool(target.get('date_selector')))
+    date_format = (target.get('date_format') or '').strip() or None
+    select_title = engine.select_title if target.get('title_link_selector') else (lambda item: None)
+    tag, get, find = engine.tag, engine.get, engine.find
+
+    def find_title_element(item):
+        # 1차: title_link_selector / 2차: item 자체가 <a href> / 3차: item 내부의 첫 번째 <a href>
+        element = select_title(item)
+        if element is not None:
+            return element
+        if tag(item) == 'a' and get(item, 'href'):
+            return item
+        return find(item, 'a', with_href=True)
+
+    def extract(items):
+        announcements, raw_dates = [], []
+        for item in items:
+            element = find_title_element(item)
+            if element is None:
+                continue
+            href = read_link(element)
+            title = read_title(item, element)
+            # 상대경로 링크를 절대경로로 변환
+            if href and not href.startswith('http') and not href.startswith('javascript'):
+                href = base + '/' + href.lstrip('/')
+            if href and title:
+                announcements.append({"title": title, "href": href, "date": NO_DATE})
+                raw_dates.append(read_date(item))
+        for announcement, post_date in zip(announcements, normalize_dates(raw_dates, date_format)):
+            announcement['date'] = post_date
+        return announcements
+
+    return extract
@@ -0,0 +1,89 @@
+"""대상별 조건부 요청(ETag/Last-Modified)과 목록 해시를 보관하는 캐시입니다.
+
+이전 실행과 비교하여 304 응답을 받거나 페이지/목록 영역 해시가 같으면
+파싱과 링크 추출을 건너뛸 수 있도록 합니다.
+추출 설정(선택자, 추출 규칙 등)이 바뀐 대상은 페이지가 같아도 건너뛰지 않습니다. (config_hash)
+"""
+import hashlib
+
+from json_store import JsonStateFile
+
+DEFAULT_CACHE_FILE = 'fetch_cache.json'
+
+# 목록 HTML에서 공고를 뽑는 결과에 영향을 주는 Crawl_Targets 열
+EXTRACTION_COLUMNS = (
+    'parser_engine', 'charset', 'item_selector', 'title_link_selector', 'date_selector', 'next_link_selector',
+    'title_source', 'link_attr', 'link_regex', 'link_format', 'base_url', 'date_format', 'identity_params',
+    'max_pages', 'page_param', 'page_start',
+)
+
+
+def new_content_hasher():
+    """content_hash와 같은 해시를 조각 단위로 계산하는 해시 객체 (update/hexdigest)."""
+    return hashlib.blake2b(digest_size=16)
+
+
+def content_hash(data):
+    """문자열 또는 바이트의 짧은 해시(hex)를 반환합니다."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    hasher = new_content_hasher()
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def target_cache_key(target):
+    """대상을 구분하는 캐시 키 (회사명 + 목록 URL)."""
+    return f"{target.get('company', '')}|{target.get('url') or target.get('api_url') or ''}"
+
+
+def target_config_hash(target):
+    """대상의 추출 설정 해시. 캐시 항목에 함께 기록하여, 설정이 바뀌면 변경 없음 판단을 하지 않도록 합니다."""
+    return content_hash('\n'.join(f"{column}={target.get(column) or ''}" for column in EXTRACTION_COLUMNS))
+
+
+class FetchCache(JsonStateFile):
+    """대상별 검증자(ETag/Last-Modified)와 해시를 JSON 파일로 보관합니다. 스레드 안전합니다."""
+
+    description = '요청 캐시'
+
+    def __init__(self, path=DEFAULT_CACHE_FILE):
+        super().__init__(path)
+        self.short_circuited = []  # (회사명, 사유)
+
+    def conditional_headers(self, key):
+        """이전 응답의 검증자로 조건부 요청 헤더를 만듭니다."""
+        with self._lock:
+            entry = self._entries.get(key, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, key, field, value):
+        """저장된 해시(field)가 value와 같은지 확인합니다."""
+        with self._lock:
+            return bool(value) and self._entries.get(key, {}).get(field) == value
+
+    def update(self, key, **fields):
+        """대상의 검증자/해시를 갱신합니다. 값이 None인 항목은 제거합니다."""
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            for name, value in fields.items():
+                if value is None:
+                    entry.pop(name, None)
+                else:
+                    entry[name] = value
+
+    def record_short_circuit(self, company, reason):
+        with self._lock:
+            self.short_circuited.append((company, reason))
+
+    def summary(self):
+        """건너뛴 대상 수를 사유별로 집계합니다."""
+        counts = {}
+        for _, reason in self.short_circuited:
+            counts[reason] = counts.get(reason, 0) + 1
+        return counts
@@ -0,0 +1,223 @@
+"""Microsoft Graph(Excel 통합 문서) 접근 계층입니다.
+
+- 연결을 재사용하는 공유 세션
+- 접근 토큰을 만료 시각까지 디스크에 캐시 (GRAPH_TOKEN_CACHE)
+- $batch로 여러 표(Settings, Crawl_Targets)를 한 번의 왕복으로 로드
+- 통합 문서 버전(cTag)이 같으면 로컬에 캐시된 설정을 재사용 (GRAPH_CONFIG_CACHE)
+- 대량 쓰기는 나누어 보내고, 429/503/504 응답은 Retry-After만큼 기다린 뒤 재시도 (행 추가는 중복을 막기 위해 429만)
+
+토큰/설정 캐시 파일에는 비밀 정보가 포함되므로 저장소에 커밋하지 않습니다.
+"""
+import json
+import os
+import time
+from urllib.parse import quote
+
+import msal
+import requests
+
+from transport import create_session
+
+GRAPH_BASE_URL = os.environ.get('MS_GRAPH_BASE_URL', 'https://graph.microsoft.com/v1.0')
+GRAPH_SCOPE = "https://graph.microsoft.com/.default"
+TOKEN_CACHE_FILE = os.environ.get('GRAPH_TOKEN_CACHE', '.graph_token_cache.json')
+CONFIG_CACHE_FILE = os.environ.get('GRAPH_CONFIG_CACHE', '.graph_config_cache.json')
+
+BATCH_LIMIT = 20          # Graph $batch 한 번에 담을 수 있는 최대 요청 수
+WRITE_CHUNK_SIZE = 200    # rows/add 한 번에 보낼 최대 행 수
+MAX_RETRIES = 5
+RETRY_STATUSES = (429, 503, 504)
+WRITE_RETRY_STATUSES = (429,) # 503/504는 쓰기가 이미 반영된 뒤일 수 있어 재시도하지 않음 (행 중복 방지)
+TOKEN_EXPIRY_MARGIN = 300 # 만료 5분 전부터는 새 토큰을 발급
+
+_session = None
+
+
+def get_session():
+    """Graph 호출에 재사용할 공유 세션을 반환합니다."""
+    global _session
+    if _session is None:
+        _session = create_session(pool_connections=2, pool_maxsize=4)
+    return _session
+
+
+def _write_private_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"  # 샤드 프로세스가 동시에 써도 겹치지 않도록
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def acquire_access_token(tenant_id, client_id, client_secret, cache_path=TOKEN_CACHE_FILE):
+    """캐시된 토큰이 유효하면 재사용하고, 아니면 MSAL로 새로 발급받습니다.
+
+    (access_token, error_description) 튜플을 반환합니다.
+    """
+    cache_id = f"{tenant_id}:{client_id}"
+    cached = _read_json(cache_path)
+    if cached and cached.get('id') == cache_id and cached.get('expires_at', 0) - TOKEN_EXPIRY_MARGIN > time.time():
+        return cached['access_token'], None
+
+    authority = f"https://login.microsoftonline.com/{tenant_id}"
+    app = msal.ConfidentialClientApplication(client_id, authority=authority, client_credential=client_secret,
+                                             http_client=get_session())
+    result = app.acquire_token_for_client(scopes=[GRAPH_SCOPE])
+    if "access_token" not in result:
+        return None, result.get("error_description")
+
+    if cache_path:
+        try:
+            _write_private_json(cache_path, {
+                'id': cache_id,
+                'access_token': result['access_token'],
+                'expires_at': time.time() + int(result.get('expires_in', 3600)),
+            })
+        except OSError as e:
+            print(f"🟡 경고: 토큰 캐시를 저장하지 못했습니다: {e}")
+    return result['access_token'], None
+
+
+def _retry_after(headers, attempt):
+    """Retry-After 헤더(초) 또는 지수 백오프 대기 시간."""
+    value = (headers or {}).get('Retry-After') or (headers or {}).get('retry-after')
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return min(60.0, 2.0 ** attempt)
+
+
+def rows_to_records(header, rows_data):
+    """표의 머리글과 rows 응답을 dict 목록으로 변환합니다. 빈 값('')은 None으로 바꿉니다."""
+    return [dict(zip(header, [val if val != '' else None for val in row['values'][0]])) for row in rows_data]
+
+
+class GraphClient:
+    """사용자 드라이브의 Excel 통합 문서 하나에 대한 Graph 클라이언트."""
+
+    def __init__(self, access_token, user_principal_name, excel_file_path, session=None, base_url=GRAPH_BASE_URL):
+        self.access_token = access_token
+        self.session = session or get_session()
+        self.base_url = base_url.rstrip('/')
+        # $batch 하위 요청의 url은 인코딩되지 않으므로 파일 경로를 미리 인코딩합니다.
+        self.item_path = f"/users/{user_principal_name}/drive/root:/{quote(excel_file_path, safe='/')}:"
+
+    @property
+    def headers(self):
+        return {'Authorization': f'Bearer {self.access_token}', 'Content-Type': 'application/json'}
+
+    def table_path(self, table_name, suffix=''):
+        return f"{self.item_path}/workbook/tables('{table_name}'){suffix}"
+
+    def request(self, method, path, retry_statuses=RETRY_STATUSES, **kwargs):
+        """retry_statuses(기본 429/503/504) 응답은 Retry-After를 지켜 재시도합니다. 최종 응답에 raise_for_status를 적용합니다."""
+        url = path if path.startswith('http') else self.base_url + path
+        for attempt in range(MAX_RETRIES + 1):
+            response = self.session.request(method, url, headers=self.headers, timeout=60, **kwargs)
+            if response.status_code not in retry_statuses or attempt == MAX_RETRIES:
+                break
+            wait = _retry_after(response.headers, attempt)
+            print(f"🟡 Graph API 요청 제한(HTTP {response.status_code}). {wait:.0f}초 후 재시도합니다.")
+            time.sleep(wait)
+        response.raise_for_status()
+        return response
+
+    def batch(self, sub_requests):
+        """GET 요청들을 $batch로 묶어 보내고 {id: 응답 본문}을 반환합니다. 실패한 하위 요청은 예외를 발생시킵니다."""
+        pending = {req['id']: req for req in sub_requests}
+        results = {}
+        for attempt in range(MAX_RETRIES + 1):
+            throttled, wait = {}, 0.0
+            ids = list(pending)
+            for start in range(0, len(ids), BATCH_LIMIT):
+                chunk = [pending[i] for i in ids[start:start + BATCH_LIMIT]]
+                payload = {'requests': [{'id': r['id'], 'method': 'GET', 'url': r['url']} for r in chunk]}
+                for sub in self.request('POST', '/$batch', json=payload).json().get('responses', []):
+                    status = sub.get('status', 500)
+                    if status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                        throttled[sub['id']] = pending[sub['id']]
+                        wait = max(wait, _retry_after(sub.get('headers'), attempt))
+                    elif status >= 400:
+                        error = (sub.get('body') or {}).get('error', {})
+                        raise requests.HTTPError(f"$batch 하위 요청 '{sub['id']}' 실패 (HTTP {status}): {error.get('message', '')}")
+                    else:
+                        results[sub['id']] = sub.get('body')
+            if not throttled:
+                return results
+            print(f"🟡 Graph $batch 일부 요청 제한. {wait:.0f}초 후 {len(throttled)}건을 재시도합니다.")
+            time.sleep(wait)
+            pending = throttled
+        return results
+
+    def get_tables(self, table_names):
+        """여러 표의 머리글과 행을 한 번의 $batch 요청으로 불러옵니다. {표 이름: 레코드 목록}"""
+        sub_requests = []
+        for index, name in enumerate(table_names):
+            sub_requests.append({'id': f"{index}-rows", 'url': self.table_path(name, '/rows')})
+            sub_requests.append({'id': f"{index}-header", 'url': self.table_path(name, '/headerRowRange')})
+        bodies = self.batch(sub_requests)
+        tables = {}
+        for index, name in enumerate(table_names):
+            header = bodies[f"{index}-header"]['values'][0]
+            tables[name] = rows_to_records(header, bodies[f"{index}-rows"].get('value', []))
+        return tables
+
+    def get_workbook_version(self):
+        """통합 문서의 내용 버전(cTag, 없으면 eTag)을 반환합니다."""
+        item = self.request('GET', self.item_path, params={'$select': 'cTag,eTag'}).json()
+        return item.get('cTag') or item.get('eTag')
+
+    def get_web_url(self):
+        """브라우저에서 통합 문서를 여는 주소(webUrl)를 반환합니다."""
+        return self.request('GET', self.item_path, params={'$select': 'webUrl'}).json().get('webUrl')
+
+    def load_tables_cached(self, table_names, cache_path=CONFIG_CACHE_FILE):
+        """통합 문서 버전이 캐시와 같으면 로컬 캐시를, 다르면 $batch로 새로 불러온 표를 반환합니다."""
+        version = self.get_workbook_version()
+        cached = _read_json(cache_path)
+        if cached and version and cached.get('version') == version and all(n in cached.get('tables', {}) for n in table_names):
+            print("✅ Excel 통합 문서가 변경되지 않아 캐시된 설정을 사용합니다.")
+            return {name: cached['tables'][name] for name in table_names}
+
+        tables = self.get_tables(table_names)
+        if cache_path and version:
+            try:
+                _write_private_json(cache_path, {'item': self.item_path, 'version': version, 'tables': tables})
+            except OSError as e:
+                print(f"🟡 경고: 설정 캐시를 저장하지 못했습니다: {e}")
+        return tables
+
+    def refresh_cached_version(self, version_before_write, cache_path=CONFIG_CACHE_FILE):
+        """자체 쓰기(신규 공고 저장) 후 바뀐 버전으로 설정 캐시를 갱신하여, 다음 실행에서 재다운로드를 피합니다.
+
+        쓰기 직전 버전이 캐시된 버전과 다르면(그사이 설정이 수정됨) 캐시를 갱신하지 않습니다.
+        """
+        cached = _read_json(cache_path)
+        if not cached or cached.get('item') != self.item_path or cached.get('version') != version_before_write:
+            return
+        cached['version'] = self.get_workbook_version()
+        _write_private_json(cache_path, cached)
+
+    def add_rows(self, table_name, rows, index=0, chunk_size=None):
+        """행을 chunk_size씩 나누어 삽입합니다. index 위치에 넣을 때도 전체 순서가 유지되도록 뒤 묶음부터 보냅니다."""
+        chunk_size = chunk_size or WRITE_CHUNK_SIZE
+        chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+        if index is not None:
+            chunks.reverse()
+        for chunk in chunks:
+            payload = {'values': chunk}
+            if index is not None:
+                payload['index'] = index
+            # 쓰기는 처리되지 않았음이 확실한 429만 재시도합니다.
+            self.request('POST', self.table_path(table_name, '/rows/add'), retry_statuses=WRITE_RETRY_STATUSES, json=payload)
+        return len(chunks)
@@ -0,0 +1,200 @@
+"""목록 페이지 HTML 파싱 엔진입니다.
+
+- bs4  : BeautifulSoup(html.parser) + soupsieve 선택자 (기존 방식)
+- lxml : libxml2 파서 + 대상별로 한 번만 컴파일한 XPath 선택자
+
+두 엔진은 같은 노드 연산(선택, 속성, 텍스트 등)을 제공하여 추출 결과가 동일하도록 합니다.
+대상별 parser_engine 열(bs4|lxml)로 선택하며, 비어 있으면 환경 변수 PARSER_ENGINE(기본 bs4)을 따릅니다.
+"""
+import os
+import threading
+
+import lxml.html
+from bs4 import BeautifulSoup
+from cssselect import HTMLTranslator, SelectorError
+from lxml import etree
+
+DEFAULT_ENGINE = os.environ.get('PARSER_ENGINE', 'bs4').lower()
+
+
+class SoupEngine:
+    """BeautifulSoup 기반 엔진."""
+
+    name = 'bs4'
+
+    def __init__(self, item_selector, title_selector=None, date_selector=None, next_selector=None):
+        self.item_selector = item_selector
+        self.title_selector = title_selector
+        self.date_selector = date_selector
+        self.next_selector = next_selector
+
+    @staticmethod
+    def parse_document(html):
+        return BeautifulSoup(html, 'html.parser')
+
+    def select_items(self, document):
+        return document.select(self.item_selector)
+
+    def parse_items(self, html):
+        return self.select_items(self.parse_document(html))
+
+    def select_next_href(self, document):
+        """다음 페이지 링크(next_link_selector)의 href를 반환합니다."""
+        if not self.next_selector:
+            return None
+        element = document.select_one(self.next_selector)
+        return element.get('href') if element is not None else None
+
+    def select_title(self, item):
+        return item.select_one(self.title_selector) if self.title_selector else None
+
+    def select_date(self, item):
+        return item.select_one(self.date_selector) if self.date_selector else None
+
+    @staticmethod
+    def tag(node):
+        return node.name
+
+    @staticmethod
+    def get(node, name):
+        return node.get(name)
+
+    @staticmethod
+    def find(node, tag, with_href=False):
+        return node.find(tag, href=True) if with_href else node.find(tag)
+
+    @staticmethod
+    def find_parent_link(node):
+        return node.find_parent('a', href=True)
+
+    @staticmethod
+    def text(node):
+        return node.get_text(strip=True)
+
+    @staticmethod
+    def serialize(node):
+        return str(node)
+
+
+class LxmlEngine:
+    """lxml 기반 엔진. 선택자를 생성 시 한 번만 XPath로 컴파일합니다."""
+
+    name = 'lxml'
+    _translator = HTMLTranslator()
+    _SKIP_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+
+    def __init__(self, item_selector, title_selector=None, date_selector=None, next_selector=None):
+        self.item_selector = item_selector
+        self.title_selector = title_selector
+        self.date_selector = date_selector
+        self.next_selector = next_selector
+        # 목록 항목/다음 페이지 링크는 문서 전체에서, 제목/날짜는 (bs4의 select_one과 같이) 항목의 자손에서만 찾습니다.
+        self._items = self._compile(item_selector, 'descendant-or-self::')
+        self._title = self._compile(title_selector, 'descendant::') if title_selector else None
+        self._date = self._compile(date_selector, 'descendant::') if date_selector else None
+        self._next = self._compile(next_selector, 'descendant-or-self::') if next_selector else None
+
+    @classmethod
+    def _compile(cls, selector, prefix):
+        return etree.XPath(cls._translator.css_to_xpath(selector, prefix=prefix))
+
+    @staticmethod
+    def parse_document(html):
+        try:
+            return lxml.html.document_fromstring(html)
+        except ValueError:
+            # XML 인코딩 선언이 포함된 str은 바이트로 변환하여 파싱
+            parser = lxml.html.HTMLParser(encoding='utf-8')
+            return lxml.html.document_fromstring(html.encode('utf-8'), parser=parser)
+
+    def select_items(self, document):
+        return self._items(document)
+
+    def parse_items(self, html):
+        return self.select_items(self.parse_document(html))
+
+    def select_next_href(self, document):
+        """다음 페이지 링크(next_link_selector)의 href를 반환합니다."""
+        element = self._first(self._next, document)
+        return element.get('href') if element is not None else None
+
+    @staticmethod
+    def _first(xpath, node):
+        if xpath is None:
+            return None
+        found = xpath(node)
+        return found[0] if found else None
+
+    def select_title(self, item):
+        return self._first(self._title, item)
+
+    def select_date(self, item):
+        return self._first(self._date, item)
+
+    @staticmethod
+    def tag(node):
+        return node.tag
+
+    @staticmethod
+    def get(node, name):
+        return node.get(name)
+
+    @staticmethod
+    def find(node, tag, with_href=False):
+        for element in node.iterdescendants(tag):
+            if not with_href or element.get('href') is not None:
+                return element
+        return None
+
+    @staticmethod
+    def find_parent_link(node):
+        for element in node.iterancestors('a'):
+            if element.get('href') is not None:
+                return element
+        return None
+
+    @classmethod
+    def text(cls, node):
+        # bs4 get_text(strip=True)와 같이 각 텍스트 조각을 strip 후 이어 붙입니다. (주석/script/style 제외)
+        parts = []
+        cls._collect_text(node, parts)
+        return ''.join(parts)
+
+    @classmethod
+    def _collect_text(cls, node, parts):
+        if node.text:
+            parts.append(node.text.strip())
+        for child in node:
+            if isinstance(child.tag, str) and child.tag not in cls._SKIP_TEXT_TAGS:
+                cls._collect_text(child, parts)
+            if child.tail:
+                parts.append(child.tail.strip())
+
+    @staticmethod
+    def serialize(node):
+        return etree.tostring(node, encoding='unicode', with_tail=False)
+
+
+ENGINES = {SoupEngine.name: SoupEngine, LxmlEngine.name: LxmlEngine}
+_local = threading.local()  # 컴파일된 XPath는 스레드 간에 공유하지 않습니다.
+
+
+def get_engine(target):
+    """대상에 맞는 파싱 엔진을 반환합니다. 같은 선택자 조합은 스레드별로 한 번만 컴파일합니다."""
+    name = (target.get('parser_engine') or DEFAULT_ENGINE).lower()
+    if name not in ENGINES:
+        print(f"🟡 경고: '{target.get('company')}'의 parser_engine '{name}'은 지원되지 않아 bs4를 사용합니다.")
+        name = SoupEngine.name
+    key = (name, target.get('item_selector'), target.get('title_link_selector'), target.get('date_selector'),
+           target.get('next_link_selector'))
+
+    cache = getattr(_local, 'engines', None)
+    if cache is None:
+        cache = _local.engines = {}
+    if key not in cache:
+        try:
+            cache[key] = ENGINES[name](*key[1:])
+        except (SelectorError, etree.XPathError) as e:
+            print(f"🟡 경고: '{target.get('company')}'의 선택자를 lxml로 컴파일하지 못해 bs4를 사용합니다: {e}")
+            cache[key] = SoupEngine(*key[1:])
+    return cache[key]
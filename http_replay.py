@@ -0,0 +1,145 @@
+"""크롤링 HTTP 응답의 기록(record)/재생(replay) 모드입니다.
+
+- record : 실제 사이트 응답을 픽스처 보관소(CRAWL_HTTP_ARCHIVE)에 저장하면서 그대로 사용
+- replay : 네트워크에 접속하지 않고 보관소의 응답만 사용 (없는 요청은 접속 실패로 처리)
+
+환경 변수 CRAWL_HTTP_MODE(record|replay)로 켜며, 크롤링 세션에만 적용됩니다. (Graph/메일은 대상이 아님)
+요청은 메서드, 최종 URL, 본문 해시로 구분하며 조건부 요청 헤더는 구분에 사용하지 않습니다.
+JavaScript 렌더링(브라우저) 요청은 기록되지 않습니다.
+"""
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.response import HTTPResponse
+
+HTTP_MODE = os.environ.get('CRAWL_HTTP_MODE', '').lower()
+ARCHIVE_FILE = os.environ.get('CRAWL_HTTP_ARCHIVE', os.path.join('fixtures', 'http_archive.json.gz'))
+
+# 본문은 이미 해제(decode)된 상태로 저장하므로 전송 관련 헤더는 버립니다.
+_DROP_HEADERS = frozenset({'content-encoding', 'transfer-encoding', 'content-length', 'connection'})
+
+
+def request_key(method, url, body=None):
+    """보관소에서 요청을 찾는 키: 'METHOD URL' (본문이 있으면 본문 해시를 덧붙임)."""
+    key = f"{method.upper()} {url}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        key += ' #' + hashlib.blake2b(body, digest_size=8).hexdigest()
+    return key
+
+
+class HttpArchive:
+    """gzip JSON 파일 하나에 {요청 키: 응답}을 보관합니다."""
+
+    def __init__(self, path=ARCHIVE_FILE):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if os.path.exists(path):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                self.entries = json.load(f).get('entries', {})
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, status, reason, headers, body):
+        with self._lock:
+            self.entries[key] = {
+                'status': status,
+                'reason': reason,
+                'headers': {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS},
+                'body': base64.b64encode(body).decode('ascii'),
+            }
+            self._dirty = True
+        return self.entries[key]
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump({'version': 1, 'entries': self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        print(f"✅ HTTP 응답 {len(self.entries)}건을 '{self.path}'에 기록했습니다.")
+
+
+def _build_response(adapter, request, entry):
+    raw = HTTPResponse(
+        body=io.BytesIO(base64.b64decode(entry['body'])),
+        headers=entry['headers'],
+        status=entry['status'],
+        reason=entry.get('reason'),
+        preload_content=False,
+        decode_content=False,
+    )
+    return HTTPAdapter.build_response(adapter, request, raw)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """실제로 요청한 뒤 응답을 보관소에 기록하고, 재생 모드와 같은 형태의 응답을 돌려줍니다."""
+
+    def __init__(self, archive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        entry = self.archive.put(request_key(request.method, request.url, request.body),
+                                 response.status_code, response.reason, response.headers, response.content)
+        return _build_response(self, request, entry)
+
+
+class ReplayAdapter(BaseAdapter):
+    """보관소의 응답만 돌려주는 어댑터. 기록되지 않은 요청은 ConnectionError를 발생시킵니다."""
+
+    def __init__(self, archive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        entry = self.archive.get(request_key(request.method, request.url, request.body))
+        if entry is None:
+            raise requests.ConnectionError(f"재생 보관소에 기록되지 않은 요청입니다: {request.method} {request.url}",
+                                           request=request)
+        return _build_response(self, request, entry)
+
+    def close(self):
+        pass
+
+
+_archive = None
+
+
+def install_http_mode(session, mode=None, archive_path=None):
+    """session에 기록/재생 어댑터를 연결합니다. 모드가 꺼져 있으면 아무것도 하지 않고 None을 반환합니다."""
+    global _archive
+    mode = (mode or HTTP_MODE or '').lower()
+    if not mode:
+        return None
+    if mode not in ('record', 'replay'):
+        print(f"🟡 경고: 지원되지 않는 CRAWL_HTTP_MODE '{mode}'입니다. 실제 사이트에 접속합니다.")
+        return None
+    _archive = HttpArchive(archive_path or ARCHIVE_FILE)
+    adapter = RecordingAdapter(_archive) if mode == 'record' else ReplayAdapter(_archive)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    print(f"ℹ️ HTTP {mode} 모드: '{_archive.path}' ({len(_archive.entries)}건)")
+    return _archive
+
+
+def save_http_archive():
+    """record 모드에서 기록한 응답을 저장합니다."""
+    if _archive is not None:
+        _archive.save()
@@ -0,0 +1,141 @@
+"""API 응답(JSON)용 간단한 경로 언어입니다.
+
+    data.list            딕셔너리 키를 차례로 따라감
+    data.list[0].title   배열 인덱스 (음수 가능, 'list.0'처럼 점 표기도 허용)
+    data.groups[*].items 와일드카드 (모든 원소/값)
+    data['a.b']          점이 포함된 키
+    title|제목 없음      경로가 없을 때 사용할 기본값
+    $                    응답 전체
+
+경로는 대상별로 한 번만 컴파일하며, 키가 없거나 중간 값의 형식이 달라도 예외 없이 기본값을 돌려줍니다.
+대용량 응답은 ijson(선택 설치)이 있으면 목록 경로만 스트리밍으로 파싱할 수 있습니다.
+"""
+import re
+from functools import lru_cache
+
+_TOKEN = re.compile(r"""\[(?:(-?\d+)|(\*)|'([^']*)'|"([^"]*)")\]|\.?([^.\[\]]+)""")
+_WILDCARD = object()
+
+
+class JsonPathError(ValueError):
+    """경로 문법 오류."""
+
+
+class JsonPath:
+    """컴파일된 JSON 경로."""
+
+    def __init__(self, expr):
+        self.expr = expr
+        path, sep, default = expr.partition('|')
+        self.default = default if sep else None
+        self.steps = self._parse(path.strip())
+        self.has_wildcard = any(step is _WILDCARD for step in self.steps)
+
+    @staticmethod
+    def _parse(path):
+        if path in ('', '$'):
+            return ()
+        if path.startswith('$'):
+            path = path[1:]
+        steps, pos = [], 0
+        while pos < len(path):
+            match = _TOKEN.match(path, pos)
+            if not match or match.end() == pos:
+                raise JsonPathError(f"잘못된 JSON 경로입니다: '{path}' ({pos}번째 문자)")
+            index, star, quoted1, quoted2, name = match.groups()
+            if index is not None:
+                steps.append(int(index))
+            elif star or name == '*':
+                steps.append(_WILDCARD)
+            else:
+                steps.append(quoted1 if quoted1 is not None else quoted2 if quoted2 is not None else name)
+            pos = match.end()
+        return tuple(steps)
+
+    def find(self, data):
+        """경로와 일치하는 모든 값을 목록으로 반환합니다. (와일드카드가 없으면 0개 또는 1개)"""
+        current = [data]
+        for step in self.steps:
+            matched = []
+            for value in current:
+                if step is _WILDCARD:
+                    if isinstance(value, list):
+                        matched.extend(value)
+                    elif isinstance(value, dict):
+                        matched.extend(value.values())
+                elif isinstance(value, dict):
+                    key = step if isinstance(step, str) else str(step)
+                    if key in value:
+                        matched.append(value[key])
+                elif isinstance(value, list):
+                    index = step if isinstance(step, int) else int(step) if str(step).lstrip('-').isdigit() else None
+                    if index is not None and -len(value) <= index < len(value):
+                        matched.append(value[index])
+            current = matched
+            if not current:
+                break
+        return current
+
+    def get(self, data):
+        """첫 번째 일치 값을 반환합니다. 없거나 None이면 기본값을 반환합니다."""
+        for value in self.find(data):
+            if value is not None:
+                return value
+        return self.default
+
+    def items(self, data):
+        """목록 경로로 사용할 때의 항목들. 일치한 값이 리스트면 펼쳐서 이어 붙입니다."""
+        items = []
+        for value in self.find(data):
+            if isinstance(value, list):
+                items.extend(value)
+            elif self.has_wildcard and value is not None:
+                items.append(value)
+        return items
+
+    def stream_prefix(self):
+        """ijson 스트리밍용 prefix. 인덱스/와일드카드가 포함된 경로는 스트리밍할 수 없어 None을 반환합니다.
+
+        ijson의 item은 배열 원소만 순회하므로, 딕셔너리 값까지 펼치는 와일드카드나
+        일치한 값이 리스트가 아니어도 항목으로 쓰는 items()와 결과가 달라질 수 있습니다.
+        """
+        if self.has_wildcard:
+            return None
+        parts = []
+        for step in self.steps:
+            if isinstance(step, int) or '.' in step:
+                return None
+            parts.append(step)
+        return '.'.join(parts + ['item'])
+
+    def __repr__(self):
+        return f"JsonPath({self.expr!r})"
+
+
+@lru_cache(maxsize=512)
+def compile_path(expr):
+    """경로 문자열을 컴파일합니다. 같은 문자열은 한 번만 컴파일합니다."""
+    return JsonPath(expr or '')
+
+
+def compile_extractor(field_paths):
+    """{필드명: 경로 문자열}을 컴파일하여, 항목 하나에서 모든 필드를 한 번에 꺼내는 함수를 반환합니다."""
+    compiled = tuple((name, compile_path(expr)) for name, expr in field_paths.items() if expr)
+
+    def extract(item):
+        return {name: path.get(item) for name, path in compiled}
+
+    return extract
+
+
+def stream_items(fileobj, path):
+    """응답 스트림에서 path 위치의 목록 항목만 하나씩 파싱합니다. ijson이 없거나 지원되지 않는 경로면 None."""
+    prefix = path.stream_prefix()
+    if prefix is None:
+        return None
+    try:
+        import ijson
+    except ImportError:
+        print("🟡 경고: ijson이 설치되어 있지 않아 JSON 스트리밍 대신 전체 파싱을 사용합니다.")
+        return None
+    return ijson.items(fileobj, prefix, use_float=True)
@@ -0,0 +1,59 @@
+"""실행 사이에 이어지는 상태 파일(JSON)의 공통 처리입니다.
+
+요청 캐시, 호스트 상태, 인코딩 캐시, 크롤링 일정이 같은 방식으로 보관됩니다.
+  - {키: 항목} 형태의 dict 하나를 잠금과 함께 보관
+  - 파일을 읽지 못하면 경고 후 빈 상태로 시작
+  - 임시 파일에 쓴 뒤 교체하여 저장 (중단 시 반쪽 파일이 남지 않음)
+  - 샤드 실행에서는 export()로 자기 대상의 항목만 꺼내고, 병합 단계에서 merge()로 반영
+"""
+import copy
+import json
+import os
+import threading
+
+
+def env_float(name, default):
+    """환경 변수를 실수로 읽습니다. 비어 있거나 올바르지 않으면 default."""
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        print(f"🟡 경고: 환경 변수 {name} 값이 올바르지 않아 기본값 {default}을(를) 사용합니다.")
+        return default
+
+
+class JsonStateFile:
+    """{키: 항목}을 JSON 파일로 보관하는 상태의 기반 클래스. 스레드 안전합니다.
+
+    하위 클래스는 self._lock을 잡은 채로 self._entries를 읽고 씁니다.
+    description은 파일을 읽지 못했을 때의 경고 문구에 사용됩니다.
+    """
+
+    description = '상태 파일'
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"🟡 경고: {self.description} '{path}'를 읽지 못해 새로 시작합니다: {e}")
+
+    def export(self, keys):
+        """keys에 해당하는 항목만 꺼냅니다. (샤드 결과 파일에 기록)"""
+        with self._lock:
+            return {key: copy.copy(self._entries[key]) for key in keys if key in self._entries}
+
+    def merge(self, entries):
+        """export()로 꺼낸 항목을 반영합니다."""
+        with self._lock:
+            self._entries.update(entries)
+
+    def save(self):
+        with self._lock:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
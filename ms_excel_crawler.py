@@ -1,23 +1,62 @@
 import requests
 from requests_html import HTMLSession # 동적 컨텐츠 렌더링을 위해 requests_html 사용
-from bs4 import BeautifulSoup
-import smtplib
 from email.mime.text import MIMEText
 from email.header import Header
+import argparse
 import os
 import time
 from datetime import datetime, timezone, timedelta
 import json
-import msal
-import re
-from dateutil.parser import parse as date_parse # 날짜 형식 표준화를 위해 dateutil 라이브러리 사용
+from contextlib import nullcontext
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+from crawl_engine import HostLimiter, load_engine_config, run_targets, target_host
+from dedup_store import DeltaDedupStore, open_dedup_store
+from url_canon import dedup_key, legacy_dedup_key
+from fetch_cache import FetchCache, content_hash, target_cache_key, target_config_hash
+from renderer import BrowserRenderer
+from html_engine import get_engine
+from graph_client import GraphClient, acquire_access_token
+from json_path import JsonPathError, compile_extractor, compile_path, stream_items
+from crawl_metrics import REPORT_DIR, RunMetrics, profiled, record_error, timed, timed_request
+from http_replay import install_http_mode, save_http_archive
+from resilience import HostHealth
+from date_norm import announcement_sort_key, normalize_dates
+from extract_rules import RuleError, compile_css_extractor
+from page_encoding import CharsetCache, normalize_charset, read_html
+from transport import USER_AGENT, close_smtp_connection, create_crawl_session, get_smtp_connection, install_connection_layer
+from notifications import (receiver_groups_from_settings, render_no_new_announcements, render_skipped_hosts,
+                           render_summary, send_digests)
+from scheduler import CrawlSchedule
+from sharding import parse_shard, read_partials, remove_partials, select_shard, shard_from_env, write_partial
 
 # --- 1. 설정 및 전역 변수 ---
-PROCESSED_LINKS_FILE = 'processed_links.txt'
-
-# --- 2. Microsoft Graph API 연동 함수들 (기존과 동일) ---
+# 처리된 링크 저장소는 dedup_store 모듈에서 관리합니다. (DEDUP_BACKEND=sqlite|text)
+FETCH_CACHE_FILE = os.environ.get('FETCH_CACHE_FILE', 'fetch_cache.json')
+FETCH_CACHE = None # main()에서 초기화되는 대상별 조건부 요청 캐시 (ETag/Last-Modified, 목록 해시)
+JS_RENDER_ENGINE = os.environ.get('JS_RENDER_ENGINE', 'pool').lower() # pool: 공유 브라우저, legacy: requests_html render
+RENDERER = None # main()에서 초기화되는 공유 헤드리스 브라우저 (renderer.BrowserRenderer)
+HOST_LIMITER = None # crawl_all_targets()에서 설정되는 호스트별 요청 간격 제한기 (페이지 이동 시 사용)
+METRICS = None # main()에서 초기화되는 실행 계측 (crawl_metrics.RunMetrics)
+HOST_HEALTH_FILE = os.environ.get('HOST_HEALTH_FILE', 'host_health.json')
+HOST_HEALTH = None # main()에서 초기화되는 호스트별 타임아웃/재시도/서킷 상태 (resilience.HostHealth)
+CHARSET_CACHE_FILE = os.environ.get('CHARSET_CACHE_FILE', 'charset_cache.json')
+CHARSET_CACHE = None # main()에서 초기화되는 호스트별 인코딩 캐시 (page_encoding.CharsetCache)
+CRAWL_SCHEDULE_FILE = os.environ.get('CRAWL_SCHEDULE_FILE', 'crawl_schedule.json')
+# Y이면 예정 시각이 된 대상만 크롤링. 한산한 게시판은 최대 CRAWL_MAX_INTERVAL_HOURS 간격으로 확인하므로,
+# 실행 주기가 그보다 짧을 때(데몬 모드, 잦은 cron)에만 켭니다. 기본(N)은 매 실행 모든 대상을 크롤링합니다.
+SCHEDULE_ENABLED = os.environ.get('CRAWL_SCHEDULE', 'N').upper() == 'Y'
+SCHEDULE = None # main()에서 초기화되는 대상별 크롤링 일정 (scheduler.CrawlSchedule)
+CRAWL_TARGETS = None # main()에서 설정되는 이번 실행의 전체 대상 (데몬 모드의 다음 예정 시각 계산용)
+DAEMON_POLL_SECONDS = 1800 # 데몬 모드에서 실행 사이의 최대 대기 시간
+DAEMON_MIN_SLEEP = 300 # 실패가 반복되어 항상 예정 상태인 대상이 있어도 이보다 자주 실행하지 않음
+SMTP_HOST = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', '587'))
+SMTP_STARTTLS = os.environ.get('SMTP_STARTTLS', 'Y').upper() != 'N' # 로컬 테스트용 SMTP 서버에서는 N
+# User-Agent 등 공통 헤더는 transport 모듈의 세션 기본 헤더로 설정됩니다.
+
+# --- 2. Microsoft Graph API 연동 함수들 (graph_client 모듈 사용) ---
 def get_ms_graph_access_token():
-    """Azure AD에서 MS Graph API 접근 토큰을 발급받습니다."""
+    """Azure AD에서 MS Graph API 접근 토큰을 발급받습니다. (만료 전까지 디스크 캐시 재사용)"""
     tenant_id = os.environ.get('MS_TENANT_ID')
     client_id = os.environ.get('MS_CLIENT_ID')
     client_secret = os.environ.get('MS_CLIENT_SECRET')
@@ -26,73 +65,66 @@ def get_ms_graph_access_token():
         print("❌ MS_TENANT_ID, MS_CLIENT_ID, MS_CLIENT_SECRET Secret이 설정되지 않았습니다.")
         return None
 
-    authority = f"https://login.microsoftonline.com/{tenant_id}"
-    app = msal.ConfidentialClientApplication(
-        client_id, authority=authority, client_credential=client_secret
-    )
-    result = app.acquire_token_for_client(scopes=["https://graph.microsoft.com/.default"])
-
-    if "access_token" in result:
+    access_token, error = acquire_access_token(tenant_id, client_id, client_secret)
+    if access_token:
         print("✅ MS Graph API 토큰 발급 성공.")
-        return result['access_token']
+        return access_token
     else:
-        print("❌ MS Graph API 토큰 발급 실패:", result.get("error_description"))
+        print("❌ MS Graph API 토큰 발급 실패:", error)
         return None
 
-def get_excel_data(access_token, sheet_name):
-    """MS Graph API를 통해 Excel 시트의 데이터를 불러옵니다."""
+def get_graph_client(access_token):
+    """환경 변수의 Excel 파일 정보로 GraphClient를 만듭니다. 설정이 없으면 None을 반환합니다."""
     user_principal_name = os.environ.get('MS_USER_PRINCIPAL_NAME')
     excel_file_path = os.environ.get('MS_EXCEL_FILE_PATH')
 
     if not all([user_principal_name, excel_file_path]):
         print("❌ MS_USER_PRINCIPAL_NAME 또는 MS_EXCEL_FILE_PATH Secret이 설정되지 않았습니다.")
-        return []
-    
-    graph_url = f"https://graph.microsoft.com/v1.0/users/{user_principal_name}/drive/root:/{excel_file_path}:/workbook/tables('{sheet_name}')/rows"
-    headers = {'Authorization': f'Bearer {access_token}', 'Content-Type': 'application/json'}
-    
-    try:
-        response = requests.get(graph_url, headers=headers)
-        response.raise_for_status()
-        rows_data = response.json().get('value', [])
-        
-        header_url = f"https://graph.microsoft.com/v1.0/users/{user_principal_name}/drive/root:/{excel_file_path}:/workbook/tables('{sheet_name}')/headerRowRange"
-        header_response = requests.get(header_url, headers=headers)
-        header_response.raise_for_status()
-        header = header_response.json()['values'][0]
+        return None
+    return GraphClient(access_token, user_principal_name, excel_file_path)
 
-        # 빈 행('')을 None으로 변환하여 일관성 유지
-        records = [dict(zip(header, [val if val != '' else None for val in row['values'][0]])) for row in rows_data]
-        print(f"✅ Excel '{sheet_name}' 시트에서 {len(records)}개의 행을 로드했습니다.")
-        return records
+def get_excel_tables(access_token, sheet_names):
+    """여러 Excel 표를 한 번에 불러옵니다. 통합 문서가 바뀌지 않았으면 로컬 캐시를 사용합니다."""
+    client = get_graph_client(access_token)
+    if not client:
+        return {name: [] for name in sheet_names}
+
+    try:
+        tables = client.load_tables_cached(sheet_names)
+        for name in sheet_names:
+            print(f"✅ Excel '{name}' 시트에서 {len(tables[name])}개의 행을 로드했습니다.")
+        return tables
 
     except requests.exceptions.HTTPError as e:
-        print(f"❌ Excel '{sheet_name}' 시트 로드 실패 (HTTP {e.response.status_code}): {e.response.text}")
+        detail = f"HTTP {e.response.status_code}): {e.response.text}" if e.response is not None else f"{e})"
+        print(f"❌ Excel 시트 로드 실패 ({detail}")
         print("     (Excel 파일 경로, 시트/표 이름, API 권한을 확인해주세요.)")
-        return []
     except Exception as e:
-        print(f"❌ Excel '{sheet_name}' 시트 처리 중 오류: {e}")
-        return []
+        print(f"❌ Excel 시트 처리 중 오류: {e}")
+    return {name: [] for name in sheet_names}
+
+def get_excel_data(access_token, sheet_name):
+    """MS Graph API를 통해 Excel 시트의 데이터를 불러옵니다."""
+    return get_excel_tables(access_token, [sheet_name])[sheet_name]
 
 def save_announcements_to_excel(access_token, announcements):
-    """새로운 공고를 Excel 테이블의 맨 위에 삽입합니다."""
+    """새로운 공고를 Excel 테이블의 맨 위에 삽입합니다. (대량이면 나누어 전송)"""
     if not announcements: return
-    user_principal_name, excel_file_path = os.environ.get('MS_USER_PRINCIPAL_NAME'), os.environ.get('MS_EXCEL_FILE_PATH')
+    client = get_graph_client(access_token)
+    if not client: return
     sheet_name = "Collected_Announcements"
-    graph_url = f"https://graph.microsoft.com/v1.0/users/{user_principal_name}/drive/root:/{excel_file_path}:/workbook/tables('{sheet_name}')/rows/add"
-    headers = {'Authorization': f'Bearer {access_token}', 'Content-Type': 'application/json'}
     kst = timezone(timedelta(hours=9))
     collected_time_kst = datetime.now(kst).strftime('%Y-%m-%d %H:%M:%S')
     rows_to_add = [[collected_time_kst, ann['company'], ann['title'], ann.get('date', 'N/A'), ann['href']] for ann in announcements]
     
-    payload = {"values": rows_to_add, "index": 0}
-    
     try:
-        response = requests.post(graph_url, headers=headers, json=payload)
-        response.raise_for_status()
-        print("✅ Excel에 신규 공고 저장 완료.")
+        version_before_write = client.get_workbook_version()
+        chunks = client.add_rows(sheet_name, rows_to_add, index=0)
+        print(f"✅ Excel에 신규 공고 저장 완료. ({len(rows_to_add)}행, {chunks}회 요청)")
+        client.refresh_cached_version(version_before_write)
     except requests.exceptions.HTTPError as e:
-        print(f"❌ Excel 저장 중 오류 발생 (HTTP {e.response.status_code}): {e.response.text}")
+        detail = f"HTTP {e.response.status_code}): {e.response.text}" if e.response is not None else f"{e})"
+        print(f"❌ Excel 저장 중 오류 발생 ({detail}")
     except Exception as e:
         print(f"❌ Excel 저장 중 오류 발생: {e}")
 
@@ -119,58 +151,201 @@ def send_email(subject, body, receiver_emails):
     msg['To'] = ", ".join(receiver_emails)
     
     try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_password)
-            server.sendmail(msg['From'], receiver_emails, msg.as_string())
+        # 실행 중에는 로그인한 SMTP 연결을 재사용합니다. (main() 종료 시 닫힘)
+        server = get_smtp_connection(SMTP_HOST, SMTP_PORT, smtp_user, smtp_password, SMTP_STARTTLS)
+        server.sendmail(msg['From'], receiver_emails, msg.as_string())
         print(f"✅ 이메일 발송 성공: {subject}")
     except Exception as e:
         print(f"❌ 이메일 발송 실패: {e}")
 
 def load_processed_links():
-    if not os.path.exists(PROCESSED_LINKS_FILE): return set()
-    with open(PROCESSED_LINKS_FILE, 'r', encoding='utf-8') as f: return set(line.strip() for line in f)
+    """처리된 링크 저장소를 엽니다. 신규 링크는 add() 후 flush()/close() 시 일괄 기록됩니다."""
+    return open_dedup_store()
 
-def save_processed_link(link):
-    with open(PROCESSED_LINKS_FILE, 'a', encoding='utf-8') as f: f.write(link + '\n')
+def generate_skipped_hosts_html(skipped_hosts):
+    """연속 실패로 이번 실행에서 건너뛴 호스트 안내 (없으면 빈 문자열)."""
+    return render_skipped_hosts(skipped_hosts)
 
-def generate_summary_email_body(announcements):
-    kst = timezone(timedelta(hours=9))
-    html = """<head><style>body{font-family:sans-serif}.container{border:1px solid #ddd;padding:20px;margin:20px;border-radius:8px}h2{color:#005aab}table{width:100%;border-collapse:collapse}th,td{border:1px solid #ddd;padding:12px;text-align:left}th{background-color:#f2f2f2}a{color:#005aab;text-decoration:none}a:hover{text-decoration:underline}.footer{margin-top:20px;font-size:12px;color:#888}</style></head><body><div class="container"><h2>📢 신규 공고 요약</h2><p><strong>""" + datetime.now(kst).strftime('%Y년 %m월 %d일') + """</strong>에 발견된 신규 공고 목록입니다.</p><table><thead><tr><th>회사명</th><th>공고일</th><th>공고 제목</th></tr></thead><tbody>"""
-    for ann in announcements:
-        html += f"""<tr><td>{ann['company']}</td><td>{ann.get('date', 'N/A')}</td><td><a href="{ann['href']}">{ann['title']}</a></td></tr>"""
-    html += """</tbody></table><p class="footer">본 메일은 자동화된 스크립트에 의해 발송되었습니다.</p></div></body>"""
-    return html
+def generate_summary_email_body(announcements, skipped_hosts=None, excel_url=None):
+    """회사별로 묶은 신규 공고 요약 본문 (크기 제한을 넘는 공고는 Excel 시트 링크로 안내)."""
+    return render_summary(announcements, skipped_hosts, excel_url)[0]
 
 # --- [추가된 함수] ---
-def generate_no_new_announcements_email_body():
+def generate_no_new_announcements_email_body(skipped_hosts=None):
     """신규 공고가 없을 때 발송할 이메일 본문을 생성합니다."""
-    kst = timezone(timedelta(hours=9))
-    html = """<head><style>body{font-family:sans-serif}.container{border:1px solid #ddd;padding:20px;margin:20px;border-radius:8px}h2{color:#005aab}.footer{margin-top:20px;font-size:12px;color:#888}</style></head><body><div class="container"><h2>📝 금일 신규 입찰 공고 없음</h2><p><strong>""" + datetime.now(kst).strftime('%Y년 %m월 %d일') + """</strong> 기준, 모니터링 중인 사이트에서 새로운 입찰 공고를 찾지 못했습니다.</p><p class="footer">본 메일은 자동화된 스크립트에 의해 발송되었습니다.</p></div></body>"""
-    return html
+    return render_no_new_announcements(skipped_hosts)
+
+def get_excel_web_url(access_token, settings):
+    """메일에서 연결할 Excel 통합 문서 주소. Settings의 'Excel URL' 또는 EXCEL_WEB_URL, 없으면 Graph의 webUrl."""
+    url = settings.get('Excel URL') or os.environ.get('EXCEL_WEB_URL')
+    if url:
+        return url
+    client = get_graph_client(access_token)
+    if not client:
+        return None
+    try:
+        return client.get_web_url()
+    except Exception as e:
+        print(f"🟡 경고: Excel 주소를 가져오지 못해 메일에 링크를 넣지 않습니다: {e}")
+        return None
+
+def http_request(session, method, url, **kwargs):
+    """크롤링 요청 공통 경로: 호스트별 적응형 타임아웃, 일시적 오류 재시도, 서킷 차단을 적용합니다."""
+    if HOST_HEALTH is None:
+        kwargs.setdefault('timeout', 20)
+        return timed_request(session, method, url, **kwargs)
+    return HOST_HEALTH.request(session, method, url, send=timed_request, **kwargs)
+
+def fetch_list_html(target, session, fetch_cache=None, cache_key=None, url=None):
+    """목록 페이지(기본값: 대상의 url)의 HTML과 캐시에 기록할 검증자/해시를 반환합니다.
+
+    조건부 요청(304)이나 본문 해시 비교로 변경이 없다고 판단되면 None을 반환합니다.
+    """
+    url = url or target.get('url')
+    company = target.get('company', 'N/A')
+    js_render = (target.get('js_render') or '').upper() == 'Y'
 
-def standardize_date(date_str):
-    """다양한 형식의 날짜 문자열을 YYYY-MM-DD 형식으로 변환합니다."""
-    if not date_str or not isinstance(date_str, str):
-        return "N/A"
+    if js_render and RENDERER:
+        # 공유 브라우저로 직접 렌더링 (목록 선택자가 나타날 때까지만 대기)
+        print(f"ℹ️ '{company}' 사이트는 JavaScript 렌더링을 사용합니다.")
+        with timed('render'):
+            return RENDERER.render(url, wait_selector=target.get('item_selector')), {}
+
+    headers = {}
+    # 추출 설정이 이전 실행과 다르면 페이지가 같아도 다시 파싱합니다.
+    if fetch_cache and not fetch_cache.is_unchanged(cache_key, 'config_hash', target_config_hash(target)):
+        fetch_cache = None
+
+    # --- 조건부 요청: 이전 실행 이후 변경이 없으면 파싱을 건너뜀 ---
+    # (JS 렌더링 대상은 원본 HTML이 같아도 내용이 바뀔 수 있으므로 제외)
+    if fetch_cache and not js_render:
+        headers.update(fetch_cache.conditional_headers(cache_key))
+
+    # 일반 대상은 본문을 스트리밍으로 받아 인코딩 판별과 디코딩을 함께 수행합니다.
+    response = http_request(session, 'GET', url, headers=headers, stream=not js_render)
+    if response.status_code == 304:
+        response.close()
+        print(f"🔁 '{company}' 목록이 변경되지 않았습니다 (304). 파싱을 건너뜁니다.")
+        if fetch_cache:
+            fetch_cache.record_short_circuit(company, '304')
+        return None
+    if response.status_code >= 400:
+        response.close()
+    response.raise_for_status()
+
+    if js_render:
+        # 기존 방식 (JS_RENDER_ENGINE=legacy): requests_html로 고정 대기 후 렌더링
+        charset = normalize_charset(target.get('charset'))
+        if charset:
+            response.encoding = charset
+        print(f"ℹ️ '{company}' 사이트는 JavaScript 렌더링을 사용합니다.")
+        with timed('render'):
+            response.html.render(sleep=3, timeout=20)
+        if getattr(response.html, "html", None):
+            return response.html.html, {}
+        return response.text, {}
+
+    # --- 인코딩: charset 열 > 응답 헤더 > meta 선언 > 호스트별 캐시 > UTF-8/CP949 판별 ---
+    html_source, charset, source, body_hash = read_html(response, target.get('charset'), CHARSET_CACHE, urlsplit(url).netloc.lower())
+    if source == 'probe':
+        print(f"ℹ️ '{company}' 페이지를 {charset} 인코딩으로 읽었습니다. ({source})")
+
+    cache_fields = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'body_hash': body_hash,
+    }
+    if fetch_cache and fetch_cache.is_unchanged(cache_key, 'body_hash', cache_fields['body_hash']):
+        print(f"🔁 '{company}' 페이지 내용이 이전과 같습니다. 파싱을 건너뜁니다.")
+        fetch_cache.record_short_circuit(company, 'body_hash')
+        fetch_cache.update(cache_key, **cache_fields)
+        return None
+
+    return html_source, cache_fields
+
+def extract_css_announcements(target, engine, items):
+    """파싱 엔진으로 선택된 목록 항목에서 제목/링크/날짜를 추출합니다. (대상의 추출 규칙을 컴파일하여 실행)"""
+    return compile_css_extractor(target, engine)(items)
+
+# --- 페이지 이동 (pagination) ---
+def target_max_pages(target):
+    """대상의 max_pages 열 값 (기본 1페이지)."""
+    try:
+        return max(1, int(float(target.get('max_pages') or 1)))
+    except (TypeError, ValueError):
+        print(f"🟡 경고: '{target.get('company')}'의 max_pages '{target.get('max_pages')}' 값이 올바르지 않아 1페이지만 수집합니다.")
+        return 1
+
+def page_value(target, page_no):
+    """page_no번째(1부터) 페이지에 해당하는 page_param 값. page_start 열로 시작 번호를 지정합니다."""
     try:
-        # 정규식으로 'YYYY.MM.DD' 또는 'YYYY-MM-DD' 등의 기본 형식만 추출
-        match = re.search(r'\d{4}[-.]\d{1,2}[-.]\d{1,2}', date_str)
-        if match:
-            return date_parse(match.group()).strftime('%Y-%m-%d')
-        return date_str # 매칭되는 형식이 없으면 원본 반환
-    except Exception:
-        return date_str # 파싱 실패 시 원본 반환
-
-# --- 4. 크롤링 전략별 핸들러 ---
-def handle_css_crawl(target, session):
+        start = int(float(target.get('page_start') or 1))
+    except (TypeError, ValueError):
+        start = 1
+    return start + page_no - 1
+
+def next_page_url(target, current_url, next_page_no, next_href=None):
+    """다음 페이지 URL을 반환합니다. (next_link_selector 링크 우선, 없으면 page_param 사용)"""
+    next_href = (next_href or '').strip()
+    if next_href and next_href != '#' and not next_href.lower().startswith('javascript'):
+        return urljoin(current_url, next_href)
+    page_param = target.get('page_param')
+    if not page_param:
+        return None
+    parts = urlsplit(target.get('url'))
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != page_param]
+    query.append((page_param, str(page_value(target, next_page_no))))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def paginate(target, fetch_page, first_cursor, processed_links=None):
+    """페이지를 차례로 수집하고, 이미 처리된 링크가 나오거나 max_pages에 도달하면 멈춥니다.
+
+    fetch_page(page_no, cursor)는 (페이지의 공고 목록, 다음 페이지 cursor) 또는 None을 반환합니다.
+    평상시에는 첫 페이지에서 기존 링크가 발견되므로 대상당 요청은 한 번입니다.
+    """
+    company = target.get('company', 'N/A')
+    max_pages = target_max_pages(target)
+    announcements = []
+    page_no, cursor = 1, first_cursor
+
+    while True:
+        try:
+            page = fetch_page(page_no, cursor)
+        except Exception as e:
+            if page_no == 1:
+                raise
+            print(f"🟡 경고: '{company}' {page_no}페이지 수집 실패로 페이지 이동을 중단합니다: {e}")
+            break
+        if page is None:
+            break
+        page_announcements, cursor = page
+        announcements.extend(page_announcements)
+
+        if page_no >= max_pages or not page_announcements or cursor is None:
+            break
+        if processed_links is not None and any(
+            is_processed(dedup_key(ann['href'], target), ann['href'], processed_links, target)
+            for ann in page_announcements
+        ):
+            break
+        page_no += 1
+        print(f"ℹ️ '{company}' {page_no - 1}페이지가 모두 신규 공고여서 {page_no}페이지를 확인합니다.")
+        if isinstance(cursor, str):
+            polite_wait(cursor)
+
+    return announcements
+
+def polite_wait(url):
+    """같은 호스트의 요청 간격을 지키기 위해 크롤링 엔진의 호스트 제한기로 대기합니다."""
+    if HOST_LIMITER is not None:
+        HOST_LIMITER.wait_turn(urlsplit(url).netloc.lower())
+
+def handle_css_crawl(target, session, processed_links=None):
     """CSS 선택자 기반의 일반적인 웹사이트 크롤링을 처리합니다."""
     url = target.get('url')
-    base_url = target.get('base_url', '')
     item_selector = target.get('item_selector')
     title_link_selector = target.get('title_link_selector')
     date_selector = target.get('date_selector')
-    js_render = (target.get('js_render') or '').upper() == 'Y'
 
     company = target.get('company', 'N/A')
 
@@ -178,306 +353,497 @@ def handle_css_crawl(target, session):
         print(f"🟡 경고: '{company}'의 url, item_selector 또는 title_link_selector가 비어있어 건너뜁니다.")
         return []
 
+    fetch_cache = FETCH_CACHE if (target.get('conditional_fetch') or 'Y').upper() != 'N' else None
+    cache_key = target_cache_key(target)
+    config_hash = target_config_hash(target)
+    engine = get_engine(target)
     try:
-        headers = {
-            'User-Agent': (
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) '
-                'Chrome/91.0.4472.124 Safari/537.36'
-            )
-        }
-        
-        response = session.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
-
-        # --- 인코딩 보정 ---
-        if 'heungkuklife' in url:
-            response.encoding = 'EUC-KR'
-            print(f"ℹ️ '{company}' 사이트의 인코딩을 EUC-KR로 설정했습니다.")
-        elif 'pikk.co.kr' in url:
-            response.encoding = 'utf-8'
-            print(f"ℹ️ '{company}' 사이트의 인코딩을 UTF-8로 설정했습니다.")
-
-        if js_render:
-            print(f"ℹ️ '{company}' 사이트는 JavaScript 렌더링을 사용합니다.")
-            response.html.render(sleep=3, timeout=20)
+        # title_source/link_attr/link_regex/date_format 열을 대상당 한 번만 컴파일합니다.
+        extract_announcements = compile_css_extractor(target, engine)
+    except RuleError as e:
+        print(f"🟡 경고: '{company}'의 추출 규칙이 올바르지 않아 건너뜁니다: {e}")
+        return []
 
-        if js_render and hasattr(response, "html") and getattr(response.html, "html", None):
-            html_source = response.html.html
-        else:
-            html_source = response.text
+    def fetch_page(page_no, page_url):
+        # 조건부 요청/해시 비교는 첫 페이지에만 적용합니다.
+        page_cache = fetch_cache if page_no == 1 else None
+        fetched = fetch_list_html(target, session, page_cache, cache_key, url=page_url)
+        if fetched is None:
+            return None
+        html_source, cache_fields = fetched
 
-        soup = BeautifulSoup(html_source, 'html.parser')
-        items = soup.select(item_selector)
+        with timed('parse'):
+            document = engine.parse_document(html_source)
+            items = engine.select_items(document)
 
         if not items:
-            print(f"🟡 경고: '{company}'에서 '{item_selector}' 선택자에 해당하는 항목을 찾지 못했습니다.")
-            return []
-
-        announcements = []
-        for item in items:
-            # 1차 시도: 정의된 title_link_selector로 찾기
-            title_element = None
-            if title_link_selector:
-                title_element = item.select_one(title_link_selector)
-
-            # 2차 fallback: item 자체가 <a href="..."> 인 경우
-            if not title_element:
-                if item.name == 'a' and item.get('href'):
-                    title_element = item
-                else:
-                    # 3차 fallback: item 내부의 첫 번째 <a href=...> 사용
-                    link_tag = item.find('a', href=True)
-                    if link_tag:
-                        title_element = link_tag
-
-            if not title_element:
-                continue
+            if page_no == 1:
+                print(f"🟡 경고: '{company}'에서 '{item_selector}' 선택자에 해당하는 항목을 찾지 못했습니다.")
+            return None
+
+        # 목록 영역(선택된 항목들)의 해시가 같으면 링크 추출을 건너뜀
+        with timed('parse'):
+            list_hash = content_hash('\n'.join([engine.name, item_selector, title_link_selector, date_selector or ''] + [engine.serialize(item) for item in items]))
+        if (page_cache and page_cache.is_unchanged(cache_key, 'list_hash', list_hash)
+                and page_cache.is_unchanged(cache_key, 'config_hash', config_hash)):
+            print(f"🔁 '{company}' 목록 영역이 이전과 같습니다. 링크 추출을 건너뜁니다.")
+            page_cache.record_short_circuit(company, 'list_hash')
+            page_cache.update(cache_key, **cache_fields)
+            return None
+
+        with timed('parse'):
+            page_announcements = extract_announcements(items)
+
+        if page_cache:
+            page_cache.update(cache_key, list_hash=list_hash, config_hash=config_hash, **cache_fields)
+        return page_announcements, next_page_url(target, page_url, page_no + 1, engine.select_next_href(document))
 
-            href = (title_element.get('href') or '').strip()
-
-            if not href:
-                parent_a = title_element.find_parent('a', href=True)
-                if parent_a:
-                    href = parent_a.get('href').strip()
+    try:
+        return paginate(target, fetch_page, url, processed_links)
 
-            # --- 제목 추출 ---
-            if 'pikk.co.kr' in url:
-                title_tag = item.find('h3')
-                if title_tag:
-                    title = title_tag.get_text(strip=True)
-                else:
-                    title = title_element.get_text(strip=True)
-            else:
-                title = title_element.get_text(strip=True)
-
-            # --- [수정된 부분] 링크 추출 로직 완성형 (data-key, href=javascript, onclick 모두 지원) ---
-            # href가 없거나, javascript, 또는 # 링크인 경우 대체 속성 확인
-            if not href or 'javascript' in href.lower() or href == '#':
-                link_format = target.get('link_format')
-                
-                # 1. data-key 속성 확인 (신한라이프 등)
-                data_key = title_element.attrs.get('data-key')
-                
-                if data_key and link_format:
-                    href = link_format.replace('{id}', str(data_key).strip())
-                
-                # 2. 자바스크립트(onclick 또는 href)에서 ID 추출 (삼양그룹, 미래에셋 등)
-                else:
-                    # onclick 값을 먼저 가져오고, 없으면 href 값이 'javascript:'로 시작하는지 확인
-                    js_code = (title_element.get('onclick') or '').strip()
-                    if not js_code and href.lower().startswith('javascript:'):
-                        js_code = href
-                    
-                    # 정규식으로 괄호 안의 숫자나 문자열 추출 (예: goView(11453) -> 11453)
-                    if js_code:
-                        match = re.search(r"[(']([^()']+)[')]", js_code)
-                        if match:
-                            link_part = match.group(1)
-                            if link_format:
-                                href = link_format.replace('{id}', link_part)
-
-            # 날짜 파싱
-            post_date = "N/A"
-            if date_selector:
-                date_element = item.select_one(date_selector)
-                if date_element:
-                    post_date = standardize_date(date_element.get_text(strip=True))
-
-            # 상대경로 링크를 절대경로로 변환
-            if href and not href.startswith('http') and not href.startswith('javascript'):
-                href = (base_url or url).rstrip('/') + '/' + href.lstrip('/')
-
-            if href and title:
-                announcements.append({
-                    "title": title,
-                    "href": href,
-                    "date": post_date
-                })
-
-        return announcements
-
-    except requests.exceptions.Timeout:
+    except requests.exceptions.Timeout as e:
+        record_error(e)
         print(f"❌ '{company}' 사이트 접속 시간 초과.")
         return []
     except requests.RequestException as e:
+        record_error(e)
         print(f"❌ '{company}' 사이트 접속 실패: {e}")
         return []
     except Exception as e:
+        record_error(e)
         print(f"❌ '{company}' 처리 중 알 수 없는 오류: {e}")
         return []
 
-def handle_api_crawl(target, session):
+def handle_api_crawl(target, session, processed_links=None):
     """JSON API 기반의 크롤링을 처리합니다."""
     api_url = target.get('api_url')
     method = (target.get('api_method') or 'GET').upper()
-    
-    def get_path(path_str):
-        return path_str.split('.') if path_str else []
-
-    item_path = get_path(target.get('json_item_path'))
-    title_path = get_path(target.get('json_title_path'))
-    link_id_path = get_path(target.get('json_link_id_path'))
-    date_path = get_path(target.get('json_date_path'))
+    company = target.get('company')
     link_format = target.get('link_format')
+    stream = (target.get('json_stream') or '').upper() == 'Y'
 
-    if not all([api_url, item_path, title_path, link_id_path, link_format]):
-        print(f"🟡 경고: '{target.get('company')}'의 API 설정이 부족하여 건너뜁니다.")
+    if not all([api_url, target.get('json_item_path'), target.get('json_title_path'), target.get('json_link_id_path'), link_format]):
+        print(f"🟡 경고: '{company}'의 API 설정이 부족하여 건너뜁니다.")
         return []
 
     try:
+        # 경로는 대상별로 한 번만 컴파일하고, 항목마다 모든 필드를 한 번에 추출합니다.
+        item_path = compile_path(target.get('json_item_path'))
+        extract_fields = compile_extractor({
+            'title': target.get('json_title_path'),
+            'link_id': target.get('json_link_id_path'),
+            'date': target.get('json_date_path'),
+        })
+    except JsonPathError as e:
+        print(f"🟡 경고: '{company}'의 JSON 경로 설정이 올바르지 않아 건너뜁니다: {e}")
+        return []
+
+    def fetch_page(page_no, _):
         payload_str = target.get('api_payload')
         payload = json.loads(payload_str) if payload_str else None
+        form_data = None if payload else target.get('api_form_data')
+        params = None
+        if page_no > 1:
+            # 두 번째 페이지부터 page_param 값을 요청에 추가합니다.
+            page_param, value = target.get('page_param'), page_value(target, page_no)
+            if method == 'POST' and isinstance(payload, dict):
+                payload = {**payload, page_param: value}
+            elif method == 'POST' and form_data:
+                form_data = urlencode(parse_qsl(form_data, keep_blank_values=True) + [(page_param, value)])
+            elif isinstance(payload, dict):
+                payload = {**payload, page_param: value}
+            else:
+                params = {page_param: value}
 
         if method == 'POST':
-            response = session.post(api_url, json=payload, data=None if payload else target.get('api_form_data'))
+            response = http_request(session, 'POST', api_url, json=payload, data=form_data, params=params, stream=stream)
         else:
-            response = session.get(api_url, params=payload)
+            response = http_request(session, 'GET', api_url, params=payload or params, stream=stream)
         
         response.raise_for_status()
-        data = response.json()
-
-        items = data
-        for key in item_path:
-            items = items.get(key, [])
-            if not isinstance(items, list):
-                print(f"🟡 경고: '{target.get('company')}'의 json_item_path '{'.'.join(item_path)}'가 리스트가 아닙니다.")
-                return []
+        with timed('parse'):
+            return parse_api_page(response, page_no)
+
+    def parse_api_page(response, page_no):
+        items = None
+        if stream:
+            # 대용량 응답: 목록 경로의 항목만 스트리밍으로 파싱
+            response.raw.decode_content = True
+            items = stream_items(response.raw, item_path)
+        if items is None:
+            data = response.json()
+            items = item_path.items(data)
+            if not items and any(not isinstance(value, list) for value in item_path.find(data)):
+                print(f"🟡 경고: '{company}'의 json_item_path '{item_path.expr}'가 리스트가 아닙니다.")
+                return None
         
-        announcements = []
+        announcements, raw_dates = [], []
         for item in items:
-            title = item
-            for key in title_path: title = title.get(key)
-            
-            link_id = item
-            for key in link_id_path: link_id = link_id.get(key)
-            
-            post_date = "N/A"
-            if date_path:
-                date_val = item
-                for key in date_path: date_val = date_val.get(key)
-                if isinstance(date_val, int) and date_val > 10000000000:
-                    post_date = datetime.fromtimestamp(date_val / 1000).strftime('%Y-%m-%d')
-                else:
-                    post_date = standardize_date(str(date_val))
-
+            fields = extract_fields(item)
+            title, link_id = fields.get('title'), fields.get('link_id')
             if title and link_id:
                 href = link_format.replace('{id}', str(link_id))
-                announcements.append({"title": str(title), "href": href, "date": post_date})
+                announcements.append({"title": str(title), "href": href})
+                raw_dates.append(fields.get('date'))
+
+        # 날짜(문자열 또는 epoch 초/밀리초)는 페이지 단위로 한 번에 KST 기준 정규화합니다.
+        for announcement, post_date in zip(announcements, normalize_dates(raw_dates, target.get('date_format'))):
+            announcement['date'] = post_date
         
-        return announcements
+        return announcements, (page_no + 1 if target.get('page_param') else None)
+
+    try:
+        return paginate(target, fetch_page, None, processed_links)
 
     except requests.RequestException as e:
+        record_error(e)
         print(f"❌ '{target.get('company')}' API 접속 실패: {e}")
         return []
-    except json.JSONDecodeError:
+    except json.JSONDecodeError as e:
+        record_error(e)
         print(f"❌ '{target.get('company')}' API 응답이 JSON 형식이 아닙니다.")
         return []
     except Exception as e:
+        record_error(e)
         print(f"❌ '{target.get('company')}' API 처리 중 오류 발생: {e}")
         return []
 
 # --- 5. 메인 실행 로직 ---
-def crawl_site(target, processed_links, session):
-    """크롤링 대상을 분기하여 실행하고 신규 공고를 반환합니다."""
+def fetch_target_results(target, session, processed_links=None):
+    """crawl_type에 따라 핸들러를 분기 실행하고, 수집된 공고 목록을 반환합니다. (건너뛰었거나 실패하면 None)"""
     company = target.get('company', 'N/A')
     crawl_type = (target.get('crawl_type') or 'CSS').upper()
 
+    host = target_host(target)
+    if HOST_HEALTH and host and HOST_HEALTH.is_open(host):
+        print(f"\n⛔ '{company}' 건너뜀: '{host}' 호스트가 연속 실패로 일시 차단되었습니다.")
+        HOST_HEALTH.record_skip(host, company)
+        return None
+
     print(f"\n--- '{company}' ({crawl_type}) 사이트 크롤링 시작 ---")
-    
-    new_announcements = []
-    if crawl_type == 'CSS':
-        results = handle_css_crawl(target, session)
-    elif crawl_type == 'API':
-        results = handle_api_crawl(target, session)
-    else:
-        print(f"🟡 경고: '{company}'의 crawl_type '{crawl_type}'은 지원되지 않는 형식입니다.")
+
+    with (METRICS.track(target) if METRICS else nullcontext()):
         results = []
+        try:
+            if crawl_type == 'CSS':
+                results = handle_css_crawl(target, session, processed_links)
+            elif crawl_type == 'API':
+                results = handle_api_crawl(target, session, processed_links)
+            else:
+                print(f"🟡 경고: '{company}'의 crawl_type '{crawl_type}'은 지원되지 않는 형식입니다.")
+        except Exception as e:
+            record_error(e)
+            print(f"🚨 '{company}' 크롤링 중 치명적 오류 발생: {e}")
+            results = None
+        if METRICS:
+            METRICS.set_counts(target, items=len(results or []))
+        return results
+
+def is_processed(key, href, processed_links, target=None):
+    """정규화된 키, 이전 방식의 키 또는 (정규화 이전에 기록된) 원본 링크가 이미 처리되었는지 확인합니다."""
+    if key in processed_links or (href != key and href in processed_links):
+        return True
+    legacy_key = legacy_dedup_key(href, target)
+    return legacy_key != key and legacy_key in processed_links
+
+def collect_new_announcements(target, results, processed_links):
+    """수집 결과 중 처리되지 않은 공고만 골라 기록하고 반환합니다. (메인 스레드에서만 호출)"""
+    company = target.get('company', 'N/A')
+    new_announcements = []
 
     if results:
         for ann in results:
             ann['company'] = company
-            if ann['href'] and ann['href'] not in processed_links:
+            if not ann['href']:
+                continue
+            key = dedup_key(ann['href'], target)
+            if not is_processed(key, ann['href'], processed_links, target):
                 print(f"🚀 새로운 공고 발견: [{company}] {ann['title']} (공고일: {ann['date']})")
                 new_announcements.append(ann)
-                save_processed_link(ann['href'])
-                processed_links.add(ann['href'])
-    
+                processed_links.add(key)
+
     if not new_announcements:
         print(f"ℹ️ '{company}'에서 새로운 공고를 찾지 못했습니다.")
-        
+    if METRICS:
+        METRICS.set_counts(target, new_items=len(new_announcements))
+
     return new_announcements
 
-def main():
+def crawl_site(target, processed_links, session):
+    """크롤링 대상을 분기하여 실행하고 신규 공고를 반환합니다."""
+    results = fetch_target_results(target, session, processed_links)
+    return collect_new_announcements(target, results, processed_links)
+
+def is_js_render_target(target):
+    """JavaScript 렌더링이 필요한 대상인지 확인합니다. (legacy 렌더링은 메인 스레드에서만 가능)"""
+    return (target.get('crawl_type') or 'CSS').upper() == 'CSS' and (target.get('js_render') or '').upper() == 'Y'
+
+def crawl_all_targets(targets, processed_links, session):
+    """모든 대상을 병렬로 크롤링한 뒤, 대상 순서대로 중복을 제거하여 신규 공고를 반환합니다."""
+    global HOST_LIMITER
+    config = load_engine_config()
+    limiter = HOST_LIMITER = HostLimiter(per_host=config['per_host'], delay=config['host_delay'])
+    print(f"ℹ️ 크롤링 엔진 설정: 워커 {config['workers']}개, 호스트당 동시 {config['per_host']}개, 요청 간격 {config['host_delay']}초")
+
+    results = run_targets(
+        targets,
+        lambda target: fetch_target_results(target, session, processed_links),
+        workers=config['workers'],
+        limiter=limiter,
+        inline=is_js_render_target if RENDERER is None else None,
+        # 최근 실패한 호스트의 대상은 뒤로 미뤄, 정상 대상이 먼저 끝나도록 합니다.
+        order_key=(lambda target: HOST_HEALTH.is_suspect(target_host(target))) if HOST_HEALTH else None,
+    )
+
+    # 결과 병합은 항상 대상 순서대로 메인 스레드에서 수행하여 processed_links 경쟁 상태를 방지합니다.
+    all_new_announcements = []
+    for target, target_results in zip(targets, results):
+        new_announcements = collect_new_announcements(target, target_results, processed_links)
+        all_new_announcements.extend(new_announcements)
+        # 건너뛰었거나 오류가 난 대상은 일정을 갱신하지 않아 다음 실행에서 다시 시도합니다.
+        if SCHEDULE and target_results is not None and not (METRICS and METRICS.error_for(target)):
+            SCHEDULE.record(target, len(new_announcements))
+    return all_new_announcements
+
+def print_fetch_cache_summary(fetch_cache, target_count):
+    """조건부 요청/해시 비교로 건너뛴 대상 수를 출력합니다."""
+    counts = fetch_cache.summary()
+    skipped = sum(counts.values())
+    detail = ', '.join(f"{reason} {count}개" for reason, count in sorted(counts.items()))
+    print(f"🔁 변경 없음으로 건너뛴 대상: {skipped}/{target_count}개" + (f" ({detail})" if detail else ""))
+
+def deliver_results(access_token, settings, all_new_announcements, skipped_hosts, receiver_groups, notify_empty=True):
+    """신규 공고를 Excel에 저장하고 수신 그룹별 요약 메일을 발송합니다. (신규 공고가 없으면 notify_empty일 때 '공고 없음' 메일)"""
+    excel_url = None
+    if all_new_announcements:
+        # 문자열이 아닌 실제 날짜로 최신순 정렬 (날짜를 알 수 없는 공고는 맨 뒤)
+        all_new_announcements.sort(key=announcement_sort_key, reverse=True)
+        
+        with METRICS.stage('graph'):
+            save_announcements_to_excel(access_token, all_new_announcements)
+            excel_url = get_excel_web_url(access_token, settings)
+    elif notify_empty:
+        # 신규 공고가 없을 때도 이메일을 발송하도록 변경
+        print("\nℹ️ 모든 사이트에서 새로운 공고를 찾지 못했습니다. 결과 이메일을 발송합니다.")
+    else:
+        print("\nℹ️ 새로운 공고가 없어 이메일을 발송하지 않습니다.")
+        return
+    # 그룹별 본문은 병렬로 만들고, 발송은 공유 SMTP 연결 하나로 합니다.
+    with METRICS.stage('email'):
+        send_digests(receiver_groups, all_new_announcements, send_email, skipped_hosts, excel_url)
+    close_smtp_connection()
+
+def write_report(report_dir=None):
+    """대상별 계측 리포트를 출력하고 저장합니다. (CRAWL_REPORT_DIR, 기본 reports/)"""
+    METRICS.print_summary()
+    try:
+        print(f"📊 크롤링 성능 리포트 저장: {METRICS.write_report(report_dir or REPORT_DIR)}")
+    except OSError as e:
+        print(f"🟡 경고: 크롤링 성능 리포트를 저장하지 못했습니다: {e}")
+
+def write_shard_results(shard, targets, all_new_announcements, new_keys):
+    """샤드 실행 결과(신규 공고, 중복 방지 키, 이 샤드 대상의 캐시 항목)를 결과 파일에 기록합니다."""
+    hosts = {target_host(target) for target in targets} - {None}
+    return write_partial(*shard, {
+        # 신규 공고와 키는 collect_new_announcements()에서 같은 순서로 하나씩 추가됩니다.
+        'announcements': [{**ann, 'key': key} for ann, key in zip(all_new_announcements, new_keys)],
+        'fetch_cache': FETCH_CACHE.export(target_cache_key(target) for target in targets),
+        'host_health': HOST_HEALTH.export(hosts),
+        'charsets': CHARSET_CACHE.export(hosts),
+        'skipped': HOST_HEALTH.skipped,
+        'schedule': SCHEDULE.export(targets) if SCHEDULE else {},
+    })
+
+def merge_shard_results(access_token, settings, receiver_groups):
+    """샤드 결과 파일을 모아 키와 캐시를 기록하고, Excel 저장과 요약 메일 발송을 한 번만 수행합니다."""
+    partials, shard_count, missing = read_partials()
+    if not partials:
+        print("❌ 병합할 샤드 결과 파일이 없습니다.")
+        return
+    print(f"ℹ️ 샤드 결과 {len(partials)}/{shard_count}개를 병합합니다.")
+    if missing:
+        # 누락된 샤드의 공고는 키가 기록되지 않으므로 다음 실행에서 다시 수집됩니다.
+        print(f"🟡 경고: 샤드 {', '.join(map(str, missing))}의 결과가 없어 해당 대상은 이번 알림에서 빠집니다.")
+
+    fetch_cache = FetchCache(FETCH_CACHE_FILE)
+    host_health = HostHealth(HOST_HEALTH_FILE)
+    charset_cache = CharsetCache(CHARSET_CACHE_FILE)
+    schedule = CrawlSchedule(CRAWL_SCHEDULE_FILE)
+    all_new_announcements = []
+    processed_links = load_processed_links()
+    try:
+        for partial in partials:
+            for ann in partial['announcements']:
+                key = ann.pop('key')
+                # 여러 샤드에서 같은 공고가 수집되었거나 이미 병합된 결과이면 제외합니다.
+                if key in processed_links:
+                    continue
+                processed_links.add(key)
+                all_new_announcements.append(ann)
+            fetch_cache.merge(partial['fetch_cache'])
+            host_health.merge(partial['host_health'])
+            charset_cache.merge(partial['charsets'])
+            schedule.merge(partial['schedule'])
+            for host, companies in partial['skipped'].items():
+                host_health.skipped.setdefault(host, []).extend(companies)
+    finally:
+        processed_links.close()
+    # 신규 링크가 저장된 뒤에만 캐시를 기록하여, 중단 시 공고가 누락되지 않도록 함
+    fetch_cache.save()
+    host_health.save()
+    charset_cache.save()
+    if SCHEDULE_ENABLED:
+        schedule.save()
+    remove_partials(partials)
+
+    print(f"ℹ️ 병합된 신규 공고: {len(all_new_announcements)}개")
+    deliver_results(access_token, settings, all_new_announcements, host_health.skipped_hosts(), receiver_groups)
+
+def main(shard=None, merge=False, notify_empty=True):
+    """크롤러를 실행합니다.
+
+    shard=(번호, 개수)이면 해당 샤드의 대상만 크롤링하고 결과 파일만 기록합니다. (저장소/캐시/Excel/메일은 병합 단계에서)
+    merge=True이면 크롤링 없이 샤드 결과 파일을 병합합니다.
+    notify_empty=False이면 신규 공고가 없을 때 메일을 보내지 않습니다. (데몬 모드)
+    """
+    global FETCH_CACHE, RENDERER, METRICS, HOST_HEALTH, CHARSET_CACHE, SCHEDULE, CRAWL_TARGETS
     print("="*60 + f"\n입찰 공고 크롤러 (v4.2 - 공고 없을 시에도 메일 발송)를 시작합니다.\n" + "="*60)
+    METRICS = RunMetrics()
+    install_connection_layer() # DNS 캐시 + 연결 시간 계측
     
-    access_token = get_ms_graph_access_token()
+    with METRICS.stage('graph'):
+        access_token = get_ms_graph_access_token()
     if not access_token: return
 
-    settings_data = get_excel_data(access_token, "Settings")
+    # Settings와 Crawl_Targets를 한 번의 $batch 요청(또는 로컬 캐시)으로 불러옵니다.
+    with METRICS.stage('graph'):
+        tables = get_excel_tables(access_token, ["Settings", "Crawl_Targets"])
+    settings_data = tables["Settings"]
     settings = {item['Setting']: item['Value'] for item in settings_data if item.get('Setting') and item.get('Value')}
     
-    # 워크플로우 타입에 따라 수신자 이메일 목록 결정
+    # 워크플로우 타입에 따라 수신 그룹 결정 (TEST: 개발자만, DEFAULT: 기본 그룹 + Receiver Group 설정)
     workflow_type = os.environ.get('WORKFLOW_TYPE', 'DEFAULT')
-    receiver_emails = []
-    
-    developer_email = settings.get('Developer Email')
-    receiver_email = settings.get('Receiver Email')
+    receiver_groups = receiver_groups_from_settings(settings, workflow_type)
 
     if workflow_type == 'TEST':
-        if developer_email:
-            receiver_emails.append(developer_email)
         print("ℹ️ 테스트 모드로 실행. 개발자에게만 이메일이 발송됩니다.")
     else: # DEFAULT (일반 스케줄 실행)
-        if receiver_email:
-            receiver_emails.append(receiver_email)
-        if developer_email:
-            receiver_emails.append(developer_email)
-        print("ℹ️ 일반 모드로 실행. 모든 수신자에게 이메일이 발송됩니다.")
+        print(f"ℹ️ 일반 모드로 실행. 수신 그룹 {len(receiver_groups)}개에 이메일이 발송됩니다.")
             
-    targets = get_excel_data(access_token, "Crawl_Targets")
+    targets = tables["Crawl_Targets"]
     
-    if not targets or not receiver_emails:
+    if not targets or not receiver_groups:
         print("❌ 크롤링에 필요한 설정 정보(대상 또는 수신 이메일)가 부족하여 작업을 종료합니다.")
         return
+
+    if merge:
+        merge_shard_results(access_token, settings, receiver_groups)
+        write_report()
+        print("\n" + "="*30 + " 작업 종료 " + "="*30)
+        return
         
     processed_links = load_processed_links()
-    all_new_announcements = []
     
-    session = HTMLSession()
+    targets = [target for target in targets if target.get('company')]
+    if shard:
+        targets = select_shard(targets, *shard)
+        print(f"ℹ️ 샤드 {shard[0]}/{shard[1]}: 대상 {len(targets)}개를 크롤링합니다.")
+        # 샤드는 저장소를 읽기만 하고, 신규 키는 결과 파일에 모아 병합 단계에서 기록합니다.
+        processed_links = DeltaDedupStore(processed_links)
+    CRAWL_TARGETS = targets
+    SCHEDULE = CrawlSchedule(CRAWL_SCHEDULE_FILE) if SCHEDULE_ENABLED else None
+    if SCHEDULE:
+        # 예정 시각이 된 대상만, 예상 신규 공고 수가 큰 순서로 크롤링합니다. (CRAWL_MAX_TARGETS: 실행당 상한)
+        due_targets = SCHEDULE.due_targets(targets, limit=int(os.environ.get('CRAWL_MAX_TARGETS') or 0))
+        print(f"🗓️ 크롤링 예정 대상: {len(due_targets)}/{len(targets)}개 (나머지는 다음 예정 시각까지 건너뜀)")
+        targets = due_targets
+    # 호스트별 연결 풀을 크롤링 동시성(CRAWL_PER_HOST)에 맞춰 생성합니다.
+    session = create_crawl_session(
+        host_count=len({target_host(target) for target in targets}),
+        per_host=load_engine_config()['per_host'],
+        session_class=HTMLSession,
+    )
+    install_http_mode(session) # CRAWL_HTTP_MODE=record|replay
+    FETCH_CACHE = FetchCache(FETCH_CACHE_FILE)
+    HOST_HEALTH = HostHealth(HOST_HEALTH_FILE)
+    CHARSET_CACHE = CharsetCache(CHARSET_CACHE_FILE)
 
-    for target in targets:
-        if not target.get('company'): 
-            continue
-        try:
-            new_finds = crawl_site(target, processed_links, session)
-            if new_finds:
-                all_new_announcements.extend(new_finds)
-        except Exception as e:
-            print(f"🚨 '{target.get('company')}' 크롤링 중 치명적 오류 발생: {e}")
-        time.sleep(1)
+    if JS_RENDER_ENGINE == 'pool' and any(is_js_render_target(target) for target in targets):
+        RENDERER = BrowserRenderer(user_agent=USER_AGENT)
+    try:
+        with METRICS.stage('crawl'):
+            all_new_announcements = crawl_all_targets(targets, processed_links, session)
+    finally:
+        processed_links.close()
+        save_http_archive()
+        if RENDERER:
+            RENDERER.close()
+            RENDERER = None
 
     print("\n" + "="*25 + " 모든 사이트 크롤링 완료 " + "="*25)
+    print_fetch_cache_summary(FETCH_CACHE, len(targets))
 
-    # --- [수정된 부분] ---
-    if all_new_announcements:
-        all_new_announcements.sort(key=lambda x: (x.get('date', '0000-00-00'), x.get('company')), reverse=True)
-        
-        save_announcements_to_excel(access_token, all_new_announcements)
-        count = len(all_new_announcements)
-        subject = f"[신규 공고 알림] {count}개의 새로운 공고가 수집되었습니다."
-        body = generate_summary_email_body(all_new_announcements)
-        send_email(subject, body, receiver_emails)
-    else:
-        # 신규 공고가 없을 때도 이메일을 발송하도록 변경
-        print("\nℹ️ 모든 사이트에서 새로운 공고를 찾지 못했습니다. 결과 이메일을 발송합니다.")
-        kst = timezone(timedelta(hours=9))
-        today_str = datetime.now(kst).strftime('%Y-%m-%d')
-        subject = f"[입찰 공고 알림] {today_str} 신규 공고 없음"
-        body = generate_no_new_announcements_email_body() # 새로 추가한 함수 호출
-        send_email(subject, body, receiver_emails)
+    if shard:
+        path = write_shard_results(shard, targets, all_new_announcements, processed_links.delta)
+        print(f"✅ 샤드 결과 저장: {path} (신규 공고 {len(all_new_announcements)}개)")
+        write_report(os.path.join(REPORT_DIR, f"shard-{shard[0]}-of-{shard[1]}"))
+        return
+
+    # 신규 링크가 저장된 뒤에만 캐시를 기록하여, 중단 시 공고가 누락되지 않도록 함
+    FETCH_CACHE.save()
+    HOST_HEALTH.save()
+    CHARSET_CACHE.save()
+    if SCHEDULE:
+        SCHEDULE.save()
+    deliver_results(access_token, settings, all_new_announcements, HOST_HEALTH.skipped_hosts(), receiver_groups,
+                    notify_empty)
+    write_report()
         
     print("\n" + "="*30 + " 작업 종료 " + "="*30)
 
+def seconds_until_next_due():
+    """현재 대상 중 가장 먼저 예정 시각이 되는 대상까지 남은 시간(초). 차단된 호스트의 대상은 차단 해제 시각부터."""
+    if not SCHEDULE or not CRAWL_TARGETS:
+        return None
+    blocked_until = (lambda target: HOST_HEALTH.open_until(target_host(target))) if HOST_HEALTH else None
+    return SCHEDULE.seconds_until_next_due(CRAWL_TARGETS, blocked_until=blocked_until)
+
+def run_daemon():
+    """예정 시각이 된 대상을 계속해서 크롤링합니다. 신규 공고가 있을 때만 Excel 저장과 메일 발송을 합니다.
+
+    한 번 실행할 때마다 다음 예정 시각까지 (DAEMON_MIN_SLEEP ~ CRAWL_DAEMON_POLL_SECONDS초 사이로) 기다립니다.
+    """
+    poll_seconds = float(os.environ.get('CRAWL_DAEMON_POLL_SECONDS') or DAEMON_POLL_SECONDS)
+    if not SCHEDULE_ENABLED:
+        print(f"🟡 경고: CRAWL_SCHEDULE=Y가 아니므로 {poll_seconds:.0f}초마다 모든 대상을 크롤링합니다.")
+    while True:
+        try:
+            main(notify_empty=False)
+        except Exception as e:
+            print(f"🚨 크롤링 실행 중 오류 발생: {e}")
+        remaining = seconds_until_next_due()
+        wait = poll_seconds if remaining is None else min(poll_seconds, max(DAEMON_MIN_SLEEP, remaining))
+        print(f"💤 다음 크롤링까지 {wait / 60:.0f}분 대기합니다.")
+        time.sleep(wait)
+
 if __name__ == '__main__':
-    main()
+    # CRAWL_PROFILE=1이면 전체 실행을 cProfile로 프로파일링합니다.
+    # 샤드 실행: --shard 0/4 또는 SHARD_INDEX/SHARD_COUNT 환경 변수, 병합: --merge 또는 SHARD_MERGE=1
+    parser = argparse.ArgumentParser(description="입찰 공고 크롤러")
+    parser.add_argument('--shard', type=parse_shard, default=None, help="이 샤드의 대상만 크롤링 (번호/개수, 예: 0/4)")
+    parser.add_argument('--merge', action='store_true', help="샤드 결과 파일을 병합하여 Excel 저장과 메일 발송")
+    parser.add_argument('--daemon', action='store_true', help="종료하지 않고 예정 시각이 된 대상을 계속 크롤링 (CRAWL_DAEMON=1)")
+    args = parser.parse_args()
+    shard = args.shard or shard_from_env()
+    merge = args.merge or os.environ.get('SHARD_MERGE') == '1'
+    daemon = args.daemon or os.environ.get('CRAWL_DAEMON') == '1'
+    if daemon and (merge or (shard and shard[1] > 1)):
+        parser.error("데몬 모드는 샤드 실행/병합과 함께 사용할 수 없습니다.")
+    if daemon:
+        try:
+            run_daemon()
+        except KeyboardInterrupt:
+            print("\n" + "="*30 + " 데몬 종료 " + "="*30)
+    else:
+        with profiled(os.environ.get('CRAWL_PROFILE') == '1'):
+            main(shard=shard if shard and shard[1] > 1 else None, merge=merge)
@@ -0,0 +1,200 @@
+"""신규 공고 알림 메일 본문 생성과 수신 그룹별 발송입니다.
+
+- 본문은 조각 목록(DigestWriter)에 모아 한 번에 합치며, 모든 값은 HTML 이스케이프합니다.
+- 공고는 회사별로 묶고, 본문이 EMAIL_MAX_BYTES를 넘으면 나머지는 건수만 적고 Excel 시트 링크로 안내합니다.
+  (Gmail은 약 102KB를 넘는 본문을 잘라 표시하므로 기본값은 그보다 작게 둠)
+- Settings 표의 수신 그룹마다 해당 회사만 담은 요약 메일을 병렬로 만들어, 공유 SMTP 연결로 발송합니다.
+
+Settings 표의 수신자 설정:
+    Receiver Email                 기본 그룹 수신자 (쉼표/세미콜론으로 여러 명)
+    Developer Email                개발자 (기본 그룹에 포함, TEST 모드에서는 개발자에게만 발송)
+    Receiver Group <이름>           추가 그룹의 수신자
+    Receiver Group <이름> Companies 그 그룹이 받을 회사명 목록 (없으면 모든 회사)
+"""
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from html import escape
+
+EMAIL_MAX_BYTES = int(os.environ.get('EMAIL_MAX_BYTES', '90000'))
+MAX_PARALLEL_DIGESTS = 4
+KST = timezone(timedelta(hours=9))
+
+STYLE = ("""<head><style>body{font-family:sans-serif}.container{border:1px solid #ddd;padding:20px;margin:20px;border-radius:8px}"""
+         """h2{color:#005aab}h3{margin:24px 0 8px}table{width:100%;border-collapse:collapse}"""
+         """th,td{border:1px solid #ddd;padding:12px;text-align:left}th{background-color:#f2f2f2}"""
+         """a{color:#005aab;text-decoration:none}a:hover{text-decoration:underline}.footer{margin-top:20px;font-size:12px;color:#888}"""
+         """.overflow{padding:12px;background-color:#fff8e1;border:1px solid #ffe082;border-radius:4px}</style></head>""")
+FOOTER = """<p class="footer">본 메일은 자동화된 스크립트에 의해 발송되었습니다.</p></div></body>"""
+_TABLE_END = "</tbody></table>"
+_OVERFLOW_RESERVE = 600  # 생략 안내 문단에 남겨 둘 바이트 수
+_GROUP_SETTING = re.compile(r'^Receiver Group\s+(.+?)(\s+Companies)?$', re.IGNORECASE)
+_SPLIT = re.compile(r'[,;\n]')
+
+ReceiverGroup = namedtuple('ReceiverGroup', 'name emails companies')  # companies: None이면 모든 회사
+
+
+class DigestWriter:
+    """본문 조각을 목록에 모으고 UTF-8 바이트 수를 셉니다. (문자열 += 반복 없이 마지막에 한 번 합침)"""
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.parts = []
+        self.size = 0
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text.encode('utf-8'))
+
+    def fits(self, text, reserve=0):
+        """text를 더해도 한도(reserve 제외)를 넘지 않는지 확인합니다."""
+        return self.limit is None or self.size + len(text.encode('utf-8')) + reserve <= self.limit
+
+    def getvalue(self):
+        return ''.join(self.parts)
+
+
+def group_by_company(announcements):
+    """회사별로 묶습니다. 회사 순서와 회사 안의 공고 순서는 입력(최신순 정렬) 순서를 따릅니다."""
+    groups = {}
+    for ann in announcements:
+        groups.setdefault(ann.get('company') or 'N/A', []).append(ann)
+    return groups
+
+
+def render_skipped_hosts(skipped_hosts):
+    """연속 실패로 이번 실행에서 건너뛴 호스트 안내 (없으면 빈 문자열)."""
+    if not skipped_hosts:
+        return ""
+    rows = "".join(
+        f"""<tr><td>{escape(host)}</td><td>{escape(', '.join(companies) or '-')}</td><td>{escape(last_error or '-')}</td><td>{open_until.astimezone(KST).strftime('%m/%d %H:%M')}</td></tr>"""
+        for host, companies, last_error, open_until in skipped_hosts
+    )
+    return """<h3>⛔ 접속 실패로 건너뛴 사이트</h3><table><thead><tr><th>호스트</th><th>회사명</th><th>마지막 오류</th><th>재시도 예정</th></tr></thead><tbody>""" + rows + """</tbody></table>"""
+
+
+def _company_section(company, announcements):
+    """회사 제목과 표 시작 부분, 공고 행 목록."""
+    head = (f"""<h3>{escape(company)} ({len(announcements)}건)</h3>"""
+            """<table><thead><tr><th>공고일</th><th>공고 제목</th></tr></thead><tbody>""")
+    rows = [f"""<tr><td>{escape(ann.get('date') or 'N/A')}</td><td><a href="{escape(ann['href'])}">{escape(ann['title'])}</a></td></tr>"""
+            for ann in announcements]
+    return head, rows
+
+
+def _overflow_note(omitted, omitted_companies, excel_url):
+    link = (f"""<a href="{escape(excel_url)}">Excel 시트(Collected_Announcements)</a>""" if excel_url
+            else "Excel 시트(Collected_Announcements)")
+    return (f"""<p class="overflow">메일 크기 제한으로 {omitted}건({omitted_companies}개 회사)은 본문에서 생략했습니다. """
+            f"""전체 목록은 {link}에서 확인하세요.</p>""")
+
+
+def render_summary(announcements, skipped_hosts=None, excel_url=None, max_bytes=EMAIL_MAX_BYTES, now=None):
+    """신규 공고 요약 메일 본문을 만듭니다. (본문, 본문에 포함된 공고 수)를 반환합니다."""
+    now = now or datetime.now(KST)
+    tail = render_skipped_hosts(skipped_hosts) + FOOTER
+    writer = DigestWriter(max_bytes)
+    writer.write(STYLE + """<body><div class="container"><h2>📢 신규 공고 요약</h2><p><strong>"""
+                 + now.strftime('%Y년 %m월 %d일') + f"""</strong>에 발견된 신규 공고 {len(announcements)}건입니다.</p>""")
+    reserve = len(tail.encode('utf-8')) + _OVERFLOW_RESERVE
+
+    shown, omitted_companies, overflowing = 0, 0, False
+    for company, items in group_by_company(announcements).items():
+        head, rows = _company_section(company, items)
+        # 한도에 도달한 뒤의 회사는 (순서를 지키기 위해) 모두 생략합니다.
+        if overflowing or not writer.fits(head + rows[0] + _TABLE_END, reserve):
+            overflowing = True
+            omitted_companies += 1
+            continue
+        writer.write(head)
+        for row in rows:
+            if not writer.fits(row + _TABLE_END, reserve):
+                overflowing = True
+                omitted_companies += 1  # 일부만 포함된 회사
+                break
+            writer.write(row)
+            shown += 1
+        writer.write(_TABLE_END)
+
+    if shown < len(announcements):
+        writer.write(_overflow_note(len(announcements) - shown, omitted_companies, excel_url))
+    writer.write(tail)
+    return writer.getvalue(), shown
+
+
+def render_no_new_announcements(skipped_hosts=None, now=None):
+    """신규 공고가 없을 때 발송할 이메일 본문을 생성합니다."""
+    now = now or datetime.now(KST)
+    return (STYLE + """<body><div class="container"><h2>📝 금일 신규 입찰 공고 없음</h2><p><strong>"""
+            + now.strftime('%Y년 %m월 %d일')
+            + """</strong> 기준, 모니터링 중인 사이트에서 새로운 입찰 공고를 찾지 못했습니다.</p>"""
+            + render_skipped_hosts(skipped_hosts) + FOOTER)
+
+
+def split_list(value):
+    """쉼표/세미콜론/줄바꿈으로 구분된 값을 목록으로 나눕니다."""
+    return [part.strip() for part in _SPLIT.split(str(value or '')) if part.strip()]
+
+
+def receiver_groups_from_settings(settings, workflow_type='DEFAULT'):
+    """Settings 표의 값({Setting: Value})으로 수신 그룹 목록을 만듭니다. TEST 모드에서는 개발자 그룹 하나."""
+    developer = split_list(settings.get('Developer Email'))
+    if workflow_type == 'TEST':
+        return [ReceiverGroup('개발자', developer, None)] if developer else []
+
+    groups = []
+    default = split_list(settings.get('Receiver Email'))
+    default += [email for email in developer if email not in default]
+    if default:
+        groups.append(ReceiverGroup('기본', default, None))
+
+    extra = {}
+    for setting, value in settings.items():
+        match = _GROUP_SETTING.match(setting.strip())
+        if not match:
+            continue
+        entry = extra.setdefault(match.group(1).strip(), {'emails': [], 'companies': None})
+        if match.group(2):
+            entry['companies'] = frozenset(split_list(value))
+        else:
+            entry['emails'] = split_list(value)
+    for name, entry in extra.items():
+        if entry['emails']:
+            groups.append(ReceiverGroup(name, entry['emails'], entry['companies']))
+        else:
+            print(f"🟡 경고: 수신 그룹 '{name}'에 수신자가 없어 건너뜁니다.")
+    return groups
+
+
+def build_digest(group, announcements, skipped_hosts=None, excel_url=None, max_bytes=EMAIL_MAX_BYTES):
+    """그룹 하나에 보낼 (제목, 본문)을 만듭니다."""
+    if group.companies is not None:
+        announcements = [ann for ann in announcements if ann.get('company') in group.companies]
+    if announcements:
+        body, shown = render_summary(announcements, skipped_hosts, excel_url, max_bytes)
+        subject = f"[신규 공고 알림] {len(announcements)}개의 새로운 공고가 수집되었습니다."
+        if shown < len(announcements):
+            print(f"ℹ️ '{group.name}' 그룹 메일: 크기 제한으로 {len(announcements)}건 중 {shown}건만 본문에 포함합니다.")
+        return subject, body
+    today_str = datetime.now(KST).strftime('%Y-%m-%d')
+    return f"[입찰 공고 알림] {today_str} 신규 공고 없음", render_no_new_announcements(skipped_hosts)
+
+
+def send_digests(groups, announcements, send, skipped_hosts=None, excel_url=None, max_bytes=EMAIL_MAX_BYTES):
+    """그룹별 요약 메일을 병렬로 만들어 send(subject, body, emails)로 발송합니다.
+
+    send는 공유 SMTP 연결(transport.get_smtp_connection)을 사용하므로, 본문 생성은 병렬로,
+    SMTP 전송은 연결 하나에서 차례로 이루어집니다.
+    """
+    def deliver(group):
+        subject, body = build_digest(group, announcements, skipped_hosts, excel_url, max_bytes)
+        send(subject, body, group.emails)
+
+    if len(groups) <= 1:
+        for group in groups:
+            deliver(group)
+        return
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_DIGESTS, len(groups))) as executor:
+        list(executor.map(deliver, groups))
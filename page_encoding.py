@@ -0,0 +1,160 @@
+"""목록 페이지의 문자 인코딩 결정과 스트리밍 디코딩입니다.
+
+인코딩은 다음 순서로 정합니다.
+  1. Crawl_Targets의 charset 열
+  2. 응답 헤더(Content-Type)에 명시된 charset
+  3. 본문 앞부분(SNIFF_BYTES)의 BOM, <meta charset>, <meta http-equiv>, XML 선언
+  4. 이전 실행에서 같은 호스트에 사용한 인코딩 (CHARSET_CACHE_FILE) - 앞부분을 더 읽지 않고 바로 디코딩
+  5. 한글 등 ASCII가 아닌 바이트가 나올 때까지 읽어, UTF-8로 해석되면 UTF-8, 아니면 CP949(EUC-KR 확장)
+
+전체 본문에 대한 추측(chardet) 없이, 응답을 받는 대로 증분 디코딩합니다.
+EUC-KR 계열은 확장 한글까지 포함하는 CP949로 디코딩합니다.
+"""
+import codecs
+import itertools
+import re
+import time
+
+from crawl_metrics import record_transfer
+from fetch_cache import new_content_hasher
+from json_store import JsonStateFile
+
+DEFAULT_CACHE_FILE = 'charset_cache.json'
+SNIFF_BYTES = 4096
+CHUNK_SIZE = 64 * 1024
+FALLBACK_ENCODING = 'cp949'
+
+_BOMS = ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_:.\-]+)""", re.IGNORECASE)
+_XML_ENCODING = re.compile(rb"""^<\?xml[^>]+encoding\s*=\s*["']([A-Za-z0-9_.\-]+)""")
+_HEADER_CHARSET = re.compile(r"""charset\s*=\s*["']?([A-Za-z0-9_:.\-]+)""", re.IGNORECASE)
+# 한국어 사이트에서 쓰이는 EUC-KR 계열 표기는 모두 CP949로 처리합니다.
+_ALIASES = {'euc_kr': 'cp949', 'x-windows-949': 'cp949', 'windows-949': 'cp949', 'ms949': 'cp949'}
+
+
+def normalize_charset(name):
+    """인코딩 이름을 파이썬 코덱 이름으로 정규화합니다. 알 수 없는 이름이면 None."""
+    if not name:
+        return None
+    name = name.strip().strip('"\'').lower()
+    if name in _ALIASES:
+        return _ALIASES[name]
+    try:
+        codec = codecs.lookup(name).name
+    except LookupError:
+        return None
+    return _ALIASES.get(codec, codec)
+
+
+def header_charset(content_type):
+    """Content-Type 헤더에 명시된 charset. (명시되지 않았으면 None, ISO-8859-1로 가정하지 않음)"""
+    match = _HEADER_CHARSET.search(content_type or '')
+    return normalize_charset(match.group(1)) if match else None
+
+
+def sniff_charset(head):
+    """본문 앞부분의 BOM/meta/XML 선언에서 인코딩을 찾습니다."""
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+    match = _XML_ENCODING.match(head) or _META_CHARSET.search(head)
+    return normalize_charset(match.group(1).decode('ascii')) if match else None
+
+
+def decodes_cleanly(head, charset, complete=False):
+    """head가 charset으로 오류 없이 디코딩되는지 확인합니다. (잘린 마지막 문자는 오류로 보지 않음)"""
+    try:
+        codecs.getincrementaldecoder(charset)().decode(head, final=complete)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+def probe_charset(head, complete=False):
+    """선언이 없을 때: 앞부분이 UTF-8로 해석되면 UTF-8, 아니면 CP949."""
+    return 'utf-8' if decodes_cleanly(head, 'utf-8', complete) else FALLBACK_ENCODING
+
+
+class CharsetCache(JsonStateFile):
+    """호스트별로 마지막에 사용한 인코딩을 JSON 파일로 보관합니다. 스레드 안전합니다."""
+
+    description = '인코딩 캐시'
+
+    def get(self, host):
+        with self._lock:
+            return self._entries.get(host)
+
+    def set(self, host, charset):
+        with self._lock:
+            if host:
+                self._entries[host] = charset
+
+
+def resolve_charset(head, declared=None, content_type=None, cached=None, complete=False):
+    """(인코딩, 결정 근거)를 반환합니다. 근거: column|header|meta|cache|probe
+
+    호스트 캐시의 인코딩은 본문 앞부분이 그 인코딩으로 디코딩될 때만 사용합니다. 다만 앞부분에 한글 등이 있고
+    그것이 올바른 UTF-8이면(CP949 본문이 우연히 UTF-8로 해석되는 경우는 드묾) UTF-8을 우선합니다.
+    """
+    for source, charset in (('column', normalize_charset(declared)), ('header', header_charset(content_type)),
+                            ('meta', sniff_charset(head[:SNIFF_BYTES]))):
+        if charset:
+            return charset, source
+    cached = normalize_charset(cached)
+    if cached and decodes_cleanly(head, cached, complete):
+        if cached != 'utf-8' and not head.isascii() and decodes_cleanly(head, 'utf-8', complete):
+            return 'utf-8', 'probe'
+        return cached, 'cache'
+    return probe_charset(head, complete), 'probe'
+
+
+def _read_head(chunks, enough):
+    """enough(읽은 바이트)가 참이 될 때까지 조각을 읽습니다. (읽은 바이트, 본문 끝까지 읽었는지)"""
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if enough(head):
+            return head, False
+    return head, True
+
+
+def read_html(response, declared=None, charset_cache=None, host=None, chunk_size=CHUNK_SIZE):
+    """stream=True 응답을 읽으면서 인코딩을 정하고 증분 디코딩합니다.
+
+    (본문 문자열, 인코딩, 결정 근거, 원본 바이트 해시)를 반환합니다.
+    """
+    start = time.perf_counter()
+    hasher = new_content_hasher()
+    size = 0
+    chunks = response.iter_content(chunk_size)
+
+    # 인코딩 판별에 필요한 앞부분만 모아 둡니다.
+    head, complete = _read_head(chunks, lambda data: len(data) >= SNIFF_BYTES)
+    cached = charset_cache.get(host) if charset_cache else None
+    content_type = response.headers.get('Content-Type')
+    charset, source = resolve_charset(head, declared, content_type, cached, complete)
+    if source == 'probe' and not complete and head.isascii():
+        # 선언이 없고 앞부분이 ASCII뿐이면, ASCII가 아닌 바이트가 나올 때까지 더 읽은 뒤 판별합니다.
+        more, complete = _read_head(chunks, lambda data: not data.isascii())
+        head += more
+        charset, source = resolve_charset(head, declared, content_type, cached, complete)
+    try:
+        decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+    except LookupError:
+        charset, source = FALLBACK_ENCODING, 'probe'
+        decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+
+    parts = []
+    for chunk in (itertools.chain([head], chunks) if not complete else [head]):
+        if not chunk:
+            continue
+        hasher.update(chunk)
+        size += len(chunk)
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b'', final=True))
+
+    if charset_cache and source != 'column':
+        charset_cache.set(host, charset)
+    # 본문 전송 시간과 (Content-Length가 없어 요청 시점에 집계되지 않은) 바이트 수를 계측에 더합니다.
+    record_transfer(time.perf_counter() - start, 0 if response.headers.get('Content-Length') else size)
+    return ''.join(parts), charset, source, hasher.hexdigest()
@@ -0,0 +1,118 @@
+"""JavaScript 렌더링이 필요한 대상을 위한 공유 헤드리스 브라우저입니다.
+
+실행(run)마다 브라우저를 한 번만 띄우고, 페이지(탭)는 크기가 제한된 풀에서 재사용합니다.
+고정 대기(sleep) 대신 대상의 item_selector가 나타날 때까지만 기다리며,
+같은 URL의 렌더링 결과는 실행 중에 캐시합니다.
+
+브라우저는 전용 이벤트 루프 스레드에서 동작하므로 어느 워커 스레드에서든 render()를 호출할 수 있습니다.
+"""
+import asyncio
+import concurrent.futures
+import threading
+
+DEFAULT_PAGE_POOL = 2   # 동시에 열어 둘 최대 페이지(탭) 수
+DEFAULT_TIMEOUT = 20    # 페이지 이동/선택자 대기 제한 시간(초)
+
+
+class BrowserRenderer:
+    """pyppeteer 브라우저 하나와 페이지 풀을 관리합니다."""
+
+    def __init__(self, pool_size=DEFAULT_PAGE_POOL, timeout=DEFAULT_TIMEOUT, user_agent=None):
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._browser = None
+        self._launch_lock = None
+        self._slots = None       # 동시에 사용하는 페이지 수 제한 (pool_size)
+        self._idle_pages = []
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='js-renderer', daemon=True)
+        self._thread.start()
+
+    def render(self, url, wait_selector=None):
+        """url을 렌더링한 HTML을 반환합니다. 같은 URL은 실행 중 한 번만 렌더링합니다."""
+        with self._cache_lock:
+            if url in self._cache:
+                return self._cache[url]
+        future = asyncio.run_coroutine_threadsafe(self._render(url, wait_selector), self._loop)
+        try:
+            html = future.result(timeout=self.timeout * 2 + 30)
+        except concurrent.futures.TimeoutError:
+            future.cancel()  # 렌더링 작업을 취소하여 페이지와 슬롯을 반환합니다.
+            raise
+        with self._cache_lock:
+            self._cache[url] = html
+        return html
+
+    async def _ensure_browser(self):
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.pool_size)
+        async with self._launch_lock:
+            if self._browser is None:
+                from pyppeteer import launch
+                # 메인 스레드가 아니므로 시그널 핸들러 등록을 끕니다.
+                self._browser = await launch(
+                    headless=True,
+                    args=['--no-sandbox'],
+                    handleSIGINT=False, handleSIGTERM=False, handleSIGHUP=False,
+                )
+                print("ℹ️ 헤드리스 브라우저를 시작했습니다.")
+
+    async def _acquire_page(self):
+        """쉬고 있는 페이지를 재사용하고, 없으면 새로 엽니다. (호출 전에 슬롯을 확보해야 함)"""
+        if self._idle_pages:
+            return self._idle_pages.pop()
+        page = await self._browser.newPage()
+        if self.user_agent:
+            await page.setUserAgent(self.user_agent)
+        return page
+
+    async def _render(self, url, wait_selector):
+        from pyppeteer.errors import TimeoutError as PageTimeoutError
+
+        await self._ensure_browser()
+        timeout_ms = int(self.timeout * 1000)
+        # 슬롯은 성공/오류/취소와 관계없이 반환되므로, 오류가 난 페이지 대신 다음 요청이 새 페이지를 엽니다.
+        async with self._slots:
+            page = await self._acquire_page()
+            html = None
+            try:
+                await page.goto(url, {'waitUntil': 'domcontentloaded', 'timeout': timeout_ms})
+                if wait_selector:
+                    try:
+                        await page.waitForSelector(wait_selector, {'timeout': timeout_ms})
+                    except PageTimeoutError:
+                        print(f"🟡 경고: '{url}'에서 '{wait_selector}' 선택자가 {self.timeout}초 내에 나타나지 않았습니다.")
+                html = await page.content()
+            finally:
+                if html is not None:
+                    self._idle_pages.append(page)
+                else:
+                    await self._discard_page(page)
+        return html
+
+    @staticmethod
+    async def _discard_page(page):
+        """오류가 나거나 취소된 페이지를 닫습니다. (풀에는 다시 넣지 않음)"""
+        try:
+            await page.close()
+        except Exception as e:
+            print(f"🟡 경고: 렌더링 페이지를 닫지 못했습니다: {e}")
+
+    async def _close_browser(self):
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+
+    def close(self):
+        """브라우저를 종료하고 이벤트 루프 스레드를 정리합니다."""
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_browser(), self._loop).result(timeout=30)
+        except Exception as e:
+            print(f"🟡 경고: 헤드리스 브라우저 종료 중 오류: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
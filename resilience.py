@@ -0,0 +1,199 @@
+"""호스트 단위 장애 대응 계층입니다. CSS/API 핸들러가 함께 사용합니다.
+
+- 적응형 타임아웃: 호스트별 응답 시간 이력(지수 이동 평균과 편차)으로 타임아웃을 정합니다.
+- 재시도: 일시적 오류(연결 실패, 시간 초과, 429/5xx)는 지터를 섞은 지수 백오프로 재시도합니다.
+- 서킷 브레이커: 연속 실패가 누적된 호스트는 일정 시간 요청하지 않고 건너뜁니다.
+  상태는 파일(HOST_HEALTH_FILE)에 보관하여 다음 실행에도 이어지며, 쉬는 시간은 실패가 반복될수록 늘어납니다.
+
+응답이 느린 호스트가 여러 개여도 실행 시간의 상한이 (임계 실패 수 × 타임아웃 × 시도 수)로 제한됩니다.
+"""
+import random
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import requests
+
+from json_store import JsonStateFile, env_float
+
+DEFAULT_HEALTH_FILE = 'host_health.json'
+DEFAULT_TIMEOUT = 20.0      # 이력이 없을 때의 타임아웃(초)
+MIN_TIMEOUT = 5.0
+MAX_TIMEOUT = 30.0
+MAX_RETRIES = 2             # 첫 시도 이후 추가 시도 수
+BACKOFF_BASE = 1.0          # 재시도 대기 시간 상한 = BACKOFF_BASE * 2^시도 (0~상한 사이 무작위)
+BACKOFF_MAX = 10.0
+FAILURE_THRESHOLD = 3       # 연속 실패가 이 수에 도달하면 서킷을 엽니다.
+COOLDOWN_HOURS = 6.0        # 첫 차단 시간. 다시 실패할 때마다 두 배 (최대 MAX_COOLDOWN_HOURS)
+MAX_COOLDOWN_HOURS = 24.0 * 7
+TRANSIENT_STATUSES = frozenset({429, 500, 502, 503, 504})
+LATENCY_ALPHA = 0.3         # 응답 시간 이동 평균 가중치
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """서킷이 열린(차단된) 호스트에 요청하려 할 때 발생합니다."""
+
+
+def url_host(url):
+    return urlsplit(url or '').netloc.lower()
+
+
+class HostHealth(JsonStateFile):
+    """호스트별 응답 시간 이력과 서킷 상태. 스레드 안전하며 JSON 파일로 보관합니다."""
+
+    description = '호스트 상태 파일'
+
+    def __init__(self, path=DEFAULT_HEALTH_FILE, max_retries=None, failure_threshold=None, cooldown_hours=None):
+        super().__init__(path)
+        self.max_retries = int(env_float('CRAWL_RETRIES', MAX_RETRIES) if max_retries is None else max_retries)
+        self.failure_threshold = int(env_float('CRAWL_BREAKER_THRESHOLD', FAILURE_THRESHOLD)
+                                     if failure_threshold is None else failure_threshold)
+        self.cooldown_hours = (env_float('CRAWL_BREAKER_COOLDOWN_HOURS', COOLDOWN_HOURS)
+                               if cooldown_hours is None else cooldown_hours)
+        self.skipped = {}  # 이번 실행에서 차단된 {호스트: [건너뛴 회사명]}
+        self._merged = set()  # merge()로 이번에 반영한 호스트
+
+    # --- 상태 조회 ---
+    def timeout_for(self, host):
+        """호스트의 응답 시간 이력으로 타임아웃을 계산합니다. (평균 + 4 × 편차, 최소/최대 제한)"""
+        with self._lock:
+            entry = self._entries.get(host) or {}
+        if 'latency' not in entry:
+            return DEFAULT_TIMEOUT
+        timeout = entry['latency'] + 4 * entry.get('deviation', 0.0)
+        return round(min(MAX_TIMEOUT, max(MIN_TIMEOUT, timeout)), 1)
+
+    def is_open(self, host, now=None):
+        """서킷이 열려 있으면(차단 기간 중이면) True."""
+        with self._lock:
+            entry = self._entries.get(host) or {}
+        return entry.get('open_until', 0) > (now or time.time())
+
+    def open_until(self, host):
+        """서킷 차단이 풀리는 시각(epoch 초). 차단된 적이 없으면 0."""
+        with self._lock:
+            return (self._entries.get(host) or {}).get('open_until', 0)
+
+    def is_suspect(self, host):
+        """최근 실패가 있는(차단 해제 후 재시도 중인 포함) 호스트인지 확인합니다. 실행 순서를 뒤로 미룰 때 사용합니다."""
+        with self._lock:
+            entry = self._entries.get(host) or {}
+        return entry.get('failures', 0) > 0 or entry.get('trips', 0) > 0
+
+    # --- 결과 기록 ---
+    def record_success(self, host, latency):
+        with self._lock:
+            entry = self._entries.setdefault(host, {})
+            if 'latency' in entry:
+                error = latency - entry['latency']
+                entry['latency'] += LATENCY_ALPHA * error
+                entry['deviation'] = (1 - LATENCY_ALPHA) * entry.get('deviation', 0.0) + LATENCY_ALPHA * abs(error)
+            else:
+                entry['latency'], entry['deviation'] = latency, latency / 2
+            entry['latency'] = round(entry['latency'], 3)
+            entry['deviation'] = round(entry['deviation'], 3)
+            for name in ('failures', 'trips', 'open_until', 'last_error'):
+                entry.pop(name, None)
+
+    def record_failure(self, host, error):
+        """실패를 기록하고, 연속 실패가 임계치에 도달하면 서킷을 엽니다. 서킷이 열렸으면 True."""
+        with self._lock:
+            entry = self._entries.setdefault(host, {})
+            entry['failures'] = entry.get('failures', 0) + 1
+            entry['last_error'] = f"{type(error).__name__}: {error}"[:200]
+            entry['last_failure'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+            # 차단이 풀린 뒤 다시 시도하는 중(half-open)이면 한 번의 실패로 다시 차단합니다.
+            threshold = 1 if entry.get('trips') else self.failure_threshold
+            if entry['failures'] < threshold:
+                return False
+            hours = min(MAX_COOLDOWN_HOURS, self.cooldown_hours * 2 ** entry.get('trips', 0))
+            entry['trips'] = entry.get('trips', 0) + 1
+            entry['failures'] = 0
+            entry['open_until'] = time.time() + hours * 3600
+            last_error = entry['last_error']
+            self.skipped.setdefault(host, [])
+        print(f"⛔ '{host}' 호스트가 연속으로 실패하여 {hours:.0f}시간 동안 건너뜁니다. ({last_error})")
+        return True
+
+    def merge(self, entries):
+        """샤드 결과의 호스트 상태를 반영합니다.
+
+        샤드의 상태는 파일보다 최신이므로 처음 들어온 항목은 그대로 덮어쓰고, 같은 호스트가 다른 샤드에서
+        다시 들어오면 항목별로 합칩니다. (실패/차단 횟수는 큰 값, 차단 해제와 마지막 실패는 늦은 시각)
+        """
+        with self._lock:
+            for host, entry in entries.items():
+                if host not in self._merged:
+                    self._merged.add(host)
+                    self._entries[host] = dict(entry)
+                    continue
+                current = self._entries.setdefault(host, {})
+                for name in ('failures', 'trips', 'open_until'):
+                    if name in entry:
+                        current[name] = max(current.get(name, 0), entry[name])
+                if entry.get('last_failure', '') > current.get('last_failure', ''):
+                    current['last_failure'], current['last_error'] = entry['last_failure'], entry.get('last_error')
+                for name in ('latency', 'deviation'):
+                    if name not in current and name in entry:
+                        current[name] = entry[name]
+
+    def record_skip(self, host, company):
+        with self._lock:
+            self.skipped.setdefault(host, []).append(company)
+
+    def skipped_hosts(self):
+        """이번 실행에서 차단되었거나 건너뛴 호스트 목록: [(호스트, [회사명], 마지막 오류, 차단 해제 시각)]"""
+        with self._lock:
+            return [
+                (host, sorted(companies), (self._entries.get(host) or {}).get('last_error'),
+                 datetime.fromtimestamp((self._entries.get(host) or {}).get('open_until', 0), timezone.utc))
+                for host, companies in sorted(self.skipped.items())
+            ]
+
+    # --- 요청 ---
+    def request(self, session, method, url, send=None, **kwargs):
+        """서킷/타임아웃/재시도를 적용하여 요청합니다. send(session, method, url, **kwargs)로 실제 요청을 보냅니다.
+
+        일시적 오류가 재시도 후에도 계속되면 마지막 예외(또는 마지막 응답)를 그대로 반환/발생시킵니다.
+        """
+        send = send or (lambda s, m, u, **kw: s.request(m, u, **kw))
+        host = url_host(url)
+        if self.is_open(host):
+            raise CircuitOpenError(f"'{host}' 호스트는 연속 실패로 일시 차단되었습니다.")
+        kwargs.setdefault('timeout', self.timeout_for(host))
+
+        for attempt in range(self.max_retries + 1):
+            start = time.monotonic()
+            try:
+                response = send(session, method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not self._retry_or_fail(host, e, attempt):
+                    raise
+                continue
+            if response.status_code in TRANSIENT_STATUSES:
+                error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+                retry_after = response.headers.get('Retry-After')
+                if attempt < self.max_retries:
+                    response.close()  # 재시도 전에 (stream=True) 응답의 연결을 풀에 돌려줍니다.
+                if self._retry_or_fail(host, error, attempt, retry_after):
+                    continue
+                return response
+            if response.status_code >= 400:
+                # 404/403 등은 호스트가 살아 있다는 뜻일 뿐 정상 응답은 아니므로, 서킷 상태를 초기화하지 않습니다.
+                return response
+            self.record_success(host, time.monotonic() - start)
+            return response
+
+    def _retry_or_fail(self, host, error, attempt, retry_after=None):
+        """재시도할 수 있으면 대기 후 True, 시도 횟수를 모두 쓰면 실패를 기록하고 False."""
+        if attempt >= self.max_retries:
+            self.record_failure(host, error)
+            return False
+        wait = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+        try:
+            wait = max(wait, min(BACKOFF_MAX, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+        print(f"🔄 '{host}' 일시적 오류({type(error).__name__}). {wait:.1f}초 후 재시도합니다. ({attempt + 1}/{self.max_retries})")
+        time.sleep(wait)
+        return True
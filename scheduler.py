@@ -0,0 +1,111 @@
+"""게시판별 신규 공고 빈도에 따른 크롤링 일정입니다.
+
+대상마다 마지막 크롤링 시각, 마지막으로 신규 공고가 나온 시각, 시간당 신규 공고 수(지수 이동 평균)를 기록하고
+다음 크롤링 예정 시각을 계산합니다.
+  - 신규 공고가 꾸준히 나오는 대상: 공고 한 건이 나올 것으로 예상되는 시간(1 / 빈도)마다
+  - 신규 공고가 없는 대상: 간격을 두 배씩 늘림 (MIN_INTERVAL_HOURS ~ MAX_INTERVAL_HOURS)
+실행 때마다 예정 시각이 된 대상만, 예상 신규 공고 수(빈도 × 마지막 크롤링 후 경과 시간)가 큰 순서로 크롤링합니다.
+처음 보는 대상은 항상 가장 먼저 크롤링합니다.
+
+상태는 파일(CRAWL_SCHEDULE_FILE)에 보관하여 다음 실행에도 이어집니다.
+한산한 대상은 최대 MAX_INTERVAL_HOURS 간격으로만 확인하므로, 실행 주기가 그보다 충분히 짧을 때
+(데몬 모드 등) CRAWL_SCHEDULE=Y로 켜서 사용합니다.
+"""
+import heapq
+import time
+
+from fetch_cache import target_cache_key
+from json_store import JsonStateFile, env_float
+
+DEFAULT_SCHEDULE_FILE = 'crawl_schedule.json'
+MIN_INTERVAL_HOURS = 1.0
+MAX_INTERVAL_HOURS = 72.0   # 공고가 없던 대상도 최소 이 간격으로는 확인합니다.
+DUE_SLACK = 0.1             # 예정 시각까지 간격의 이 비율만큼 남은 대상도 이번 실행에 포함 (cron 실행 시각의 오차 흡수)
+RATE_ALPHA = 0.3            # 신규 공고 빈도 이동 평균 가중치
+
+
+class CrawlSchedule(JsonStateFile):
+    """대상별 신규 공고 빈도와 다음 크롤링 예정 시각. 스레드 안전하며 JSON 파일로 보관합니다."""
+
+    description = '크롤링 일정 파일'
+
+    def __init__(self, path=DEFAULT_SCHEDULE_FILE, min_interval_hours=None, max_interval_hours=None):
+        super().__init__(path)
+        self.min_interval = 3600 * (env_float('CRAWL_MIN_INTERVAL_HOURS', MIN_INTERVAL_HOURS)
+                                    if min_interval_hours is None else min_interval_hours)
+        self.max_interval = 3600 * (env_float('CRAWL_MAX_INTERVAL_HOURS', MAX_INTERVAL_HOURS)
+                                    if max_interval_hours is None else max_interval_hours)
+
+    # --- 일정 조회 ---
+    def expected_yield(self, target, now=None):
+        """마지막 크롤링 이후 쌓였을 것으로 예상되는 신규 공고 수. 처음 보는 대상은 무한대."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(target_cache_key(target))
+        if not entry:
+            return float('inf')
+        return entry.get('rate', 0.0) * max(0.0, now - entry['last_crawled']) / 3600
+
+    def is_due(self, target, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(target_cache_key(target))
+        return not entry or self._due_at(entry) <= now
+
+    def due_targets(self, targets, now=None, limit=None):
+        """예정 시각이 된 대상을 예상 신규 공고 수가 큰 순서로 반환합니다. limit이 있으면 그 수까지만."""
+        now = time.time() if now is None else now
+        queue = [(-self.expected_yield(target, now), index, target)
+                 for index, target in enumerate(targets) if self.is_due(target, now)]
+        heapq.heapify(queue)
+        count = len(queue) if not limit else min(limit, len(queue))
+        return [heapq.heappop(queue)[2] for _ in range(count)]
+
+    def seconds_until_next_due(self, targets, now=None, blocked_until=None):
+        """targets 중 가장 먼저 예정 시각이 되는 대상까지 남은 시간(초). 이미 된 대상이 있으면 0, 대상이 없으면 None.
+
+        파일에만 남은 (Crawl_Targets에서 지운) 대상은 보지 않습니다. blocked_until(target)이 주어지면
+        그 시각(예: 서킷 차단 해제)까지는 예정 시각이 되지 않은 것으로 봅니다.
+        """
+        now = time.time() if now is None else now
+        due_times = []
+        with self._lock:
+            for target in targets:
+                entry = self._entries.get(target_cache_key(target))
+                due_at = self._due_at(entry) if entry else now
+                if blocked_until:
+                    due_at = max(due_at, blocked_until(target) or 0)
+                due_times.append(due_at)
+        if not due_times:
+            return None
+        return max(0.0, min(due_times) - now)
+
+    @staticmethod
+    def _due_at(entry):
+        return entry['next_due'] - DUE_SLACK * entry.get('interval', 0)
+
+    # --- 결과 기록 ---
+    def record(self, target, new_count, now=None):
+        """크롤링 결과(신규 공고 수)로 빈도와 다음 예정 시각을 갱신합니다. 실패한 크롤링은 기록하지 않습니다."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.setdefault(target_cache_key(target), {})
+            last_crawled = entry.get('last_crawled')
+            interval = entry.get('interval', self.min_interval)
+            if last_crawled is not None and now > last_crawled:
+                # 첫 크롤링의 신규 공고는 밀린 공고이므로 빈도는 두 번째 크롤링부터 계산합니다.
+                elapsed = now - last_crawled
+                observed = new_count * 3600 / elapsed
+                entry['rate'] = RATE_ALPHA * observed + (1 - RATE_ALPHA) * entry.get('rate', observed)
+                if entry['rate'] > 0:
+                    interval = 3600 / entry['rate']
+                else:
+                    interval = max(interval, elapsed) * 2
+            interval = min(self.max_interval, max(self.min_interval, interval))
+            if new_count:
+                entry['last_new'] = now
+            entry.update(last_crawled=now, interval=interval, next_due=now + interval)
+
+    def export(self, targets):
+        """targets의 일정만 꺼냅니다. (샤드 결과 파일에 기록)"""
+        return super().export(target_cache_key(target) for target in targets)
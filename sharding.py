@@ -0,0 +1,154 @@
+"""대상 목록을 여러 프로세스(또는 러너)로 나누어 크롤링하는 샤드 실행입니다.
+
+- 각 샤드는 호스트의 고정 해시로 정해지는 대상만 크롤링하고, 신규 공고와 중복 방지 키(delta),
+  갱신된 캐시 항목을 결과 파일(SHARD_DIR/shard-<번호>-of-<개수>.json)에 기록합니다.
+  처리된 링크 저장소와 캐시 파일은 읽기만 하므로 샤드끼리 쓰기 경쟁이 없습니다.
+  같은 호스트의 대상은 모두 한 샤드에 모이므로, 호스트별 제한(CRAWL_PER_HOST, CRAWL_HOST_DELAY)과
+  호스트 상태(서킷 브레이커)가 샤드 수와 무관하게 유지됩니다. (샤드 수가 호스트 수보다 많으면 빈 샤드가 생김)
+- 병합 단계(--merge)는 결과 파일을 모아 중복 방지 키와 캐시를 한 번에 기록하고,
+  Excel 저장과 요약 메일 발송을 한 번만 수행합니다.
+
+한 대에서 모든 샤드를 실행하려면:
+    python sharding.py --shards 4
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from crawl_engine import target_host
+
+SHARD_DIR = os.environ.get('SHARD_DIR', 'shards')
+PARTIAL_VERSION = 1
+_PARTIAL_NAME = re.compile(r'shard-(\d+)-of-(\d+)\.json$')
+
+
+def shard_of(target, shard_count):
+    """대상이 속한 샤드 번호. 실행/프로세스와 무관하게 같은 호스트의 대상은 항상 같은 샤드입니다."""
+    key = target_host(target) or target.get('company') or ''
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shard_count
+
+
+def select_shard(targets, shard_index, shard_count):
+    """targets 중 shard_index 샤드에 속한 대상만 (원래 순서대로) 반환합니다."""
+    if shard_count <= 1:
+        return list(targets)
+    return [target for target in targets if shard_of(target, shard_count) == shard_index]
+
+
+def parse_shard(value):
+    """'번호/개수' 형식(예: 0/4)을 (번호, 개수)로 변환합니다."""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"샤드는 '번호/개수' 형식이어야 합니다: {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"샤드 번호는 0 이상 {count} 미만이어야 합니다: {value!r}")
+    return index, count
+
+
+def shard_from_env():
+    """환경 변수 SHARD_INDEX/SHARD_COUNT로 지정한 샤드. 지정되지 않았으면 None."""
+    count = os.environ.get('SHARD_COUNT')
+    if not count:
+        return None
+    return parse_shard(f"{os.environ.get('SHARD_INDEX', '0')}/{count}")
+
+
+def partial_path(shard_index, shard_count, shard_dir=SHARD_DIR):
+    return os.path.join(shard_dir, f"shard-{shard_index}-of-{shard_count}.json")
+
+
+def write_partial(shard_index, shard_count, data, shard_dir=SHARD_DIR):
+    """샤드 결과를 기록하고 경로를 반환합니다. (임시 파일에 쓴 뒤 교체하여, 중단 시 반쪽 파일이 남지 않음)"""
+    os.makedirs(shard_dir, exist_ok=True)
+    path = partial_path(shard_index, shard_count, shard_dir)
+    payload = {'version': PARTIAL_VERSION, 'shard_index': shard_index, 'shard_count': shard_count,
+               'finished_at': time.time(), **data}
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_partials(shard_dir=SHARD_DIR):
+    """결과 파일을 샤드 번호 순서대로 읽습니다. (결과 목록, 샤드 개수, 누락된 샤드 번호 목록)
+
+    샤드 개수가 다른 결과 파일이 섞여 있으면 가장 최근 실행의 개수를 따릅니다.
+    """
+    found = {}
+    for path in glob.glob(os.path.join(shard_dir, 'shard-*-of-*.json')):
+        match = _PARTIAL_NAME.search(path)
+        if not match:
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                partial = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"🟡 경고: 샤드 결과 파일 '{path}'를 읽지 못했습니다: {e}")
+            continue
+        if partial.get('version') != PARTIAL_VERSION:
+            print(f"🟡 경고: 샤드 결과 파일 '{path}'의 형식 버전이 달라 무시합니다.")
+            continue
+        partial['path'] = path
+        found.setdefault(int(match.group(2)), {})[int(match.group(1))] = partial
+    if not found:
+        return [], 0, []
+    shard_count = max(found, key=lambda count: max(p['finished_at'] for p in found[count].values()))
+    partials = found[shard_count]
+    missing = [index for index in range(shard_count) if index not in partials]
+    return [partials[index] for index in sorted(partials)], shard_count, missing
+
+
+def remove_partials(partials):
+    for partial in partials:
+        try:
+            os.remove(partial['path'])
+        except OSError as e:
+            print(f"🟡 경고: 샤드 결과 파일 '{partial['path']}'를 삭제하지 못했습니다: {e}")
+
+
+def run_local_shards(shard_count, script='ms_excel_crawler.py', merge=True, env=None):
+    """한 대에서 shard_count개의 크롤러 프로세스를 동시에 실행한 뒤 병합 단계를 실행합니다.
+
+    실패한 샤드가 있어도 병합은 진행합니다. (해당 샤드의 공고는 키가 기록되지 않으므로 다음 실행에서 다시 수집됨)
+    반환값은 실패한 샤드 번호 목록입니다.
+    """
+    base_env = dict(os.environ if env is None else env)
+    base_env.pop('SHARD_MERGE', None)
+    processes = []
+    for index in range(shard_count):
+        shard_env = {**base_env, 'SHARD_INDEX': str(index), 'SHARD_COUNT': str(shard_count)}
+        processes.append(subprocess.Popen([sys.executable, script], env=shard_env))
+    print(f"ℹ️ 샤드 {shard_count}개를 실행했습니다. (PID {', '.join(str(p.pid) for p in processes)})")
+
+    failed = [index for index, process in enumerate(processes) if process.wait() != 0]
+    if failed:
+        print(f"❌ 실패한 샤드: {', '.join(map(str, failed))}")
+    if merge:
+        merge_env = {key: value for key, value in base_env.items() if key not in ('SHARD_INDEX', 'SHARD_COUNT')}
+        subprocess.run([sys.executable, script, '--merge'], env=merge_env, check=False)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤링 대상을 샤드로 나누어 한 대에서 병렬 실행한 뒤 결과를 병합합니다.")
+    parser.add_argument('--shards', type=int, default=os.cpu_count() or 2, help="샤드(프로세스) 수 (기본: CPU 코어 수)")
+    parser.add_argument('--script', default='ms_excel_crawler.py', help="실행할 크롤러 스크립트")
+    parser.add_argument('--no-merge', action='store_true', help="샤드만 실행하고 병합은 하지 않음")
+    args = parser.parse_args()
+    if args.shards < 1:
+        parser.error("--shards는 1 이상이어야 합니다.")
+    failed = run_local_shards(args.shards, script=args.script, merge=not args.no_merge)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 저장소 최상위 모듈(url_canon, date_norm 등)과 벤치마크용 스텁 서버(benchmarks/stub_servers.py)를 바로 import합니다.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
@@ -0,0 +1,166 @@
+"""ms_excel_crawler의 목록 수집 로직 테스트. (목록 페이지는 benchmarks/stub_servers.py의 스텁 사이트)"""
+import pytest
+import requests
+
+import ms_excel_crawler as crawler
+from fetch_cache import FetchCache
+from stub_servers import StubServers, StubState, synthetic_targets
+
+
+@pytest.fixture(autouse=True)
+def no_host_state(monkeypatch):
+    monkeypatch.setattr(crawler, 'HOST_HEALTH', None)
+    monkeypatch.setattr(crawler, 'HOST_LIMITER', None)
+
+
+@pytest.fixture
+def site():
+    state = StubState([], items_per_page=5, latency=0)
+    with StubServers(state) as servers:
+        yield state, servers
+
+
+@pytest.fixture
+def fetch_cache(tmp_path, monkeypatch):
+    cache = FetchCache(str(tmp_path / 'fetch_cache.json'))
+    monkeypatch.setattr(crawler, 'FETCH_CACHE', cache)
+    return cache
+
+
+def css_target(servers, **columns):
+    target = synthetic_targets(1, 1, servers.port, api_ratio=0, max_pages=1)[0]
+    target.update(columns)
+    return target
+
+
+def test_unchanged_page_is_skipped_until_extraction_config_changes(site, fetch_cache):
+    _, servers = site
+    session = requests.Session()
+    target = css_target(servers)
+    first = crawler.handle_css_crawl(target, session)
+    assert len(first) == 5
+    assert crawler.handle_css_crawl(target, session) == []
+    assert fetch_cache.summary() == {'body_hash': 1}
+
+    # 같은 페이지라도 선택자/추출 규칙을 고치면 다시 추출합니다.
+    target['date_selector'] = 'td.num'
+    fixed = crawler.handle_css_crawl(target, session)
+    assert [ann['href'] for ann in fixed] == [ann['href'] for ann in first]
+    assert crawler.handle_css_crawl(target, session) == []
+
+    target['link_attr'], target['link_regex'] = 'href', r'seq=(\d+)'
+    target['link_format'] = f"http://127.0.0.1:{servers.port}/view/{{id}}"
+    relinked = crawler.handle_css_crawl(target, session)
+    assert relinked[0]['href'] == f"http://127.0.0.1:{servers.port}/view/0"
+    assert fetch_cache.summary() == {'body_hash': 2}
+
+
+# --- 페이지 이동 ---
+def pages_of(*pages):
+    """paginate()에 넘길 fetch_page: pages[n]은 n+1페이지의 공고 목록(또는 발생시킬 예외)."""
+    calls = []
+
+    def fetch_page(page_no, cursor):
+        calls.append((page_no, cursor))
+        page = pages[page_no - 1]
+        if isinstance(page, Exception):
+            raise page
+        return [{'title': href, 'href': href} for href in page], f'cursor-{page_no + 1}'
+
+    return fetch_page, calls
+
+
+def test_paginate_stops_at_page_with_known_link():
+    target = {'company': 'A', 'max_pages': 5}
+    fetch_page, calls = pages_of(['https://a.com/view?id=9', 'https://a.com/view?id=8'],
+                                 ['https://a.com/view?id=7', 'https://a.com/view?id=6'],
+                                 ['https://a.com/view?id=5'])
+    processed = {crawler.dedup_key('https://a.com/view?id=6&page=2', target)}
+    announcements = crawler.paginate(target, fetch_page, 'cursor-1', processed)
+    assert [page_no for page_no, _ in calls] == [1, 2]
+    assert [cursor for _, cursor in calls] == ['cursor-1', 'cursor-2']
+    assert len(announcements) == 4
+
+
+def test_paginate_respects_max_pages():
+    fetch_page, calls = pages_of(*[[f'https://a.com/{n}'] for n in range(10)])
+    announcements = crawler.paginate({'company': 'A', 'max_pages': '3'}, fetch_page, 'cursor-1', set())
+    assert len(calls) == 3 and len(announcements) == 3
+    # max_pages가 없거나 잘못된 값이면 첫 페이지만
+    fetch_page, calls = pages_of(*[[f'https://a.com/{n}'] for n in range(10)])
+    crawler.paginate({'company': 'A', 'max_pages': 'abc'}, fetch_page, 'cursor-1', set())
+    assert len(calls) == 1
+
+
+def test_paginate_keeps_earlier_pages_when_deeper_page_fails():
+    fetch_page, calls = pages_of(['https://a.com/1'], ['https://a.com/2'], requests.ConnectionError('reset'))
+    announcements = crawler.paginate({'company': 'A', 'max_pages': 5}, fetch_page, 'cursor-1', set())
+    assert [ann['href'] for ann in announcements] == ['https://a.com/1', 'https://a.com/2']
+    # 첫 페이지 실패는 그대로 전달됩니다.
+    fetch_page, _ = pages_of(requests.ConnectionError('reset'))
+    with pytest.raises(requests.ConnectionError):
+        crawler.paginate({'company': 'A', 'max_pages': 5}, fetch_page, 'cursor-1', set())
+
+
+def test_next_page_url_prefers_next_link_then_page_param():
+    target = {'url': 'https://a.com/board/list.do?bbsId=7&pageIndex=1', 'page_param': 'pageIndex'}
+    current = 'https://a.com/board/list.do?bbsId=7&pageIndex=1'
+    assert crawler.next_page_url(target, current, 2, '?bbsId=7&pageIndex=2&x=1') == \
+        'https://a.com/board/list.do?bbsId=7&pageIndex=2&x=1'
+    for unusable in ('#', 'javascript:goPage(2)', '', None):
+        assert crawler.next_page_url(target, current, 2, unusable) == 'https://a.com/board/list.do?bbsId=7&pageIndex=2'
+    assert crawler.next_page_url({**target, 'page_start': '0'}, current, 3) == \
+        'https://a.com/board/list.do?bbsId=7&pageIndex=2'
+    assert crawler.next_page_url({'url': target['url']}, current, 2) is None
+
+
+class FakeApiResponse:
+    status_code = 200
+    headers = {}
+    content = b''
+
+    def __init__(self, page_no):
+        self.page_no = page_no
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'data': {'list': [{'id': f'{self.page_no}-{i}', 'title': f'공고 {self.page_no}-{i}'} for i in range(2)]}}
+
+
+class FakeApiSession:
+    """요청을 기록하고, 요청 순서대로 1, 2, ... 페이지의 응답을 돌려줍니다."""
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, kwargs))
+        return FakeApiResponse(len(self.requests))
+
+
+def api_target(**columns):
+    return {'company': 'API', 'api_url': 'https://api.example/list', 'json_item_path': 'data.list',
+            'json_title_path': 'title', 'json_link_id_path': 'id', 'link_format': 'https://api.example/view/{id}',
+            'page_param': 'pageNo', 'page_start': 1, 'max_pages': 2, **columns}
+
+
+@pytest.mark.parametrize('columns, second_request', [
+    ({'api_method': 'POST', 'api_payload': '{"size": 10}'},
+     lambda kw: kw['json'] == {'size': 10, 'pageNo': 2} and kw['params'] is None),
+    ({'api_method': 'POST', 'api_form_data': 'size=10&type=bid'},
+     lambda kw: kw['data'] == 'size=10&type=bid&pageNo=2' and kw['json'] is None),
+    ({'api_method': 'GET', 'api_payload': '{"size": 10}'},
+     lambda kw: kw['params'] == {'size': 10, 'pageNo': 2}),
+    ({'api_method': 'GET'},
+     lambda kw: kw['params'] == {'pageNo': 2}),
+])
+def test_api_page_param_injection(columns, second_request):
+    session = FakeApiSession()
+    announcements = crawler.handle_api_crawl(api_target(**columns), session, set())
+    assert [ann['href'] for ann in announcements] == [f'https://api.example/view/{n}-{i}' for n in (1, 2) for i in (0, 1)]
+    (first_method, first), (second_method, second) = session.requests
+    assert first_method == second_method == columns['api_method']
+    assert 'pageNo' not in str(first)  # 첫 페이지는 설정 그대로 요청
+    assert second_request(second)
@@ -0,0 +1,22 @@
+from date_norm import NO_DATE, normalize_date, normalize_dates, standardize_date
+
+
+def test_standardize_common_formats():
+    assert standardize_date('2024.1.5') == '2024-01-05'
+    assert standardize_date('2024/01/05') == '2024-01-05'
+    assert standardize_date('2024년 1월 5일') == '2024-01-05'
+    assert standardize_date('') == NO_DATE
+
+
+def test_epoch_values_use_kst():
+    assert normalize_date(1704380400) == '2024-01-05'      # 2024-01-04 15:00 UTC
+    assert normalize_date(1704380400000) == '2024-01-05'
+
+
+def test_normalize_dates_with_unhashable_values():
+    values = ['2024.01.05', [2024, 1, 5], {'y': 2024}, None, '2024.01.05']
+    assert normalize_dates(values) == ['2024-01-05', '[2024, 1, 5]', "{'y': 2024}", NO_DATE, '2024-01-05']
+
+
+def test_normalize_dates_with_format():
+    assert normalize_dates(['05/01/2024'], '%d/%m/%Y') == ['2024-01-05']
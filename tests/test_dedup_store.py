@@ -0,0 +1,64 @@
+import os
+
+from dedup_store import SqliteDedupStore, hash_key
+
+
+def open_store(tmp_path, db='processed_links.db'):
+    return SqliteDedupStore(str(tmp_path / db), log_path=str(tmp_path / 'processed_keys.log'))
+
+
+def read_log(tmp_path):
+    return (tmp_path / 'processed_keys.log').read_text(encoding='ascii').split()
+
+
+def test_new_keys_are_appended_to_log(tmp_path):
+    with open_store(tmp_path) as store:
+        store.add_many(['a.com/1', 'a.com/2'])
+    first = (tmp_path / 'processed_keys.log').read_bytes()
+    assert read_log(tmp_path) == [hash_key('a.com/1').hex(), hash_key('a.com/2').hex()]
+
+    with open_store(tmp_path) as store:
+        store.add_many(['a.com/2', 'a.com/3'])  # 이미 있는 키는 다시 기록하지 않음
+    log = (tmp_path / 'processed_keys.log').read_bytes()
+    assert log.startswith(first)
+    assert read_log(tmp_path)[2:] == [hash_key('a.com/3').hex()]
+
+
+def test_store_is_rebuilt_from_log_without_db(tmp_path):
+    with open_store(tmp_path) as store:
+        store.add_many(['a.com/1', 'a.com/2'])
+    os.remove(tmp_path / 'processed_links.db')
+    with open_store(tmp_path) as store:
+        assert 'a.com/1' in store and 'a.com/2' in store and 'a.com/3' not in store
+        assert len(store) == 2
+
+
+def test_lines_appended_elsewhere_are_imported(tmp_path):
+    with open_store(tmp_path) as store:
+        store.add_many(['a.com/1'])
+    # 다른 곳(예: git pull)에서 로그에 추가된 줄과, 중단된 쓰기로 잘린 줄
+    with open(tmp_path / 'processed_keys.log', 'a', encoding='ascii') as f:
+        f.write(hash_key('a.com/2').hex() + '\n' + hash_key('a.com/3').hex()[:10])
+    with open_store(tmp_path) as store:
+        assert 'a.com/2' in store
+        assert 'a.com/3' not in store
+
+
+def test_existing_db_is_exported_to_new_log(tmp_path):
+    with SqliteDedupStore(str(tmp_path / 'processed_links.db'), log_path=None) as store:
+        store.add_many(['a.com/1', 'a.com/2'])
+    with open_store(tmp_path) as store:
+        assert len(store) == 2
+    assert sorted(read_log(tmp_path)) == sorted([hash_key('a.com/1').hex(), hash_key('a.com/2').hex()])
+
+
+def test_migration_from_text_runs_once(tmp_path):
+    text = tmp_path / 'processed_links.txt'
+    text.write_text('https://a.com/1\nhttps://a.com/2\n', encoding='utf-8')
+    with open_store(tmp_path) as store:
+        assert store.migrate_from_text(str(text)) == 2
+    os.remove(tmp_path / 'processed_links.db')
+    with open_store(tmp_path) as store:
+        assert store.migrate_from_text(str(text)) == 0  # 로그가 있으면 이미 이전된 것
+        assert 'https://a.com/1' in store
+    assert len(read_log(tmp_path)) == 2
@@ -0,0 +1,76 @@
+"""로컬 스텁 Graph 서버(benchmarks/stub_servers.py)를 상대로 한 GraphClient 테스트."""
+import pytest
+import requests
+
+from graph_client import GraphClient
+from stub_servers import StubServers, StubState, synthetic_targets
+
+
+@pytest.fixture
+def stub():
+    state = StubState([], latency=0)
+    with StubServers(state) as servers:
+        state.targets = synthetic_targets(3, 1, servers.port)
+        yield state, servers
+
+
+@pytest.fixture
+def client(stub):
+    _, servers = stub
+    return GraphClient('stub-token', 'bench@example.com', 'Bench/Targets.xlsx', session=requests.Session(),
+                       base_url=servers.graph_base_url)
+
+
+def test_get_tables_in_one_batch(stub, client):
+    state, _ = stub
+    tables = client.get_tables(['Settings', 'Crawl_Targets'])
+    assert state.requests == 1
+    assert {row['Setting'] for row in tables['Settings']} == {'Receiver Email', 'Developer Email'}
+    assert [row['company'] for row in tables['Crawl_Targets']] == ['합성0000', '합성0001', '합성0002']
+    assert tables['Crawl_Targets'][0]['api_url'] is None  # 빈 셀은 None
+
+
+def test_load_tables_cached_reuses_cache_until_version_changes(stub, client, tmp_path):
+    state, _ = stub
+    cache_path = str(tmp_path / 'config.json')
+    client.load_tables_cached(['Settings'], cache_path)
+    requests_before = state.requests
+    client.load_tables_cached(['Settings'], cache_path)
+    assert state.requests == requests_before + 1  # 버전 확인만
+
+    state.version += 1
+    client.load_tables_cached(['Settings'], cache_path)
+    assert state.requests == requests_before + 3  # 버전 확인 + $batch
+
+
+def test_add_rows_in_chunks(stub, client):
+    state, _ = stub
+    rows = [[str(n)] for n in range(450)]
+    assert client.add_rows('Collected_Announcements', rows, chunk_size=200) == 3
+    assert state.rows_added == 450
+
+
+def test_add_rows_retries_throttled_write(stub, client):
+    state, _ = stub
+    state.graph_faults.append(('/rows/add', 429, False))
+    client.add_rows('Collected_Announcements', [['a'], ['b']])
+    assert state.rows_added == 2
+    assert state.requests == 2
+
+
+@pytest.mark.parametrize('status', [503, 504])
+def test_add_rows_does_not_retry_gateway_errors(stub, client, status):
+    state, _ = stub
+    # 행은 추가되었지만 게이트웨이 오류가 반환된 경우: 재시도하면 행이 중복됩니다.
+    state.graph_faults.append(('/rows/add', status, True))
+    with pytest.raises(requests.HTTPError):
+        client.add_rows('Collected_Announcements', [['a'], ['b']])
+    assert state.rows_added == 2
+    assert state.requests == 1
+
+
+def test_reads_retry_gateway_errors(stub, client):
+    state, _ = stub
+    state.graph_faults.append(('.xlsx:', 503, False))
+    assert client.get_workbook_version() == f'"c:{{stub}},{state.version}"'
+    assert state.requests == 2
@@ -0,0 +1,42 @@
+import io
+import json
+
+import pytest
+
+from json_path import compile_path, stream_items
+
+DOCUMENT = {
+    'data': {
+        'list': [{'title': '공고 1', 'id': 1}, {'title': '공고 2', 'id': 2}],
+        'groups': [{'items': [{'id': 3}]}, {'items': [{'id': 4}, {'id': 5}]}],
+        'byKey': {'a': {'id': 6}, 'b': {'id': 7}},
+    },
+}
+PATHS = ['data.list', 'data.list[*]', 'data.groups[*].items', 'data.byKey[*]', 'data.list[0]', 'data.missing']
+
+
+def parse_items(path, streamed):
+    """크롤러(parse_api_page)와 같은 방식: 스트리밍할 수 없으면 전체 파싱으로 대체."""
+    raw = json.dumps(DOCUMENT, ensure_ascii=False).encode('utf-8')
+    items = stream_items(io.BytesIO(raw), path) if streamed else None
+    if items is None:
+        items = path.items(json.loads(raw))
+    return list(items)
+
+
+@pytest.mark.parametrize('expr', PATHS)
+def test_streamed_items_match_full_parse(expr):
+    pytest.importorskip('ijson')
+    path = compile_path(expr)
+    assert parse_items(path, streamed=True) == parse_items(path, streamed=False)
+
+
+def test_wildcard_paths_are_not_streamed():
+    assert compile_path('data.list[*]').stream_prefix() is None
+    assert compile_path('data.groups[*].items').stream_prefix() is None
+    assert compile_path('data.list').stream_prefix() == 'data.list.item'
+
+
+def test_get_with_default():
+    assert compile_path('data.list[1].title').get(DOCUMENT) == '공고 2'
+    assert compile_path('data.list[9].title|제목 없음').get(DOCUMENT) == '제목 없음'
@@ -0,0 +1,53 @@
+import json
+
+from fetch_cache import FetchCache
+from json_store import JsonStateFile, env_float
+from page_encoding import CharsetCache
+from resilience import HostHealth
+from scheduler import CrawlSchedule
+
+
+def test_round_trip_and_export_merge(tmp_path):
+    path = str(tmp_path / 'state.json')
+    state = JsonStateFile(path)
+    state.merge({'a': {'n': 1}, 'b': {'n': 2}})
+    exported = state.export(['a', 'missing'])
+    assert exported == {'a': {'n': 1}}
+    exported['a']['n'] = 99  # 꺼낸 항목을 바꿔도 원본은 그대로
+    state.save()
+    assert JsonStateFile(path).export(['a', 'b']) == {'a': {'n': 1}, 'b': {'n': 2}}
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_unreadable_file_starts_empty(tmp_path, capsys):
+    path = tmp_path / 'broken.json'
+    path.write_text('{not json', encoding='utf-8')
+    assert FetchCache(str(path)).export(['a']) == {}
+    assert "요청 캐시" in capsys.readouterr().out
+
+
+def test_env_float(monkeypatch):
+    monkeypatch.setenv('JSON_STORE_TEST', '2.5')
+    assert env_float('JSON_STORE_TEST', 1.0) == 2.5
+    monkeypatch.setenv('JSON_STORE_TEST', 'abc')
+    assert env_float('JSON_STORE_TEST', 1.0) == 1.0
+
+
+def test_state_classes_share_file_format(tmp_path):
+    for cls, key, entry in ((FetchCache, 'A|http://a/', {'etag': '"x"'}),
+                            (HostHealth, 'a.example', {'latency': 0.5}),
+                            (CharsetCache, 'a.example', 'cp949'),
+                            (CrawlSchedule, 'A|http://a/', {'interval': 3600})):
+        path = str(tmp_path / f'{cls.__name__}.json')
+        state = cls(path)
+        state.merge({key: entry})
+        state.save()
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f) == {key: entry}
+
+
+def test_charset_cache_writes_file_even_when_empty(tmp_path):
+    # 워크플로우가 git add하는 파일이므로 변경이 없어도 항상 기록합니다.
+    path = tmp_path / 'charset_cache.json'
+    CharsetCache(str(path)).save()
+    assert json.loads(path.read_text(encoding='utf-8')) == {}
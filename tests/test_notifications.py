@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+
+from notifications import (KST, ReceiverGroup, build_digest, receiver_groups_from_settings, render_summary,
+                           send_digests)
+
+NOW = datetime(2026, 10, 17, 7, 0, tzinfo=KST)
+
+
+def announcements(count, company='회사', title='입찰 공고'):
+    return [{'company': f'{company}{n % 7}', 'title': f'{title} {n} ' + '가' * 40,
+             'href': f'https://a.example/view?id={n}', 'date': '2026-10-16'} for n in range(count)]
+
+
+@pytest.mark.parametrize('max_bytes', [4000, 20000, 90000])
+def test_summary_stays_under_byte_cap(max_bytes):
+    items = announcements(2000)
+    body, shown = render_summary(items, excel_url='https://excel.example/book', max_bytes=max_bytes, now=NOW)
+    assert len(body.encode('utf-8')) <= max_bytes
+    assert 0 < shown < len(items)
+    assert f'{len(items) - shown}건' in body and 'https://excel.example/book' in body
+    assert body.endswith('</div></body>')
+
+
+def test_small_summary_has_no_overflow_note():
+    items = announcements(3)
+    body, shown = render_summary(items, max_bytes=90000, now=NOW)
+    assert shown == 3
+    assert 'class="overflow"' not in body.replace('.overflow{', '')
+    assert '2026년 10월 17일' in body
+
+
+def test_titles_and_links_are_escaped():
+    items = [{'company': 'A&B <주>', 'title': '<script>alert(1)</script>',
+              'href': 'https://a.example/view?id=1&x="><img src=x>', 'date': None}]
+    body, _ = render_summary(items, now=NOW)
+    assert '<script>' not in body and '<img' not in body
+    assert '&lt;script&gt;alert(1)&lt;/script&gt;' in body
+    assert 'href="https://a.example/view?id=1&amp;x=&quot;&gt;&lt;img src=x&gt;"' in body
+    assert 'A&amp;B &lt;주&gt;' in body
+    assert '<td>N/A</td>' in body
+
+
+def test_receiver_groups_from_settings():
+    settings = {
+        'Receiver Email': 'a@example.com; b@example.com',
+        'Developer Email': 'dev@example.com, a@example.com',
+        'Receiver Group 보험': 'ins@example.com',
+        'Receiver Group 보험 Companies': '회사1,회사2',
+        'Receiver Group 전체': 'all@example.com\nall2@example.com',
+        'Receiver Group 빈그룹 Companies': '회사3',
+    }
+    groups = {group.name: group for group in receiver_groups_from_settings(settings)}
+    assert groups['기본'] == ReceiverGroup('기본', ['a@example.com', 'b@example.com', 'dev@example.com'], None)
+    assert groups['보험'].emails == ['ins@example.com']
+    assert groups['보험'].companies == frozenset({'회사1', '회사2'})
+    assert groups['전체'] == ReceiverGroup('전체', ['all@example.com', 'all2@example.com'], None)
+    assert '빈그룹' not in groups  # 수신자가 없는 그룹은 건너뜀
+    assert receiver_groups_from_settings(settings, 'TEST') == [ReceiverGroup('개발자', ['dev@example.com', 'a@example.com'], None)]
+
+
+def test_company_filter_per_group():
+    items = announcements(14)
+    insurance = ReceiverGroup('보험', ['ins@example.com'], frozenset({'회사1', '회사2'}))
+    subject, body = build_digest(insurance, items)
+    assert '4개의 새로운 공고' in subject
+    assert '회사1' in body and '회사2' in body and '회사3' not in body
+
+    empty = ReceiverGroup('기타', ['x@example.com'], frozenset({'없는회사'}))
+    subject, _ = build_digest(empty, items)
+    assert '신규 공고 없음' in subject
+
+    sent = {}
+    send_digests([insurance, empty, ReceiverGroup('기본', ['a@example.com'], None)], items,
+                 lambda subject, body, emails: sent.update({emails[0]: subject}))
+    assert '14개의 새로운 공고' in sent['a@example.com']
+    assert '4개의 새로운 공고' in sent['ins@example.com']
+    assert '신규 공고 없음' in sent['x@example.com']
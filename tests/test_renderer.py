@@ -0,0 +1,83 @@
+"""페이지 풀 동작을 가짜 브라우저로 확인합니다. (실제 Chromium을 띄우지 않음)"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from renderer import BrowserRenderer
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.url = None
+
+    async def setUserAgent(self, user_agent):
+        pass
+
+    async def goto(self, url, options):
+        self.url = url
+        await asyncio.sleep(0.05)
+        if 'fail' in url:
+            raise RuntimeError('net::ERR_CONNECTION_RESET')
+        if 'hang' in url:
+            await asyncio.sleep(60)
+
+    async def waitForSelector(self, selector, options):
+        pass
+
+    async def content(self):
+        return f'<html>{self.url}</html>'
+
+    async def close(self):
+        self.browser.open_pages -= 1
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.open_pages = 0
+        self.max_open_pages = 0
+
+    async def newPage(self):
+        self.open_pages += 1
+        self.max_open_pages = max(self.max_open_pages, self.open_pages)
+        return FakePage(self)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def renderer():
+    renderer = BrowserRenderer(pool_size=2, timeout=1)
+    renderer._browser = FakeBrowser()
+    yield renderer
+    renderer.close()
+
+
+def test_failed_pages_do_not_block_waiting_targets(renderer):
+    urls = ['https://a.example/fail1', 'https://a.example/fail2', 'https://a.example/ok1', 'https://a.example/ok2']
+
+    def render(url):
+        try:
+            return renderer.render(url)
+        except RuntimeError as e:
+            return e
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(render, urls))
+    assert time.monotonic() - start < 5
+    assert all(isinstance(result, RuntimeError) for result in results[:2])
+    assert results[2:] == ['<html>https://a.example/ok1</html>', '<html>https://a.example/ok2</html>']
+    assert renderer._browser.max_open_pages <= 2
+
+
+def test_cancelled_render_returns_its_slot(renderer):
+    renderer.pool_size = 1
+    hanging = asyncio.run_coroutine_threadsafe(renderer._render('https://a.example/hang', None), renderer._loop)
+    time.sleep(0.2)
+    hanging.cancel()
+    assert renderer.render('https://a.example/ok') == '<html>https://a.example/ok</html>'
+    assert renderer._browser.open_pages == 1
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+import requests
+
+import resilience
+from crawl_engine import run_targets
+from resilience import CircuitOpenError, HostHealth
+
+URL = 'https://a.example/list'
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSend:
+    """미리 정한 응답(또는 예외)을 차례로 돌려주는 send 함수."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self, session, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def waits(monkeypatch):
+    waits = []
+    monkeypatch.setattr(resilience.time, 'sleep', waits.append)
+    monkeypatch.setattr(resilience.random, 'uniform', lambda low, high: high)  # 지터 없이 상한만큼 대기
+    return waits
+
+
+@pytest.fixture
+def health(tmp_path):
+    return HostHealth(str(tmp_path / 'host_health.json'), max_retries=2, failure_threshold=2, cooldown_hours=1)
+
+
+def test_retried_responses_are_closed_and_backoff_doubles(health, waits):
+    throttled, unavailable, ok = FakeResponse(503), FakeResponse(502), FakeResponse(200)
+    send = FakeSend(throttled, unavailable, ok)
+    assert health.request(None, 'GET', URL, send=send, stream=True) is ok
+    assert throttled.closed and unavailable.closed and not ok.closed
+    assert waits == [resilience.BACKOFF_BASE, resilience.BACKOFF_BASE * 2]
+    assert not health.is_suspect('a.example')
+
+
+def test_retry_after_is_honoured_up_to_backoff_max(health, waits):
+    send = FakeSend(FakeResponse(429, {'Retry-After': '7'}), FakeResponse(429, {'Retry-After': '3600'}), FakeResponse(200))
+    health.request(None, 'GET', URL, send=send)
+    assert waits == [7.0, resilience.BACKOFF_MAX]
+
+
+def test_last_transient_response_is_returned_open(health, waits):
+    last = FakeResponse(503)
+    response = health.request(None, 'GET', URL, send=FakeSend(FakeResponse(503), FakeResponse(503), last))
+    assert response is last and not last.closed
+    assert health.is_suspect('a.example')
+
+
+def test_client_errors_do_not_reset_breaker(health, waits):
+    health.record_failure('a.example', requests.ConnectionError('reset'))
+    response = health.request(None, 'GET', URL, send=FakeSend(FakeResponse(404)))
+    assert response.status_code == 404
+    assert health.is_suspect('a.example')
+    assert 'latency' not in health.export(['a.example'])['a.example']
+
+
+def test_breaker_trips_and_half_open_retrips(health, waits):
+    health.max_retries = 0
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            health.request(None, 'GET', URL, send=FakeSend(requests.ConnectionError('refused')))
+    assert health.is_open('a.example')
+    first_open_until = health.open_until('a.example')
+    assert first_open_until == pytest.approx(time.time() + 3600, abs=60)
+    with pytest.raises(CircuitOpenError):
+        health.request(None, 'GET', URL, send=FakeSend())
+    assert health.skipped == {'a.example': []}
+
+    # 차단이 풀린 뒤(half-open) 한 번만 더 실패해도 두 배 시간 동안 다시 차단합니다.
+    health._entries['a.example']['open_until'] = time.time() - 1
+    with pytest.raises(requests.Timeout):
+        health.request(None, 'GET', URL, send=FakeSend(requests.Timeout('slow')))
+    assert health.is_open('a.example')
+    assert health.open_until('a.example') == pytest.approx(time.time() + 2 * 3600, abs=60)
+
+    # 성공하면 모든 실패 기록이 지워집니다.
+    health._entries['a.example']['open_until'] = time.time() - 1
+    health.request(None, 'GET', URL, send=FakeSend(FakeResponse(200)))
+    assert not health.is_suspect('a.example') and not health.is_open('a.example')
+
+
+def test_suspect_hosts_are_crawled_last(health):
+    health.record_failure('down.example', requests.ConnectionError('refused'))
+    targets = [{'company': 'A', 'url': 'https://down.example/1'}, {'company': 'B', 'url': 'https://a.example/1'},
+               {'company': 'C', 'url': 'https://down.example/2'}, {'company': 'D', 'url': 'https://b.example/1'}]
+    order = []
+    results = run_targets(targets, lambda target: order.append(target['company']) or target['company'], workers=1,
+                          order_key=lambda target: health.is_suspect(resilience.url_host(target['url'])))
+    assert order == ['B', 'D', 'A', 'C']
+    assert results == ['A', 'B', 'C', 'D']
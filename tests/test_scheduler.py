@@ -0,0 +1,41 @@
+from scheduler import CrawlSchedule
+
+HOUR = 3600
+NOW = 1_800_000_000.0
+
+
+def target(n, host='a.example'):
+    return {'company': f'회사{n}', 'url': f'https://{host}/list/{n}'}
+
+
+def schedule_with(tmp_path, *targets):
+    schedule = CrawlSchedule(str(tmp_path / 'crawl_schedule.json'), min_interval_hours=1, max_interval_hours=72)
+    for t in targets:
+        schedule.record(t, 0, now=NOW - 10 * HOUR)
+        schedule.record(t, 0, now=NOW)  # 신규 공고 없음: 간격 20시간
+    return schedule
+
+
+def test_next_due_ignores_targets_removed_from_list(tmp_path):
+    removed, kept = target(1), target(2)
+    schedule = schedule_with(tmp_path, removed, kept)
+    # 지운 대상은 다시 기록되지 않아 계속 예정 상태로 남습니다.
+    schedule.merge({'회사1|https://a.example/list/1': {'last_crawled': NOW - 100 * HOUR, 'interval': HOUR,
+                                                      'next_due': NOW - 99 * HOUR}})
+    assert schedule.seconds_until_next_due([removed, kept], now=NOW) == 0
+    remaining = schedule.seconds_until_next_due([kept], now=NOW)
+    assert 17 * HOUR < remaining <= 20 * HOUR
+    assert schedule.seconds_until_next_due([], now=NOW) is None
+
+
+def test_next_due_waits_for_blocked_hosts(tmp_path):
+    blocked, other = target(1, 'down.example'), target(2)
+    schedule = schedule_with(tmp_path, other)
+    open_until = {'down.example': NOW + 5 * HOUR}
+
+    def blocked_until(t):
+        return open_until.get(t['url'].split('/')[2], 0)
+
+    # 처음 보는 대상도 호스트가 차단된 동안은 예정 시각이 아닙니다.
+    assert schedule.seconds_until_next_due([blocked], now=NOW) == 0
+    assert schedule.seconds_until_next_due([blocked, other], now=NOW, blocked_until=blocked_until) == 5 * HOUR
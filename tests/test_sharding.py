@@ -0,0 +1,38 @@
+from resilience import HostHealth
+from sharding import select_shard, shard_of
+
+
+def test_targets_of_one_host_share_a_shard():
+    targets = [{'company': f'회사{n}', 'url': f'https://board{n % 5}.example.com/list?page={n}'} for n in range(40)]
+    for shard_count in (2, 3, 4):
+        shards = {}
+        for target in targets:
+            host = target['url'].split('/')[2]
+            shards.setdefault(host, set()).add(shard_of(target, shard_count))
+        assert all(len(indexes) == 1 for indexes in shards.values())
+        selected = [select_shard(targets, index, shard_count) for index in range(shard_count)]
+        assert sum(len(part) for part in selected) == len(targets)
+
+
+def test_api_and_page_targets_on_same_host():
+    page = {'company': 'A', 'url': 'https://bid.example.com/list'}
+    api = {'company': 'B', 'api_url': 'https://BID.example.com/api/list'}
+    assert shard_of(page, 7) == shard_of(api, 7)
+
+
+def test_host_health_merge_overrides_file_then_combines_shards(tmp_path):
+    health = HostHealth(str(tmp_path / 'host_health.json'))
+    health._entries['a.example'] = {'failures': 2, 'latency': 1.0}
+    # 첫 샤드 결과(성공으로 실패 기록이 지워짐)는 파일의 이전 상태를 덮어씁니다.
+    health.merge({'a.example': {'latency': 0.5, 'deviation': 0.1}})
+    assert health.export(['a.example']) == {'a.example': {'latency': 0.5, 'deviation': 0.1}}
+    # 같은 호스트가 다른 샤드에서도 들어오면 더 나쁜 상태를 유지합니다.
+    health.merge({'a.example': {'failures': 1, 'trips': 1, 'open_until': 100.0,
+                                'last_error': 'Timeout: x', 'last_failure': '2026-10-17T00:00:00+00:00'}})
+    entry = health.export(['a.example'])['a.example']
+    assert (entry['failures'], entry['trips'], entry['open_until'], entry['latency']) == (1, 1, 100.0, 0.5)
+    assert entry['last_error'] == 'Timeout: x'
+    health.merge({'a.example': {'failures': 3, 'open_until': 50.0, 'last_error': 'old',
+                                'last_failure': '2026-10-16T00:00:00+00:00'}})
+    entry = health.export(['a.example'])['a.example']
+    assert (entry['failures'], entry['open_until'], entry['last_error']) == (3, 100.0, 'Timeout: x')
@@ -0,0 +1,70 @@
+from url_canon import canonicalize_url, dedup_key, legacy_dedup_key
+
+
+def test_query_with_return_url_keeps_identity_params():
+    first = canonicalize_url('http://x.co.kr/view.do?seq=101&returnUrl=/board/list.do')
+    second = canonicalize_url('http://x.co.kr/view.do?seq=102&returnUrl=/board/list.do')
+    assert first == 'x.co.kr/view.do?returnUrl=%2Fboard%2Flist.do&seq=101'
+    assert first != second
+
+
+def test_date_in_query_is_not_treated_as_path():
+    key = canonicalize_url('http://x.co.kr/view.php?id=7&date=2024/01/05')
+    assert key == 'x.co.kr/view.php?date=2024%2F01%2F05&id=7'
+    assert key != canonicalize_url('http://x.co.kr/view.php?id=8&date=2024/01/05')
+
+
+def test_joined_url_with_repeated_listing_path_is_repaired():
+    href = ('https://omoney.kbstar.com/quics?page=C018592/quics?page=C018592&boardId=648&articleId=140997'
+            '&bbsMode=view&viewPage=1&searchCondition=title&searchStr=')
+    assert canonicalize_url(href) == 'omoney.kbstar.com/quics?articleId=140997&bbsMode=view&boardId=648'
+
+
+def test_joined_url_keeps_parameters_before_slash():
+    assert canonicalize_url('http://x.co.kr/pc/list.jsp?tp=T&ct=1/pc/view.shtm?tp=T') == 'x.co.kr/pc/view.shtm?ct=1&tp=T'
+
+
+def test_joined_url_after_paging_parameter_is_repaired():
+    assert canonicalize_url('https://pikk.co.kr/bids?page=1/bid/83') == 'pikk.co.kr/bid/83'
+
+
+def test_legacy_key_matches_previous_repair():
+    href = 'https://www.kebhana.com/cont/news/news01/index.jsp?_menuNo=98853/cont/news/news01/1510916_115430.jsp'
+    assert dedup_key(href) == 'www.kebhana.com/cont/news/news01/1510916_115430.jsp?_menuNo=98853'
+    assert legacy_dedup_key(href) == 'www.kebhana.com/cont/news/news01/1510916_115430.jsp'
+
+
+def test_identity_params_column():
+    target = {'identity_params': 'boardId, articleId'}
+    href = 'https://omoney.kbstar.com/quics?page=C018592&boardId=648&compId=b031439&articleId=140997&viewPage=2'
+    assert dedup_key(href, target) == 'omoney.kbstar.com/quics?articleId=140997&boardId=648'
+
+
+def test_route_fragments_do_not_collide():
+    assert canonicalize_url('https://x.com/#/notice/123') == 'x.com/#/notice/123'
+    assert canonicalize_url('https://x.com/#/notice/123') != canonicalize_url('https://x.com/#/notice/124')
+    assert canonicalize_url('https://x.com/app#!/view/5') != canonicalize_url('https://x.com/app#!/view/6')
+    # 페이지 내 앵커와 빈 해시뱅은 키에 넣지 않습니다.
+    assert canonicalize_url('https://x.com/view.do?id=1#top') == 'x.com/view.do?id=1'
+    assert canonicalize_url('https://x.com/list.do#!') == 'x.com/list.do'
+
+
+def test_ambiguous_params_kept_when_they_are_the_only_identity():
+    assert canonicalize_url('https://x.com/bbs/view?page=notice_42') == 'x.com/bbs/view?page=notice_42'
+    assert canonicalize_url('https://x.com/bbs/view?page=notice_42') != canonicalize_url('https://x.com/bbs/view?page=notice_43')
+    assert canonicalize_url('https://x.com/view?q=7') != canonicalize_url('https://x.com/view?q=8')
+    assert canonicalize_url('https://x.com/view?p_no=7&pageNo=2') == 'x.com/view?p_no=7'
+
+
+def test_ambiguous_params_dropped_with_other_identity():
+    assert canonicalize_url('https://x.com/view?page=3&id=9') == 'x.com/view?id=9'
+    target = {'identity_params': 'articleId'}
+    assert dedup_key('https://x.com/view?page=C018592', target) == 'x.com/view'
+
+
+def test_file_segment_repair_needs_two_file_segments():
+    assert canonicalize_url('https://x.com/news/2024.01/123') == 'x.com/news/2024.01/123'
+    assert canonicalize_url('https://x.com/news/2024.01/123') != canonicalize_url('https://x.com/news/2024.01/124')
+    assert canonicalize_url('https://x.com/a/view.do/') == 'x.com/a/view.do'
+    assert canonicalize_url('https://x.com/a/view.do/') != canonicalize_url('https://x.com/b/view.do/')
+    assert canonicalize_url('https://x.com/notice/list.do/notice/view.do?id=3') == 'x.com/notice/view.do?id=3'
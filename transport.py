@@ -0,0 +1,236 @@
+"""크롤러, Graph 호출, 메일 발송이 함께 쓰는 전송 계층입니다.
+
+- 세션: 대상 호스트 수와 크롤링 동시성에 맞춘 연결 풀, 공통 기본 헤더(User-Agent 등)
+- DNS 캐시: 같은 호스트(예: 여러 게시판이 있는 omoney.kbstar.com)의 이름 조회를 실행 중 한 번만 수행
+- HTTP/2 (선택): CRAWL_HTTP2=1이고 httpx[http2]가 설치되어 있으면 크롤링 요청을 HTTP/2로 보냄
+- SMTP: 로그인한 연결을 실행 중 재사용하여 TLS 핸드셰이크/인증을 한 번만 수행
+"""
+import io
+import os
+import smtplib
+import socket
+import threading
+import time
+
+import urllib3.util.connection as urllib3_connection
+from requests import Session
+from requests.adapters import DEFAULT_POOLSIZE, BaseAdapter, HTTPAdapter
+from urllib3.response import HTTPResponse
+
+from crawl_metrics import record_timing
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+    'AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/91.0.4472.124 Safari/537.36'
+)
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+DNS_TTL = float(os.environ.get('CRAWL_DNS_TTL', '300'))  # 초
+HTTP2_ENABLED = os.environ.get('CRAWL_HTTP2', '') == '1'
+
+
+# --- DNS 캐시 ---
+class DnsCache:
+    """getaddrinfo 결과를 ttl초 동안 보관합니다. 스레드 안전합니다."""
+
+    def __init__(self, ttl=DNS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host, port, family=socket.AF_UNSPEC):
+        key = (host, port, family)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+        finally:
+            record_timing('dns', time.perf_counter() - start)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (now + self.ttl, infos)
+        return infos
+
+
+DNS_CACHE = DnsCache()
+_original_create_connection = urllib3_connection.create_connection
+
+
+def _create_connection(address, *args, **kwargs):
+    """urllib3의 연결 생성 함수 대체: 캐시된 주소로 연결하고 DNS/연결 시간을 계측 값에 기록합니다."""
+    host, port = address
+    try:
+        infos = DNS_CACHE.resolve(host.strip('[]'), port, urllib3_connection.allowed_gai_family())
+    except OSError:
+        return _original_create_connection(address, *args, **kwargs)  # 원래 예외 형식으로 실패하도록 위임
+
+    start = time.perf_counter()
+    error = None
+    try:
+        # 이미 조회한 IP로 연결하므로 원래 함수의 DNS 조회는 즉시 끝납니다.
+        for info in infos:
+            try:
+                return _original_create_connection((info[4][0], port), *args, **kwargs)
+            except OSError as e:
+                error = e
+        raise error or OSError("getaddrinfo returns an empty list")
+    finally:
+        record_timing('connect', time.perf_counter() - start)
+
+
+def install_connection_layer():
+    """DNS 캐시와 연결 시간 계측을 urllib3 연결 생성에 적용합니다. (여러 번 호출해도 안전)"""
+    urllib3_connection.create_connection = _create_connection
+
+
+# --- HTTP 세션 ---
+def create_session(pool_connections=DEFAULT_POOLSIZE, pool_maxsize=DEFAULT_POOLSIZE, session_class=Session,
+                   headers=None):
+    """연결 풀 크기와 기본 헤더를 지정한 세션을 만듭니다."""
+    session = session_class()
+    session.headers.update(DEFAULT_HEADERS if headers is None else headers)
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def create_crawl_session(host_count, per_host, session_class=Session):
+    """크롤링용 세션. 호스트마다 풀을 하나씩(host_count개) 두고, 풀마다 호스트당 동시 접속 수만큼 연결을 유지합니다."""
+    session = create_session(pool_connections=max(DEFAULT_POOLSIZE, host_count), pool_maxsize=max(1, per_host),
+                             session_class=session_class)
+    if HTTP2_ENABLED:
+        adapter = Http2Adapter.create(max_connections=max(1, host_count) * max(1, per_host))
+        if adapter:
+            session.mount('https://', adapter)
+    return session
+
+
+class Http2Adapter(BaseAdapter):
+    """httpx(HTTP/2) 클라이언트로 요청을 보내는 requests 어댑터. 응답 본문은 모두 읽은 뒤 반환합니다."""
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    @classmethod
+    def create(cls, max_connections):
+        try:
+            import httpx
+        except ImportError:
+            print("🟡 경고: httpx가 설치되어 있지 않아 HTTP/1.1을 사용합니다. (pip install 'httpx[http2]')")
+            return None
+        try:
+            client = httpx.Client(http2=True, follow_redirects=False,
+                                  limits=httpx.Limits(max_connections=max_connections))
+        except ImportError:
+            print("🟡 경고: h2 패키지가 없어 HTTP/1.1을 사용합니다. (pip install 'httpx[http2]')")
+            return None
+        return cls(client)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        import httpx
+        from requests.exceptions import ConnectionError, ReadTimeout
+
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            response = self.client.request(request.method, request.url, headers=dict(request.headers),
+                                           content=request.body, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise ReadTimeout(e, request=request)
+        except httpx.TransportError as e:
+            raise ConnectionError(e, request=request)
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in ('content-encoding', 'content-length')}
+        raw = HTTPResponse(body=io.BytesIO(response.content), headers=headers, status=response.status_code,
+                           reason=response.reason_phrase, preload_content=False, decode_content=False)
+        return HTTPAdapter.build_response(self, request, raw)
+
+    def close(self):
+        self.client.close()
+
+
+# --- SMTP ---
+class SmtpConnection:
+    """로그인한 SMTP 연결을 재사용합니다. 끊긴 연결은 다음 발송 시 다시 연결합니다. 스레드 안전합니다."""
+
+    def __init__(self, host, port, user, password, starttls=True, timeout=30):
+        self.host, self.port = host, port
+        self.user, self.password = user, password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._server = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            server.starttls()
+        server.login(self.user, self.password)
+        return server
+
+    def _alive(self):
+        try:
+            return self._server is not None and self._server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    def sendmail(self, sender, receivers, message):
+        with self._lock:
+            if not self._alive():
+                self._close()
+                self._server = self._connect()
+            try:
+                return self._server.sendmail(sender, receivers, message)
+            except smtplib.SMTPServerDisconnected:
+                # 유휴 중 서버가 연결을 끊은 경우 한 번만 다시 연결합니다.
+                self._server = self._connect()
+                return self._server.sendmail(sender, receivers, message)
+
+    def _close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+
+_smtp = None
+_smtp_lock = threading.Lock()
+
+
+def get_smtp_connection(host, port, user, password, starttls=True):
+    """같은 서버/계정에 대한 공유 SMTP 연결을 반환합니다."""
+    global _smtp
+    with _smtp_lock:
+        key = (host, port, user, starttls)
+        if _smtp is None or (_smtp.host, _smtp.port, _smtp.user, _smtp.starttls) != key:
+            if _smtp is not None:
+                _smtp.close()
+            _smtp = SmtpConnection(host, port, user, password, starttls)
+        return _smtp
+
+
+def close_smtp_connection():
+    global _smtp
+    with _smtp_lock:
+        if _smtp is not None:
+            _smtp.close()
+            _smtp = None
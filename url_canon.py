@@ -0,0 +1,172 @@
+"""공고 링크를 짧고 안정적인 중복 방지 키로 정규화합니다.
+
+- 목록 URL 뒤에 상대 경로가 덧붙은 링크(예: 'quics?page=C018592/quics?page=C018592&...')를 복구
+- 페이징/검색 등 변동 파라미터와 값이 빈 파라미터 제거, 파라미터 정렬
+  (page, q, p_no는 게시글 코드로도 쓰이므로 다른 파라미터가 남거나 identity_params가 있을 때만 제거)
+- 해시 라우팅 링크의 경로형 fragment('#/notice/123', '#!/view/5')는 키에 포함
+- Crawl_Targets의 identity_params 열(예: 'boardId,articleId')이 있으면 해당 파라미터만 유지
+
+정규화 결과(스킴을 뺀 'host/path?query')가 중복 방지 키이며, 저장소에는 이 키의 해시가 기록됩니다.
+기존 이력 파일을 새 키로 다시 기록하려면:
+    python url_canon.py [--source processed_links.txt] [--output 파일] [--identity host=param1,param2 ...]
+"""
+import argparse
+import posixpath
+import re
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit
+
+# 게시글을 식별하지 않고 목록 상태만 나타내는 파라미터 (identity_params가 없을 때 제거)
+VOLATILE_PARAMS = frozenset({
+    'page', 'pageNo', 'pageNum', 'pageIndex', 'currentPage', 'cpage', 'viewPage', 'indexSize', 'rnum', 'p_no',
+    'searchStr', 'searchCondition', 'searchColumn', 'searchString', 'searchSelect', 'searchText',
+    'searchGubun', 'searchTag', 'searchKeyword', 'articleClass', 'q',
+})
+
+# 페이지 코드('page=C018592')나 게시글 번호로도 쓰이는 이름: 식별 파라미터가 따로 있을 때만 변동 파라미터로 취급
+AMBIGUOUS_PARAMS = frozenset({'page', 'q', 'p_no'})
+
+_FILE_SEGMENT = re.compile(r'[^/]+\.[A-Za-z][A-Za-z0-9]{1,4}')
+
+
+def parse_identity_params(value):
+    """'boardId, articleId' 형식의 문자열을 파라미터 이름 튜플로 변환합니다."""
+    if not value:
+        return ()
+    return tuple(name.strip() for name in str(value).split(',') if name.strip())
+
+
+def _repair_joined_url(path, query, keep_query_prefix=True):
+    """목록 URL과 상대 경로가 잘못 이어 붙은 경우 실제 상세 경로/쿼리를 복구합니다.
+
+    keep_query_prefix=False는 '/' 앞의 파라미터를 버리던 이전 방식으로, 기존 키 조회(legacy_dedup_key)에만 사용합니다.
+    """
+    # 1) 쿼리 안에 경로가 섞인 경우: 'list.jsp?tp=T&ct=1/pc/view.shtm?tp=T' -> '/pc/view.shtm?ct=1&tp=T'
+    #    '/' 뒤가 자체 쿼리(?)를 갖거나, 목록 경로(파일명 또는 디렉터리)를 반복하거나,
+    #    '/'가 페이지 번호 같은 변동 파라미터 값 뒤에 붙은 경우('bids?page=1/bid/83')만 복구합니다.
+    #    (returnUrl=/board/list.do, date=2024/01/05 같은 값은 그대로 둠)
+    if '/' in query:
+        head, tail = query.split('/', 1)
+        tail_path, has_query, tail_query = ('/' + tail).partition('?')
+        directory, listing = posixpath.split(path.rstrip('/'))
+        joined_param = head.rsplit('&', 1)[-1].partition('=')[0]
+        if (has_query or joined_param in VOLATILE_PARAMS
+                or (listing and tail_path.startswith('/' + listing))
+                or (directory not in ('', '/') and tail_path.startswith(directory + '/'))):
+            # '/' 앞의 파라미터는 버리지 않고, 뒤쪽 쿼리에 같은 이름이 있으면 뒤쪽 값을 사용합니다.
+            # 단, '/'가 붙은 변동 파라미터('page=1/bid/83'의 page)는 목록의 상태이므로 버립니다.
+            tail_names = {name for name, _ in parse_qsl(tail_query, keep_blank_values=True)}
+            if joined_param in VOLATILE_PARAMS:
+                tail_names.add(joined_param)
+            kept = [param for param in head.split('&')
+                    if keep_query_prefix and param and param.partition('=')[0] not in tail_names]
+            path, query = tail_path, '&'.join(kept + ([tail_query] if tail_query else []))
+    # 2) 파일명 뒤에 다른 파일명이 포함된 경로가 이어진 경우: '/notice/list.do/notice/view.do' -> '/notice/view.do'
+    #    ('/news/2024.01/123', '/a/view.do/'처럼 뒤에 파일명이 없으면 그대로 둠)
+    segments = path.split('/')
+    files = [index for index, segment in enumerate(segments) if _FILE_SEGMENT.fullmatch(segment)]
+    if len(files) >= 2:
+        path = '/' + '/'.join(segments[files[-2] + 1:])
+    return path, query
+
+
+def _route_fragment(fragment):
+    """해시 라우팅 fragment('#/notice/123', '#!/view/5')만 반환합니다. 페이지 내 앵커('#top')는 무시합니다."""
+    return fragment if fragment.startswith(('/', '!')) and fragment.strip('!/') else ''
+
+
+def canonicalize_url(href, identity_params=(), keep_query_prefix=True):
+    """링크를 정규화하여 'host/path?query' 형식의 중복 방지 키를 반환합니다."""
+    if not href:
+        return href
+    href = href.strip()
+    if not href.lower().startswith(('http://', 'https://')):
+        return href  # javascript: 등 URL이 아닌 값은 그대로 사용
+
+    parts = urlsplit(href)
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path, query = _repair_joined_url(parts.path, parts.query, keep_query_prefix)
+    path = posixpath.normpath(unquote(path)) if path else '/'
+    if path == '.':
+        path = '/'
+    path = quote(path, safe='/')
+
+    params = parse_qsl(query, keep_blank_values=True)
+    identity = [(k, v) for k, v in params if k in identity_params] if identity_params else []
+    if not identity:
+        # identity_params가 없거나 링크에 해당 파라미터가 없으면 변동/빈 파라미터만 제거
+        identity = [(k, v) for k, v in params if v and k not in VOLATILE_PARAMS - AMBIGUOUS_PARAMS]
+        if identity_params or any(k not in AMBIGUOUS_PARAMS for k, _ in identity):
+            identity = [(k, v) for k, v in identity if k not in AMBIGUOUS_PARAMS]
+    identity.sort()
+
+    key = host + path
+    if identity:
+        key += '?' + urlencode(identity)
+    fragment = _route_fragment(parts.fragment)
+    if fragment:
+        key += '#' + fragment
+    return key
+
+
+def dedup_key(href, target=None):
+    """대상의 identity_params 설정을 적용하여 링크의 중복 방지 키를 반환합니다."""
+    identity_params = parse_identity_params((target or {}).get('identity_params'))
+    return canonicalize_url(href, identity_params)
+
+
+def legacy_dedup_key(href, target=None):
+    """쿼리 안에 경로가 섞인 링크의 이전 방식 키 ('/' 앞 파라미터 제외). 이미 기록된 공고를 다시 알리지 않도록 조회에만 사용합니다."""
+    identity_params = parse_identity_params((target or {}).get('identity_params'))
+    return canonicalize_url(href, identity_params, keep_query_prefix=False)
+
+
+def rekey_history(lines, identity_by_host=None):
+    """이력 파일의 링크들을 정규화된 키로 변환합니다. (중복 제거, 순서 유지)"""
+    identity_by_host = identity_by_host or {}
+    seen = set()
+    for line in lines:
+        href = line.strip()
+        if not href:
+            continue
+        host = (urlsplit(href).hostname or '').lower() if href.startswith('http') else ''
+        key = canonicalize_url(href, identity_by_host.get(host, ()))
+        if key not in seen:
+            seen.add(key)
+            yield key
+
+
+def main():
+    from dedup_store import DEFAULT_DB_FILE, LEGACY_TEXT_FILE, SqliteDedupStore
+
+    parser = argparse.ArgumentParser(description="처리된 링크 이력을 정규화된 중복 방지 키로 다시 기록합니다.")
+    parser.add_argument('--source', default=LEGACY_TEXT_FILE, help="기존 이력 텍스트 파일")
+    parser.add_argument('--db', default=DEFAULT_DB_FILE, help="키를 추가할 SQLite 저장소")
+    parser.add_argument('--output', help="지정하면 SQLite 대신 정규화된 키를 이 텍스트 파일로 기록")
+    parser.add_argument('--identity', action='append', default=[], metavar='HOST=PARAMS',
+                        help="호스트별 식별 파라미터 (예: omoney.kbstar.com=boardId,articleId)")
+    args = parser.parse_args()
+
+    identity_by_host = {}
+    for spec in args.identity:
+        host, _, params = spec.partition('=')
+        identity_by_host[host.strip().lower()] = parse_identity_params(params)
+
+    with open(args.source, 'r', encoding='utf-8') as f:
+        keys = list(rekey_history(f, identity_by_host))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(''.join(key + '\n' for key in keys))
+        print(f"✅ {len(keys)}개의 정규화된 키를 '{args.output}'에 기록했습니다.")
+    else:
+        with SqliteDedupStore(args.db) as store:
+            store.add_many(keys)
+            store.compact()
+        print(f"✅ {len(keys)}개의 정규화된 키를 '{args.db}'에 추가했습니다.")
+
+
+if __name__ == '__main__':
+    main()